@@ -0,0 +1,66 @@
+"""Incremental alert evaluation on a synthetic book.
+
+Replaces the sample holdings with ``--portfolios`` portfolios of
+``--holdings`` positions each (see risk_refresh.py), evaluates every alert
+once, then applies a no-op, a single concentrating trade and its reversal.
+One JSON line per step reports the portfolios re-evaluated, alerts fired,
+resolved and suppressed, and wall time; the script exits non-zero if a single
+trade re-evaluates more than one portfolio or the reversal is not
+rate-limited:
+
+    python benchmarks/alert_engine.py --portfolios 5000 --holdings 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+os.environ.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+
+from alerts import evaluate_alerts  # noqa: E402
+from data_source import LocalDataSource  # noqa: E402
+from risk_refresh import load_book  # noqa: E402
+
+
+def step(name, source):
+    start = time.perf_counter()
+    stats = evaluate_alerts(source)
+    result = {"step": name, **stats, "seconds": round(time.perf_counter() - start, 3)}
+    print(json.dumps(result))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=5000)
+    parser.add_argument("--holdings", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    source = LocalDataSource()
+    load_book(source, args.portfolios, args.holdings)
+    step("initial", source)
+    unchanged = step("no_change", source)
+
+    # Concentrate one portfolio in its first holding's sector, then undo it
+    first = source.query(
+        "SELECT HOLDING_ID, MARKET_VALUE FROM PORTFOLIO_HOLDINGS WHERE PORTFOLIO_NAME = ? ORDER BY HOLDING_ID LIMIT 1",
+        ["Portfolio 00000"],
+    ).iloc[0]
+    update = "UPDATE PORTFOLIO_HOLDINGS SET MARKET_VALUE = ? WHERE HOLDING_ID = ?"
+    source.execute(update, [float(first["MARKET_VALUE"]) * 100, first["HOLDING_ID"]])
+    trade = step("single_trade", source)
+    source.execute(update, [float(first["MARKET_VALUE"]), first["HOLDING_ID"]])
+    reversal = step("reversal", source)
+    source.execute(update, [float(first["MARKET_VALUE"]) * 100, first["HOLDING_ID"]])
+    repeat = step("repeat_within_cooldown", source)
+
+    ok = (unchanged["changed"] == 0 and trade["changed"] == 1 and reversal["changed"] == 1
+          and repeat["fired"] == 0 and repeat["suppressed"] >= 1)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Throughput benchmark for the parallel parse-and-chunk engine.
+
+Runs ``research_pipeline.chunking.iter_chunks`` over the bundled PDFs with a
+range of worker counts and reports docs/sec, chunks/sec and peak RSS of the
+parent and worker processes, one JSON line per run:
+
+    python benchmarks/chunk_throughput.py --workers 1 2 4
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from research_pipeline.chunking import SQLiteChunkSink, iter_chunks, write_batches  # noqa: E402
+
+PDF_DIR = SCRIPTS_DIR / "generated_pdfs"
+
+
+def run_once(paths, workers, repeat):
+    sink = SQLiteChunkSink()
+    start = time.perf_counter()
+    chunks = 0
+    for _ in range(repeat):
+        chunks += write_batches(iter_chunks(paths, root=PDF_DIR, workers=workers), sink)
+    elapsed = time.perf_counter() - start
+    return {
+        "workers": workers,
+        "documents": len(paths) * repeat,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "docs_per_sec": round(len(paths) * repeat / elapsed, 2),
+        "chunks_per_sec": round(chunks / elapsed, 1),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_parent_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_rss_worker_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus per run")
+    args = parser.parse_args(argv)
+
+    paths = sorted(PDF_DIR.glob("*.pdf"))
+    for workers in args.workers:
+        print(json.dumps(run_once(paths, workers, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Cold-start / time-to-first-paint benchmark for each page of the Streamlit app.
+
+Every page is rendered once in a fresh interpreter through Streamlit's
+AppTest, so module imports are measured cold. For each page we report:
+
+- ``first_paint_s``: wall time of the first ``AppTest.run()`` for that page
+- ``imported``: the heavy modules the page pulled in, beyond those a bare
+  ``import streamlit`` already loads in a fresh interpreter
+
+The Dashboard Guide must not import the data and charting stack; the script
+exits non-zero if it does, or if any page exceeds ``--budget``.
+tests/test_cold_start.py runs the import check under pytest.
+
+    ASSET_MGMT_BACKEND=local python benchmarks/cold_start.py --budget 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit" / "app.py"
+
+PAGES = {
+    "dashboard": "app_pages/dashboard.py",
+    "guide": "app_pages/guide.py",
+}
+
+# ``import streamlit`` loads the lazy plotly.graph_objects stub for its theme; building a figure loads _figure
+HEAVY_MODULES = ("pandas", "numpy", "plotly.graph_objs._figure", "plotly.express")
+
+# Modules each page is allowed to import on first paint
+ALLOWED_HEAVY = {
+    "dashboard": set(HEAVY_MODULES),
+    "guide": set(),
+}
+
+_CHILD = r"""
+import json, sys, time
+import streamlit
+heavy = {heavy!r}
+preloaded = {{m for m in heavy if m in sys.modules}}
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.switch_page({page!r})
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "first_paint_s": elapsed,
+    "exceptions": [str(e.value) for e in at.exception],
+    "imported": sorted(m for m in heavy if m in sys.modules and m not in preloaded),
+}}))
+"""
+
+
+def measure_page(page_path):
+    code = _CHILD.format(heavy=HEAVY_MODULES, app=str(APP_PATH), page=page_path)
+    env = dict(os.environ)
+    env.setdefault("ASSET_MGMT_BACKEND", "local")
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=None, help="max first-paint seconds per page")
+    parser.add_argument("--repeat", type=int, default=3, help="cold runs per page (best is reported)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for name, page_path in PAGES.items():
+        runs = [measure_page(page_path) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["first_paint_s"])
+        print(json.dumps({"page": name, **best}))
+        unexpected = set(best["imported"]) - ALLOWED_HEAVY[name]
+        if best["exceptions"]:
+            failures.append(f"{name}: raised {best['exceptions']}")
+        if unexpected:
+            failures.append(f"{name}: imported {sorted(unexpected)} on first paint")
+        if args.budget is not None and best["first_paint_s"] > args.budget:
+            failures.append(f"{name}: first paint {best['first_paint_s']:.2f}s > {args.budget:.2f}s")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
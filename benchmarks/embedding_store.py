@@ -0,0 +1,122 @@
+"""Open-time, memory and top-k latency benchmark for the chunk embedding store.
+
+Fills a ``research_pipeline.embeddings.EmbeddingStore`` with synthetic unit
+vectors for ``--rows`` chunks, then reports (one JSON line per dtype):
+
+- build time and on-disk matrix size;
+- time to open the store read-only and the RSS growth caused by opening it;
+- p50/p95 top-k query latency over the memory-mapped matrix;
+- an incremental re-sync after editing 1% of the chunks, which should embed
+  exactly those chunks.
+
+    python benchmarks/embedding_store.py --rows 1000000 --dtypes float16 int8
+"""
+import argparse
+import json
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from research_pipeline.embeddings import EMBEDDING_DIM, STORE_DTYPES, EmbeddingStore  # noqa: E402
+
+CHUNKS_PER_DOCUMENT = 500
+
+
+class RandomEmbedder:
+    """Cheap stand-in so the benchmark measures the store, not the embedder."""
+
+    def __init__(self, dim=EMBEDDING_DIM, seed=0):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+
+    def embed(self, texts):
+        matrix = self.rng.standard_normal((len(texts), self.dim), dtype=np.float32)
+        return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def synthetic_rows(count):
+    return [
+        {"relative_path": f"doc_{i // CHUNKS_PER_DOCUMENT:06d}.pdf", "chunk_index": i % CHUNKS_PER_DOCUMENT,
+         "chunk": f"chunk {i}"}
+        for i in range(count)
+    ]
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux; read the current RSS from /proc when available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(dtype, rows, queries, k):
+    path = Path(tempfile.mkdtemp(prefix="embedding_store_"))
+    try:
+        embedder = RandomEmbedder()
+        start = time.perf_counter()
+        writer = EmbeddingStore(path, dtype=dtype)
+        writer.sync(rows, embedder)
+        build_s = time.perf_counter() - start
+
+        before = rss_mb()
+        start = time.perf_counter()
+        reader = EmbeddingStore(path, readonly=True)
+        open_s = time.perf_counter() - start
+        open_rss = rss_mb() - before
+
+        query_vectors = RandomEmbedder(seed=1).embed([""] * queries)
+        latencies = []
+        for vector in query_vectors:
+            start = time.perf_counter()
+            reader.top_k(vector, k)
+            latencies.append(time.perf_counter() - start)
+
+        edited = [dict(row) for row in rows]
+        for row in edited[::100]:
+            row["chunk"] += " (edited)"
+        start = time.perf_counter()
+        resync = writer.sync(edited, embedder)
+        resync_s = time.perf_counter() - start
+
+        p50, p95 = np.percentile(np.asarray(latencies) * 1000, [50, 95])
+        return {
+            "dtype": dtype,
+            "rows": len(reader),
+            "matrix_mb": round(reader.nbytes() / 2**20, 1),
+            "build_s": round(build_s, 2),
+            "open_ms": round(open_s * 1000, 2),
+            "open_rss_mb": round(open_rss, 1),
+            f"top{k}_p50_ms": round(p50, 2),
+            f"top{k}_p95_ms": round(p95, 2),
+            "resync_embedded": resync["embedded"],
+            "resync_s": round(resync_s, 2),
+        }
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dtypes", nargs="+", choices=STORE_DTYPES, default=list(STORE_DTYPES))
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    rows = synthetic_rows(args.rows)
+    for dtype in args.dtypes:
+        print(json.dumps(run(dtype, rows, args.queries, args.k)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Cost of the hot-path instrumentation, switched off and on.
+
+Times ``--iterations`` empty ``timed`` blocks and the same number of small
+local queries with instrumentation off and on. One JSON line per mode; the
+script exits non-zero if switching it off leaves more than ``--max-off-ns``
+nanoseconds per timed block:
+
+    python benchmarks/instrumentation_overhead.py --iterations 200000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+os.environ.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+
+import instrumentation  # noqa: E402
+from data_source import LocalDataSource  # noqa: E402
+
+
+def per_call_ns(function, iterations):
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--max-off-ns", type=float, default=1000.0)
+    args = parser.parse_args(argv)
+
+    source = LocalDataSource(seed_history=False)
+
+    def block():
+        with instrumentation.timed("dashboard_section_seconds", section="benchmark"):
+            pass
+
+    def query():
+        source.query("SELECT COUNT(*) FROM PORTFOLIO_HOLDINGS")
+
+    per_call_ns(query, args.queries)  # warm SQLite's statement cache
+    baseline_ns = per_call_ns(lambda: None, args.iterations)
+    results = {}
+    for mode in ("off", "on"):
+        instrumentation.set_enabled(mode == "on")
+        results[mode] = {
+            "mode": mode,
+            "timed_block_ns": round(per_call_ns(block, args.iterations) - baseline_ns, 1),
+            "local_query_us": round(per_call_ns(query, args.queries) / 1000, 1),
+        }
+        print(json.dumps(results[mode]))
+    instrumentation.set_enabled(False)
+    return 0 if results["off"]["timed_block_ns"] <= args.max_off_ns else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Concurrent identical requests against a slow local backend.
+
+``--sessions`` threads start together (a barrier stands in for the market-open
+rush) and ask for the same result through each layer:
+
+- ``direct``: ``query_kpis`` with no caching, for reference (one backend run
+  per session);
+- ``coalesced``: the same call through ``shared_cache.shared`` with nothing
+  stored;
+- ``cortex_analyst``: ``ask`` with a slow stand-in analyst and a shared reply
+  cache, then once more after every session has its answer.
+
+Dashboard loaders are not measured: Streamlit's cache already runs a loader
+once per key for concurrent misses. The backend sleeps ``--delay`` seconds per
+query. One JSON line per layer; the script exits non-zero unless every shared
+layer ran the backend exactly once (and the repeated question not at all).
+tests/test_shared_cache.py checks the same behaviour under pytest:
+
+    python benchmarks/request_coalescing.py --sessions 32 --delay 0.2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+os.environ.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+
+from aggregates import query_kpis  # noqa: E402
+from data_source import LocalDataSource  # noqa: E402
+from semantic_index import ask  # noqa: E402
+from shared_cache import SharedCache, shared  # noqa: E402
+
+
+class SlowDataSource(LocalDataSource):
+    """Local backend that takes ``delay`` seconds per query and counts them."""
+
+    def __init__(self, delay):
+        super().__init__(seed_history=False)
+        self.delay = delay
+        self.queries = 0
+        self._count_lock = threading.Lock()
+
+    def query(self, sql, params=None):
+        with self._count_lock:
+            self.queries += 1
+        time.sleep(self.delay)
+        return super().query(sql, params)
+
+
+class SlowAnalyst:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def __call__(self, question):
+        with self._count_lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"text": "Stand-in answer", "sql": "SELECT SECTOR, SUM(MARKET_VALUE) FROM PORTFOLIO_HOLDINGS GROUP BY 1"}
+
+
+def rush(sessions, request):
+    """Run ``request`` in ``sessions`` threads released at the same instant; return the wall time."""
+    barrier = threading.Barrier(sessions)
+
+    def session(_):
+        barrier.wait()
+        return request()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    return time.perf_counter() - start
+
+
+def layer(name, sessions, request, counter, per_run):
+    before = counter()
+    seconds = rush(sessions, request)
+    runs = (counter() - before) / per_run
+    print(json.dumps({"layer": name, "sessions": sessions, "backend_runs": runs, "seconds": round(seconds, 3)}))
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds per backend query")
+    args = parser.parse_args(argv)
+
+    source = SlowDataSource(args.delay)
+    queries = lambda: source.queries  # noqa: E731
+    before = source.queries
+    query_kpis(source)
+    per_load = source.queries - before
+
+    @shared(SharedCache("benchmark", ttl=0))
+    def coalesced_kpis():
+        return query_kpis(source)
+
+    analyst, replies = SlowAnalyst(args.delay), SharedCache("benchmark_analyst")
+
+    def ask_analyst():
+        return ask("Summarize our portfolio risk", None, source, analyst, replies)
+
+    layer("direct", args.sessions, lambda: query_kpis(source), queries, per_load)
+    once = [
+        layer("coalesced", args.sessions, coalesced_kpis, queries, per_load),
+        layer("cortex_analyst", args.sessions, ask_analyst, lambda: analyst.calls, 1),
+    ]
+    # Every session now reads the stored reply
+    cached = layer("cortex_analyst_cached", args.sessions, ask_analyst, lambda: analyst.calls, 1)
+    return 0 if cached == 0 and all(runs == 1 for runs in once) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Vectorized risk analytics on a synthetic book.
+
+Simulates ``--portfolios`` portfolios over ``--years`` of trading days and
+``--holdings`` positions each, then times ``risk_metrics`` and ``sector_hhi``
+on the full matrices. A per-portfolio Python loop over ``--check`` portfolios
+is the reference for both correctness and the extrapolated speedup. One JSON
+line per stage; the script exits non-zero if any metric disagrees:
+
+    python benchmarks/risk_metrics.py --portfolios 10000 --years 5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+
+from risk_analytics import RISK_FREE_RATE, TRADING_DAYS, VAR_CONFIDENCE, risk_metrics, sector_hhi  # noqa: E402
+
+SECTORS = 6
+
+
+def reference_metrics(returns):
+    """One portfolio at a time, the way a row-wise pandas apply would compute it."""
+    out = {key: [] for key in ("volatility", "annual_return", "sharpe_ratio", "var", "max_drawdown", "ytd_return")}
+    for row in returns:
+        daily = [r for r in row if r == r]
+        mean = sum(daily) / len(daily)
+        volatility = (sum((r - mean) ** 2 for r in daily) / (len(daily) - 1) * TRADING_DAYS) ** 0.5
+        wealth, peak, drawdown, compounded = 1.0, 1.0, 0.0, 1.0
+        for r in row:
+            r = 0.0 if r != r else r
+            wealth *= 1.0 + r
+            peak = max(peak, wealth)
+            drawdown = max(drawdown, 1.0 - wealth / peak)
+            compounded *= 1.0 + r
+        out["volatility"].append(volatility)
+        out["annual_return"].append(mean * TRADING_DAYS)
+        out["sharpe_ratio"].append((mean * TRADING_DAYS - RISK_FREE_RATE) / volatility)
+        out["var"].append(-float(np.quantile(daily, 1.0 - VAR_CONFIDENCE)))
+        out["max_drawdown"].append(drawdown)
+        out["ytd_return"].append(compounded - 1.0)
+    return {key: np.array(values) for key, values in out.items()}
+
+
+def reference_hhi(portfolio_codes, sector_codes, market_values, n_portfolios):
+    exposure = [{} for _ in range(n_portfolios)]
+    for p, s, v in zip(portfolio_codes, sector_codes, market_values):
+        exposure[p][s] = exposure[p].get(s, 0.0) + v
+    return np.array([sum((v / sum(e.values())) ** 2 for v in e.values()) for e in exposure])
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--holdings", type=int, default=20)
+    parser.add_argument("--check", type=int, default=200, help="portfolios compared with the loop reference")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    days = args.years * TRADING_DAYS
+    returns = rng.normal(0.0003, rng.uniform(0.004, 0.02, size=(args.portfolios, 1)), size=(args.portfolios, days))
+    # A few missing valuations, as when a portfolio opens mid-window
+    returns[rng.random(returns.shape) < 0.001] = np.nan
+    n_rows = args.portfolios * args.holdings
+    portfolio_codes = np.repeat(np.arange(args.portfolios), args.holdings)
+    sector_codes = rng.integers(0, SECTORS, size=n_rows)
+    market_values = rng.uniform(1e5, 5e6, size=n_rows)
+
+    metrics, metrics_seconds = timed(risk_metrics, returns)
+    hhi, hhi_seconds = timed(sector_hhi, portfolio_codes, sector_codes, market_values, args.portfolios, SECTORS)
+    print(json.dumps({"stage": "vectorized", "portfolios": args.portfolios, "days": days,
+                      "holdings": n_rows, "risk_metrics_seconds": round(metrics_seconds, 3),
+                      "sector_hhi_seconds": round(hhi_seconds, 3)}))
+
+    check = min(args.check, args.portfolios)
+    expected, loop_seconds = timed(reference_metrics, returns[:check])
+    mask = portfolio_codes < check
+    expected_hhi, hhi_loop_seconds = timed(reference_hhi, portfolio_codes[mask], sector_codes[mask],
+                                           market_values[mask], check)
+    mismatched = [key for key in expected if not np.allclose(metrics[key][:check], expected[key])]
+    if not np.allclose(hhi[:check], expected_hhi):
+        mismatched.append("sector_hhi")
+    loop_estimate = (loop_seconds + hhi_loop_seconds) * args.portfolios / check
+    print(json.dumps({"stage": "loop_reference", "portfolios_checked": check,
+                      "estimated_loop_seconds": round(loop_estimate, 1),
+                      "speedup": round(loop_estimate / (metrics_seconds + hhi_seconds), 1),
+                      "mismatched": mismatched}))
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
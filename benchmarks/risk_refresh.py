@@ -0,0 +1,76 @@
+"""Incremental portfolio risk assessment on a synthetic book.
+
+Replaces the sample holdings with ``--portfolios`` portfolios of
+``--holdings`` positions each, assesses the whole book once, then applies a
+single trade, a no-op and a sold position. One JSON line per step reports the
+stale portfolios found, model calls made (one ``AI_AGG`` group each) and wall
+time; the script exits non-zero if a single trade costs more than one call.
+tests/test_risk_assessment.py checks the same steps under pytest.
+
+    python benchmarks/risk_refresh.py --portfolios 5000 --holdings 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+os.environ.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+
+from data_source import LocalDataSource  # noqa: E402
+from risk_assessment import FakeAssessor, refresh_risk_assessments  # noqa: E402
+
+SECTORS = ("Technology", "Healthcare", "Real Estate", "ESG/Renewable", "Consumer Goods", "Utilities")
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+def load_book(source, portfolios, holdings, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for p in range(portfolios):
+        for h in range(holdings):
+            rows.append((
+                f"H{p:05d}{h:03d}", f"Portfolio {p:05d}", f"Security {rng.randrange(2000):04d}",
+                rng.choice(SECTORS), round(rng.uniform(1e5, 5e6), 2), round(rng.uniform(0.5, 10), 2),
+                rng.choice(RISK_LEVELS), "2024-02-15",
+            ))
+    source.execute("DELETE FROM PORTFOLIO_HOLDINGS")
+    source.executemany("INSERT INTO PORTFOLIO_HOLDINGS VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def step(name, source, assessor):
+    calls = assessor.calls
+    start = time.perf_counter()
+    stats = refresh_risk_assessments(source, assessor)
+    result = {"step": name, **stats, "model_calls": assessor.calls - calls,
+              "seconds": round(time.perf_counter() - start, 3)}
+    print(json.dumps(result))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=5000)
+    parser.add_argument("--holdings", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    source = LocalDataSource()
+    load_book(source, args.portfolios, args.holdings)
+    assessor = FakeAssessor(source)
+
+    step("initial", source, assessor)
+    source.execute("UPDATE PORTFOLIO_HOLDINGS SET WEIGHT_PERCENT = WEIGHT_PERCENT * 1.10 WHERE HOLDING_ID = ?",
+                   ["H00042000"])
+    trade = step("single_trade", source, assessor)
+    step("no_change", source, assessor)
+    source.execute("DELETE FROM PORTFOLIO_HOLDINGS WHERE HOLDING_ID = ?", ["H01234005"])
+    step("position_sold", source, assessor)
+
+    raise SystemExit(0 if trade["model_calls"] == 1 else 1)
+
+
+if __name__ == "__main__":
+    main()
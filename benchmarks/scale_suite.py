@@ -0,0 +1,128 @@
+"""Dashboard rerun latency and peak memory against synthetic books of growing size.
+
+For each ``--sizes`` entry a seeded book (see synthetic_book.py) is built and
+``streamlit/app.py`` is driven headlessly through Streamlit's AppTest in a
+fresh interpreter, with ``ASSET_MGMT_LOCAL_DB`` pointing at the book. Each
+interaction is timed and followed by the process's peak RSS so far:
+
+- ``initial_load``: first run of the Dashboard page
+- ``slider_move``: Risk Threshold slider set to 5.0
+- ``page_switch``: to the Dashboard Guide
+- ``page_switch_back``: back to the (now cached) Dashboard
+
+One JSON line per size and interaction. ``--save`` writes the results to
+``--baseline``; otherwise an existing baseline is compared against and the
+script exits non-zero if any interaction got slower or larger than
+``--tolerance`` times its baseline (plus ``--slack`` seconds, for noise on
+fast reruns), or raised. Baselines are machine-specific and not committed:
+
+    python benchmarks/scale_suite.py --sizes 1000 10000 100000 --save
+    python benchmarks/scale_suite.py --sizes 1000 10000 100000
+    python benchmarks/scale_suite.py --sizes 1000000 10000000 --baseline /tmp/large.json --save
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_book import build_database
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit" / "app.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "scale_suite.json"
+
+_CHILD = r"""
+import json, resource, sys, time
+from streamlit.testing.v1 import AppTest
+# ru_maxrss is KiB on Linux and bytes on macOS
+scale = 1 / 1024 if sys.platform != "darwin" else 1 / 2**20
+at = AppTest.from_file({app!r}, default_timeout={timeout!r})
+results = []
+
+def step(name, action):
+    start = time.perf_counter()
+    action()
+    results.append({{
+        "interaction": name,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, 1),
+        "exceptions": [str(e.value) for e in at.exception],
+    }})
+
+step("initial_load", at.run)
+step("slider_move", lambda: at.slider(key="risk_threshold").set_value(5.0).run())
+step("page_switch", lambda: at.switch_page("app_pages/guide.py").run())
+step("page_switch_back", lambda: at.switch_page("app_pages/dashboard.py").run())
+print(json.dumps(results))
+"""
+
+
+def measure(database_path, timeout):
+    code = _CHILD.format(app=str(APP_PATH), timeout=timeout)
+    env = dict(os.environ, ASSET_MGMT_BACKEND="local", ASSET_MGMT_LOCAL_DB=str(database_path))
+    env.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True,
+        cwd=APP_PATH.parent,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def regressions(size, current, baseline, tolerance, slack):
+    failures = []
+    for run in current:
+        if run["exceptions"]:
+            failures.append(f"{size} {run['interaction']}: raised {run['exceptions']}")
+        before = baseline.get(run["interaction"])
+        if not before:
+            continue
+        if run["seconds"] > before["seconds"] * tolerance + slack:
+            failures.append(f"{size} {run['interaction']}: {run['seconds']:.2f}s vs {before['seconds']:.2f}s baseline")
+        if run["peak_rss_mb"] > before["peak_rss_mb"] * tolerance:
+            failures.append(f"{size} {run['interaction']}: {run['peak_rss_mb']:.0f} MB vs "
+                            f"{before['peak_rss_mb']:.0f} MB baseline")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000], help="holdings per book")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per AppTest run")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed ratio to the baseline")
+    parser.add_argument("--slack", type=float, default=0.5, help="extra seconds allowed per interaction")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save else {}
+    results, failures = {}, []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            start = time.perf_counter()
+            database = build_database(Path(workdir) / f"book_{size}.db", size, args.seed)
+            print(json.dumps({"holdings": size, "interaction": "build_book",
+                              "seconds": round(time.perf_counter() - start, 3)}))
+            runs = measure(database, args.timeout)
+            database.unlink()
+            before = baseline.get(str(size), {})
+            for run in runs:
+                previous = before.get(run["interaction"])
+                ratio = {"baseline_ratio": round(run["seconds"] / previous["seconds"], 2)} if previous else {}
+                print(json.dumps({"holdings": size, **run, **ratio}))
+            results[str(size)] = {run["interaction"]: {k: run[k] for k in ("seconds", "peak_rss_mb")} for run in runs}
+            failures += regressions(size, runs, before, args.tolerance, args.slack)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
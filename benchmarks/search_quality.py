@@ -0,0 +1,124 @@
+"""Latency and recall benchmark for the offline research search engine.
+
+Chunks the bundled PDFs, attaches classifications from the keyword mock model,
+builds a ``research_pipeline.search.SearchIndex`` and replays a labelled query
+set. For every retrieval mode it reports p50/p95/p99 query latency (unfiltered
+and filtered) and document-level recall@k, one JSON line per mode:
+
+    python benchmarks/search_quality.py --limit 5 --replicate 20
+
+``--replicate`` repeats the corpus to measure latency on a larger index. The
+copies keep their document names, so recall stays document-level, but
+duplicate chunks compete for the top k and recall drops accordingly.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from research_pipeline.chunking import iter_chunks  # noqa: E402
+from research_pipeline.classify import (  # noqa: E402
+    ClassificationCache, DocumentClassifier, keyword_mock_response,
+)
+from research_pipeline.models import MockModel  # noqa: E402
+from research_pipeline.search import MODES, SearchIndex, with_filename_attributes  # noqa: E402
+
+PDF_DIR = SCRIPTS_DIR / "generated_pdfs"
+
+UTILITY = "Dissertation on the Utility Sector.pdf"
+FINTECH = "FinTech Innovation Investment Opportunities.pdf"
+GAMING = "Gaming Industry Trends in 2025.pdf"
+ESG = "NovaTech Insights - ESG Trends.pdf"
+EMERGING = "NovaTech Insights - Emerging Markets.pdf"
+TECHNOLOGY = "NovaTech Insights - Technology Sector Overview.pdf"
+SNOWFLAKE = "SNOW_2025.pdf"
+STELLAR = "Stellar Motors Inc. - 10-K Annual Report.pdf"
+
+# (query, filter, documents that should be retrieved)
+LABELLED_QUERIES = [
+    ("smart grid adoption and grid stability", None, {UTILITY}),
+    ("distributed energy resources and renewable integration", None, {UTILITY}),
+    ("fintech venture capital funding trends", None, {FINTECH}),
+    ("why are financial institutions investing in innovation", None, {FINTECH}),
+    ("generative AI in game development", None, {GAMING}),
+    ("cloud gaming subscription models", None, {GAMING}),
+    ("ESG reporting standards carbon water waste", None, {ESG}),
+    ("diversity inclusion and employee wellbeing", None, {ESG}),
+    ("mobile-first consumers in emerging markets", None, {EMERGING}),
+    ("digital infrastructure investment boom", None, {EMERGING}),
+    ("cloud computing and AI integration growth catalysts", None, {TECHNOLOGY}),
+    ("resilient supply chains and regulatory landscape", None, {TECHNOLOGY}),
+    ("executive compensation and say-on-pay proposal", None, {SNOWFLAKE}),
+    ("stock repurchase program and convertible senior notes", None, {SNOWFLAKE}),
+    ("risk factors cybersecurity legal proceedings", {"@eq": {"document_type": "SEC_Filing"}}, {STELLAR}),
+    ("vehicle production and automotive revenue", None, {STELLAR}),
+    ("AI for optimizing energy use", {"@eq": {"industry_sector": "ESG"}}, {ESG}),
+    ("technology growth opportunities", {"@eq": {"document_type": "Research_Report"}}, {TECHNOLOGY, EMERGING, ESG}),
+    ("annual report", {"@gte": {"document_year": 2025}}, {SNOWFLAKE, GAMING}),
+    ("innovation investment", {"@not": {"@eq": {"industry_sector": "Technology"}}}, {FINTECH, EMERGING}),
+]
+
+
+def build_rows(replicate):
+    paths = sorted(PDF_DIR.glob("*.pdf"))
+    chunks = list(iter_chunks(paths, root=PDF_DIR, workers=1))
+    cache = ClassificationCache(sqlite3.connect(":memory:"))
+    classifier = DocumentClassifier(MockModel(keyword_mock_response), cache)
+    labels = classifier.classify({(row["document_name"], "") for row in chunks})
+    rows = []
+    for row in chunks:
+        fields = labels[(row["document_name"], "")] or {}
+        rows.append(with_filename_attributes({**row, "industry_sector": fields.get("industry_sector"),
+                                              "document_type": fields.get("document_type")}))
+    return [dict(row) for _ in range(replicate) for row in rows]
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {"p50_ms": round(p50, 3), "p95_ms": round(p95, 3), "p99_ms": round(p99, 3)}
+
+
+def run_mode(index, mode, limit, rounds):
+    unfiltered, filtered, recalls = [], [], []
+    for _ in range(rounds):
+        for query, spec, relevant in LABELLED_QUERIES:
+            start = time.perf_counter()
+            results = index.search(query, ["document_name"], spec, limit, mode)["results"]
+            (filtered if spec else unfiltered).append(time.perf_counter() - start)
+            found = {result["document_name"] for result in results}
+            recalls.append(len(found & relevant) / len(relevant))
+    return {
+        "mode": mode,
+        "chunks": len(index),
+        "queries": len(LABELLED_QUERIES),
+        f"recall_at_{limit}": round(float(np.mean(recalls)), 3),
+        "unfiltered": percentiles(unfiltered),
+        "filtered": percentiles(filtered),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=5, help="k for recall@k and results per query")
+    parser.add_argument("--replicate", type=int, default=1, help="copies of the corpus in the index")
+    parser.add_argument("--rounds", type=int, default=5, help="passes over the query set for latency")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args(argv)
+
+    rows = build_rows(args.replicate)
+    start = time.perf_counter()
+    index = SearchIndex(rows)
+    print(json.dumps({"index_build_s": round(time.perf_counter() - start, 3), "chunks": len(index)}))
+    for mode in args.modes:
+        print(json.dumps(run_mode(index, mode, args.limit, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Seeded synthetic holdings book for scale benchmarks.
+
+Builds a SQLite database with every table from ``scripts/setup.sql`` and
+replaces the sample ``PORTFOLIO_HOLDINGS`` and ``PORTFOLIO_METRICS`` rows with
+``--holdings`` synthetic positions. Values follow the column types in
+setup.sql and the domains in ``PORTFOLIO_ANALYSIS.yaml``: risk levels and
+sectors come from its sample values and the sample rows, the sample portfolio
+and security names come first, and each portfolio's weights add up to 100.
+The same seed always builds the same book. Point the dashboard at it with
+``ASSET_MGMT_LOCAL_DB``:
+
+    python benchmarks/synthetic_book.py --holdings 1000000 --output /tmp/book.db
+    ASSET_MGMT_BACKEND=local ASSET_MGMT_LOCAL_DB=/tmp/book.db streamlit run streamlit/app.py
+
+No holdings history is generated; the dashboard records today's snapshot on
+its first load, as it would against a fresh account.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+
+from data_source import SETUP_SQL_PATH, load_setup_sql  # noqa: E402
+from semantic_index import SEMANTIC_MODEL_PATH, load_semantic_model  # noqa: E402
+
+# Rows generated and inserted per round trip, so 10^7 holdings fit in memory
+BATCH_ROWS = 500_000
+SECURITY_POOL = 20_000
+AS_OF_DATE = "2024-02-15"
+SENTIMENTS = ("Bullish", "Neutral", "Bearish")
+
+
+def value_domains(conn, model_path=SEMANTIC_MODEL_PATH):
+    """Sample values per PORTFOLIO_HOLDINGS column from the semantic model and the setup.sql rows."""
+    model = load_semantic_model(model_path)
+    table = next(t for t in model["tables"] if t["base_table"]["table"] == "PORTFOLIO_HOLDINGS")
+    domains = {}
+    for column in table.get("dimensions") or []:
+        domains[column["expr"]] = [str(value) for value in column.get("sample_values") or []]
+    for column in ("PORTFOLIO_NAME", "SECURITY_NAME", "SECTOR", "RISK_LEVEL"):
+        rows = conn.execute(f"SELECT DISTINCT {column} FROM PORTFOLIO_HOLDINGS ORDER BY 1").fetchall()
+        domains[column] = list(dict.fromkeys(domains.get(column, []) + [row[0] for row in rows]))
+    return domains
+
+
+def _names(samples, count, template):
+    """``count`` distinct names: the samples first, then numbered synthetic ones."""
+    names = list(samples[:count])
+    names += [template.format(i) for i in range(count - len(names))]
+    return np.array(names, dtype=object)
+
+
+def holding_batches(n_holdings, per_portfolio, domains, seed):
+    """Yield lists of PORTFOLIO_HOLDINGS tuples; portfolios never straddle a batch."""
+    rng = np.random.default_rng(seed)
+    n_portfolios = -(-n_holdings // per_portfolio)
+    portfolios = _names(domains["PORTFOLIO_NAME"], n_portfolios, "Synthetic Fund {:06d}")
+    securities = _names(domains["SECURITY_NAME"], min(SECURITY_POOL, n_holdings), "Security {:05d}")
+    sectors = np.array(domains["SECTOR"], dtype=object)
+    risk_levels = np.array(domains["RISK_LEVEL"], dtype=object)
+    batch = max(1, BATCH_ROWS // per_portfolio) * per_portfolio
+    for start in range(0, n_holdings, batch):
+        ids = np.arange(start, min(start + batch, n_holdings))
+        portfolio = ids // per_portfolio
+        # Log-normal position sizes around $1M, capped to fit NUMBER(15,2)
+        value = np.round(np.minimum(rng.lognormal(np.log(1e6), 1.0, len(ids)), 9.9e12), 2)
+        totals = np.bincount(portfolio - portfolio[0], weights=value)
+        weight = np.round(value / totals[portfolio - portfolio[0]] * 100, 2)
+        columns = (
+            [f"H{i:09d}" for i in ids.tolist()],
+            portfolios[portfolio],
+            securities[rng.integers(0, len(securities), len(ids))],
+            sectors[rng.integers(0, len(sectors), len(ids))],
+            value.tolist(),
+            weight.tolist(),
+            risk_levels[rng.integers(0, len(risk_levels), len(ids))],
+        )
+        yield [row + (AS_OF_DATE,) for row in zip(*columns)], portfolios[np.unique(portfolio)]
+
+
+def metric_rows(names, rng):
+    """PORTFOLIO_METRICS rows for ``names`` within the column precisions."""
+    n = len(names)
+    return list(zip(
+        names,
+        np.round(rng.uniform(1, 10, n), 1).tolist(),
+        np.round(rng.normal(6, 8, n), 2).tolist(),
+        np.round(rng.normal(1, 0.4, n), 2).tolist(),
+        np.array(SENTIMENTS, dtype=object)[rng.integers(0, len(SENTIMENTS), n)],
+        [AS_OF_DATE] * n,
+    ))
+
+
+def build_database(path, n_holdings, seed=7, per_portfolio=50, setup_sql_path=SETUP_SQL_PATH):
+    """Write a synthetic book of ``n_holdings`` positions to the SQLite file ``path``."""
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;")
+        load_setup_sql(conn, Path(setup_sql_path).read_text())
+        domains = value_domains(conn)
+        conn.execute("DELETE FROM PORTFOLIO_HOLDINGS")
+        conn.execute("DELETE FROM PORTFOLIO_METRICS")
+        metrics_rng = np.random.default_rng(seed + 1)
+        for rows, names in holding_batches(n_holdings, per_portfolio, domains, seed):
+            conn.executemany("INSERT INTO PORTFOLIO_HOLDINGS VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT INTO PORTFOLIO_METRICS VALUES (?, ?, ?, ?, ?, ?)", metric_rows(names, metrics_rng))
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--holdings", type=int, default=100_000)
+    parser.add_argument("--per-portfolio", type=int, default=50, help="holdings per portfolio")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=os.path.join("benchmarks", "synthetic_book.db"))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path = build_database(args.output, args.holdings, args.seed, args.per_portfolio)
+    print(json.dumps({"holdings": args.holdings, "path": str(path), "bytes": path.stat().st_size,
+                      "seconds": round(time.perf_counter() - start, 2)}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Index-size and throughput comparison of the character and token chunkers.
+
+Chunks the bundled PDFs twice: with the character-based engine that mirrors
+``SPLIT_TEXT_RECURSIVE_CHARACTER`` (2000/400), and with the token-aware chunker
+plus MinHash/LSH near-duplicate removal. One JSON line per variant reports
+chunk count, indexed characters and tokens, the spread of chunk token counts
+and chunks/sec; a final line gives the index-size reduction:
+
+    python benchmarks/token_chunking.py --max-tokens 384 --threshold 0.8
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from research_pipeline.chunking import iter_chunks  # noqa: E402
+from research_pipeline.token_chunking import (  # noqa: E402
+    DEDUP_THRESHOLD, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS, NearDuplicateFilter, count_tokens,
+    iter_token_chunks,
+)
+
+PDF_DIR = SCRIPTS_DIR / "generated_pdfs"
+
+
+def measure(name, rows):
+    start = time.perf_counter()
+    chunks = [row["chunk"] for row in rows]
+    elapsed = time.perf_counter() - start
+    tokens = np.array([count_tokens(chunk) for chunk in chunks])
+    p5, p50, p95 = np.percentile(tokens, [5, 50, 95])
+    return {
+        "chunker": name,
+        "chunks": len(chunks),
+        "index_chars": sum(map(len, chunks)),
+        "index_tokens": int(tokens.sum()),
+        "tokens_p5_p50_p95": [int(p5), int(p50), int(p95)],
+        "tokens_cv": round(float(tokens.std() / tokens.mean()), 3),
+        "seconds": round(elapsed, 3),
+        "chunks_per_sec": round(len(chunks) / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=DEFAULT_OVERLAP_TOKENS)
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    paths = sorted(PDF_DIR.glob("*.pdf"))
+    baseline = measure("character", iter_chunks(paths, root=PDF_DIR, workers=args.workers))
+    print(json.dumps(baseline))
+
+    dedup = NearDuplicateFilter(args.threshold)
+    rows = iter_token_chunks(paths, PDF_DIR, args.workers, args.max_tokens, args.overlap_tokens, dedup)
+    token = measure("token+dedup", rows)
+    token["near_duplicates_dropped"] = dedup.dropped
+    print(json.dumps(token))
+
+    print(json.dumps({
+        "chunk_reduction_pct": round(100 * (1 - token["chunks"] / baseline["chunks"]), 1),
+        "index_chars_reduction_pct": round(100 * (1 - token["index_chars"] / baseline["index_chars"]), 1),
+        "index_tokens_reduction_pct": round(100 * (1 - token["index_tokens"] / baseline["index_tokens"]), 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
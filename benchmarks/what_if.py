@@ -0,0 +1,70 @@
+"""What-if scenario latency on a synthetic book.
+
+Replaces the sample holdings with ``--portfolios`` portfolios of
+``--holdings`` positions each (see risk_refresh.py), builds the scenario base
+once, then times each kind of edit plus the KPI and sector recompute that
+follows it, against a pandas groupby over the materialized scenario holdings
+as the full-recompute reference. One JSON line per step; that both agree is
+checked by tests/test_scenarios.py:
+
+    python benchmarks/what_if.py --portfolios 5000 --holdings 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+os.environ.setdefault("ASSET_MGMT_RESEARCH_DB", os.devnull)
+
+from aggregates import PORTFOLIO_SQL  # noqa: E402
+from data_source import LocalDataSource  # noqa: E402
+from risk_refresh import load_book  # noqa: E402
+from scenarios import ScenarioBase  # noqa: E402
+
+
+def full_recompute(scenario):
+    """Total AUM ($M) and value per sector from scratch, as a clone-and-requery would."""
+    holdings = scenario.holdings_frame()
+    return holdings["MARKET_VALUE"].sum() / 1e6, holdings.groupby("SECTOR")["MARKET_VALUE"].sum().to_dict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=5000)
+    parser.add_argument("--holdings", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    source = LocalDataSource()
+    load_book(source, args.portfolios, args.holdings)
+    start = time.perf_counter()
+    base = ScenarioBase.from_source(source, source.query(PORTFOLIO_SQL))
+    print(json.dumps({"step": "build_base", "portfolios": len(base),
+                      "seconds": round(time.perf_counter() - start, 3)}))
+
+    security = min(base.by_security, key=lambda name: len(base.by_security[name]))
+    edits = [
+        ("add_position", {"kind": "add", "portfolio": "Portfolio 00000", "security": "OpenAI Corp",
+                          "sector": "Technology", "market_value": 500000.0, "risk_level": "High"}),
+        ("scale_position", {"kind": "scale", "security": security, "factor": 1.1}),
+        ("sector_shock_one_portfolio", {"kind": "shock", "sector": "Technology", "change_pct": -20.0,
+                                        "portfolio": "Portfolio 00001"}),
+        ("sector_shock_book", {"kind": "shock", "sector": "Technology", "change_pct": -20.0}),
+    ]
+    scenario = base.scenario("Benchmark")
+    for name, edit in edits:
+        start = time.perf_counter()
+        scenario = scenario.apply(edit)
+        scenario.kpis()
+        incremental_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        full_recompute(scenario)
+        full_ms = (time.perf_counter() - start) * 1000
+        print(json.dumps({"step": name, "portfolios_touched": len(scenario.touched),
+                          "incremental_ms": round(incremental_ms, 2), "full_recompute_ms": round(full_ms, 1)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Local, offline counterparts of the research pipeline in notebooks/0_start_here.ipynb.
+
+Each module mirrors one notebook stage so it can be developed, tested and
+benchmarked against the PDFs in ``scripts/generated_pdfs/`` without a
+Snowflake connection. Run modules from the ``scripts/`` directory, e.g.
+``python -m research_pipeline.ingest generated_pdfs``.
+"""
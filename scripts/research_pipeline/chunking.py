@@ -0,0 +1,225 @@
+"""Parallel, streaming parse-and-chunk engine for the research corpus.
+
+The notebook parses every PDF into ``research_knowledge_base_raw_documents``
+and only then splits the full text with ``SPLIT_TEXT_RECURSIVE_CHARACTER``.
+This stage fuses the two:
+
+- Each PDF is cut into page-range tasks (``PAGES_PER_TASK`` pages), so a
+  500-page 10-K becomes many small extraction tasks that interleave with short
+  research notes instead of pinning one worker. Page counts are read in the
+  pool too, a few documents ahead of the tasks that need them.
+- Tasks run in a process pool with a bounded number in flight; their page text
+  is consumed in submission order, and each document's pages flow through one
+  splitter, so chunks and their overlap carry across task boundaries. Rows
+  come out as a stream carrying a per-document ``chunk_index``.
+- ``write_batches`` drains the stream into a sink in fixed-size batches.
+
+The default splitter is a recursive character splitter with the notebook's
+separators and defaults (2000, 400). It approximates
+``SPLIT_TEXT_RECURSIVE_CHARACTER`` rather than reproducing it: Cortex's exact
+merge rules are not documented, and ``stream_chunks`` re-splits a bounded
+buffer, so chunk boundaries can differ from a single split of the whole text.
+Peak memory depends on the task size and ``max_in_flight``, not the document
+size.
+
+PDF text extraction uses ``pypdf`` when it is installed; pass another
+``page_reader`` to use a different parser.
+"""
+import functools
+import itertools
+import os
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import pypdf
+except ImportError:  # optional dependency, only needed for the default page reader
+    pypdf = None
+
+CHUNK_SIZE = 2000
+CHUNK_OVERLAP = 400
+SEPARATORS = ("\n\n", "\n", " ", "")
+PAGES_PER_TASK = 16
+WRITE_BATCH_SIZE = 500
+
+# Split the streaming buffer once it holds this many chunks' worth of text
+_FLUSH_CHUNKS = 8
+
+
+def _merge_pieces(pieces, separator, chunk_size, overlap):
+    """Greedily join ``pieces`` into chunks of at most ``chunk_size`` with ``overlap``."""
+    chunks = []
+    window = deque()
+    total = 0
+    sep_len = len(separator)
+    for piece in pieces:
+        added = len(piece) + (sep_len if window else 0)
+        if window and total + added > chunk_size:
+            chunk = separator.join(window).strip()
+            if chunk:
+                chunks.append(chunk)
+            # Keep a tail of the window as overlap for the next chunk
+            while window and (total > overlap or total + len(piece) + (sep_len if window else 0) > chunk_size):
+                total -= len(window[0]) + (sep_len if len(window) > 1 else 0)
+                window.popleft()
+        total += len(piece) + (sep_len if window else 0)
+        window.append(piece)
+    chunk = separator.join(window).strip()
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def split_text_recursive(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, separators=SEPARATORS):
+    """Split ``text`` like ``SNOWFLAKE.CORTEX.SPLIT_TEXT_RECURSIVE_CHARACTER`` with format ``'none'``."""
+    separator, remaining = separators[-1], ()
+    for i, candidate in enumerate(separators):
+        if candidate == "" or candidate in text:
+            separator, remaining = candidate, separators[i + 1:]
+            break
+    pieces = list(text) if separator == "" else text.split(separator)
+
+    chunks = []
+    pending = []
+    for piece in pieces:
+        if len(piece) <= chunk_size:
+            pending.append(piece)
+            continue
+        if pending:
+            chunks.extend(_merge_pieces(pending, separator, chunk_size, overlap))
+            pending = []
+        if remaining:
+            chunks.extend(split_text_recursive(piece, chunk_size, overlap, remaining))
+        else:
+            chunks.append(piece)
+    if pending:
+        chunks.extend(_merge_pieces(pending, separator, chunk_size, overlap))
+    return chunks
+
+
+def stream_chunks(texts, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Yield chunks from an iterable of text pieces (e.g. pages) with a bounded buffer.
+
+    The buffer is split whenever it grows past a few chunks; the last chunk is
+    carried over so chunks still flow across page boundaries.
+    """
+    buffer = ""
+    for text in texts:
+        buffer = f"{buffer}\n\n{text}" if buffer else text
+        if len(buffer) >= _FLUSH_CHUNKS * chunk_size:
+            chunks = split_text_recursive(buffer, chunk_size, overlap)
+            yield from chunks[:-1]
+            buffer = chunks[-1] if chunks else ""
+    if buffer.strip():
+        yield from split_text_recursive(buffer, chunk_size, overlap)
+
+
+def _require_pypdf():
+    if pypdf is None:
+        raise ImportError("pypdf is required to read PDFs locally: pip install pypdf")
+
+
+def pdf_page_count(path):
+    _require_pypdf()
+    return len(pypdf.PdfReader(path).pages)
+
+
+def pdf_page_reader(path, start, stop):
+    """Yield the extracted text of pages ``[start, stop)``."""
+    _require_pypdf()
+    reader = pypdf.PdfReader(path)
+    for page in reader.pages[start:stop]:
+        yield page.extract_text() or ""
+
+
+def plan_tasks(paths, page_counts, pages_per_task=PAGES_PER_TASK):
+    """Yield ``(path, start, stop)`` page-range tasks for every document, given its page count."""
+    for path, pages in zip(paths, page_counts):
+        for start in range(0, max(pages, 1), pages_per_task):
+            yield str(path), start, min(start + pages_per_task, pages)
+
+
+def _lookahead(pool, fn, items, depth):
+    """Yield ``fn(item)`` for each item in order, computed in ``pool`` at most ``depth`` items ahead."""
+    items = iter(items)
+    pending = deque(pool.submit(fn, item) for item in itertools.islice(items, depth))
+    while pending:
+        result = pending.popleft().result()
+        for item in itertools.islice(items, 1):
+            pending.append(pool.submit(fn, item))
+        yield result
+
+
+def _run_task(task, page_reader):
+    path, start, stop = task
+    return path, list(page_reader(path, start, stop))
+
+
+def iter_chunks(paths, root=None, workers=None, page_reader=pdf_page_reader, page_counter=pdf_page_count,
+                pages_per_task=PAGES_PER_TASK, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, max_in_flight=None,
+                splitter=None):
+    """Parse and chunk ``paths`` in a process pool, yielding one dict per chunk.
+
+    Rows carry ``relative_path`` (relative to ``root`` when given),
+    ``document_name``, ``chunk_index`` and ``chunk``. At most ``max_in_flight``
+    tasks (default ``2 * workers``) are pending at once, which bounds memory.
+    ``page_reader`` and ``page_counter`` run in the workers and must be
+    picklable. ``splitter`` turns one document's page texts into chunks; it
+    defaults to ``stream_chunks`` with ``chunk_size`` and ``overlap``.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    splitter = splitter or functools.partial(stream_chunks, chunk_size=chunk_size, overlap=overlap)
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        page_counts = _lookahead(pool, page_counter, paths, workers)
+        tasks = plan_tasks(paths, page_counts, pages_per_task)
+        results = _lookahead(pool, functools.partial(_run_task, page_reader=page_reader), tasks, max_in_flight)
+        # Tasks are planned document by document, so each document's results are consecutive
+        for path, document in itertools.groupby(results, key=lambda result: result[0]):
+            path = Path(path)
+            pages = (page for _, task_pages in document for page in task_pages)
+            for index, chunk in enumerate(splitter(pages)):
+                yield {
+                    "relative_path": path.relative_to(root).as_posix() if root else path.name,
+                    "document_name": path.name,
+                    "chunk_index": index,
+                    "chunk": chunk,
+                }
+
+
+def write_batches(rows, write_batch, batch_size=WRITE_BATCH_SIZE):
+    """Drain ``rows`` into ``write_batch(list_of_rows)`` calls; return the row count."""
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            write_batch(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        write_batch(batch)
+        count += len(batch)
+    return count
+
+
+class SQLiteChunkSink:
+    """Writes chunk rows into a local ``research_knowledge_base`` table."""
+
+    def __init__(self, db_path=":memory:"):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_knowledge_base ("
+            "relative_path TEXT, document_name TEXT, chunk TEXT, chunk_index INTEGER)"
+        )
+
+    def __call__(self, batch):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO research_knowledge_base (relative_path, document_name, chunk, chunk_index) "
+                "VALUES (:relative_path, :document_name, :chunk, :chunk_index)",
+                batch,
+            )
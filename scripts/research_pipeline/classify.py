@@ -0,0 +1,253 @@
+"""Batched, memoized LLM classification of research documents.
+
+The notebook's ``document_classifications`` cell used to make three
+``COMPLETE`` calls per document (one per field, each on a different model) and
+re-classified every file on every run. This stage makes one structured-output
+call per document that returns ``industry_sector``, ``document_type`` and
+``investment_theme`` together, and memoizes the answer in
+``document_classification_cache`` keyed by
+
+    (model, prompt-template hash, document name, content hash)
+
+so only documents that have never been seen with the current model and prompt
+are sent, ``BATCH_SIZE`` prompts per model call. Changing the prompt template
+or the model changes the key, which invalidates the cache without a migration.
+
+``PROMPT_TEMPLATE`` is the same literal the notebook hashes with ``SHA2``, so
+the keys written by the notebook and by this module agree. Locally the stage
+runs against the ingestion database with a keyword-matching ``MockModel``:
+
+    python -m research_pipeline.classify --db research_pipeline.db
+"""
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+from research_pipeline.ingest import MANIFEST_TABLE, RAW_DOCUMENTS_TABLE
+from research_pipeline.models import MockModel
+
+CLASSIFICATION_MODEL = "claude-3-5-sonnet"
+CACHE_TABLE = "document_classification_cache"
+BATCH_SIZE = 50
+
+INDUSTRY_SECTORS = (
+    "Technology", "Healthcare", "Financials", "Energy", "ESG", "Emerging_Markets", "Consumer_Discretionary",
+    "Consumer_Staples", "Utilities", "Real_Estate", "Communication_Services",
+)
+DOCUMENT_TYPES = (
+    "Earnings_Call", "Research_Report", "SEC_Filing", "Company_Report", "Industry_Analysis", "News_Article", "Other",
+)
+INVESTMENT_THEMES = (
+    "Growth", "Value", "Dividend", "ESG", "Small_Cap", "Large_Cap", "International", "Sector_Rotation",
+    "Market_Analysis", "Company_Specific",
+)
+CLASSIFICATION_FIELDS = {
+    "industry_sector": INDUSTRY_SECTORS,
+    "document_type": DOCUMENT_TYPES,
+    "investment_theme": INVESTMENT_THEMES,
+}
+
+PROMPT_TEMPLATE = (
+    "You are an expert investment analyst. Classify this investment document from its filename. "
+    "industry_sector: ONE GICS sector from Technology, Healthcare, Financials, Energy, ESG, Emerging_Markets, "
+    "Consumer_Discretionary, Consumer_Staples, Utilities, Real_Estate, Communication_Services. "
+    "document_type: ONE of Earnings_Call, Research_Report, SEC_Filing, Company_Report, Industry_Analysis, "
+    "News_Article, Other. "
+    "investment_theme: ONE of Growth, Value, Dividend, ESG, Small_Cap, Large_Cap, International, Sector_Rotation, "
+    "Market_Analysis, Company_Specific. "
+    "Consider company names, industry keywords, and business context. "
+    "Filename: {document_name}"
+)
+PROMPT_HASH = hashlib.sha256(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()
+
+RESPONSE_FORMAT = {
+    "type": "json",
+    "schema": {
+        "type": "object",
+        "properties": {name: {"type": "string", "enum": list(values)} for name, values in CLASSIFICATION_FIELDS.items()},
+        "required": list(CLASSIFICATION_FIELDS),
+    },
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+    model TEXT,
+    prompt_hash TEXT,
+    document_name TEXT,
+    content_hash TEXT,
+    industry_sector TEXT,
+    document_type TEXT,
+    investment_theme TEXT,
+    classified_at TEXT,
+    PRIMARY KEY (model, prompt_hash, document_name, content_hash)
+);
+"""
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def build_prompt(document_name):
+    # str.replace rather than str.format so the notebook's REPLACE() builds the identical prompt
+    return PROMPT_TEMPLATE.replace("{document_name}", document_name)
+
+
+def parse_classification(text):
+    """Parse a model response into the classification fields, or ``None`` if unusable.
+
+    Values outside the allowed categories become ``None`` for that field; a
+    response with no valid field at all is rejected so it is not cached.
+    """
+    if not text:
+        return None
+    match = _JSON_OBJECT.search(text)
+    try:
+        payload = json.loads(match.group(0) if match else text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    result = {}
+    for name, allowed in CLASSIFICATION_FIELDS.items():
+        value = str(payload.get(name) or "").strip().replace(" ", "_")
+        result[name] = value if value in allowed else None
+    return result if any(result.values()) else None
+
+
+class ClassificationCache:
+    """``document_classification_cache`` in a SQLite database."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.executescript(_SCHEMA)
+
+    def get_many(self, model, prompt_hash, keys):
+        """Return ``{(document_name, content_hash): fields}`` for the cached ``keys``."""
+        found = {}
+        for document_name, content_hash in keys:
+            row = self.conn.execute(
+                f"SELECT industry_sector, document_type, investment_theme FROM {CACHE_TABLE} "
+                f"WHERE model = ? AND prompt_hash = ? AND document_name = ? AND content_hash = ?",
+                (model, prompt_hash, document_name, content_hash),
+            ).fetchone()
+            if row is not None:
+                found[(document_name, content_hash)] = dict(zip(CLASSIFICATION_FIELDS, row))
+        return found
+
+    def put_many(self, model, prompt_hash, results):
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {CACHE_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (model, prompt_hash, document_name, content_hash,
+                     *(fields[name] for name in CLASSIFICATION_FIELDS), now)
+                    for (document_name, content_hash), fields in results.items()
+                ],
+            )
+
+
+class DocumentClassifier:
+    """Classifies documents through ``client.complete_batch``, consulting the cache first."""
+
+    def __init__(self, client, cache, model=CLASSIFICATION_MODEL, batch_size=BATCH_SIZE):
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.batch_size = batch_size
+        self.stats = {"documents": 0, "cache_hits": 0, "sent": 0, "batches": 0, "failed": 0}
+
+    def classify(self, documents):
+        """Classify ``(document_name, content_hash)`` pairs.
+
+        Returns ``{(document_name, content_hash): fields}``; documents whose
+        response could not be parsed map to ``None`` and are retried next run.
+        """
+        keys = list(dict.fromkeys(documents))
+        results = self.cache.get_many(self.model, PROMPT_HASH, keys)
+        pending = [key for key in keys if key not in results]
+        self.stats["documents"] += len(keys)
+        self.stats["cache_hits"] += len(results)
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            responses = self.client.complete_batch(
+                self.model, [build_prompt(document_name) for document_name, _ in batch], RESPONSE_FORMAT
+            )
+            parsed = {key: parse_classification(text) for key, text in zip(batch, responses)}
+            self.cache.put_many(self.model, PROMPT_HASH, {key: fields for key, fields in parsed.items() if fields})
+            results.update(parsed)
+            self.stats["sent"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["failed"] += sum(fields is None for fields in parsed.values())
+        return results
+
+
+_KEYWORD_SECTORS = (
+    ("utilit", "Utilities"),
+    ("fintech", "Financials"),
+    ("bank", "Financials"),
+    ("gaming", "Communication_Services"),
+    ("esg", "ESG"),
+    ("emerging", "Emerging_Markets"),
+    ("motors", "Consumer_Discretionary"),
+    ("tech", "Technology"),
+    ("snow", "Technology"),
+)
+_KEYWORD_TYPES = (
+    ("10-k", "SEC_Filing"),
+    ("annual report", "SEC_Filing"),
+    ("earnings", "Earnings_Call"),
+    ("dissertation", "Research_Report"),
+    ("insights", "Research_Report"),
+    ("trends", "Industry_Analysis"),
+    ("opportunities", "Industry_Analysis"),
+)
+
+
+def keyword_mock_response(model, prompt):
+    """Deterministic stand-in for the model: classify the filename by keywords."""
+    name = prompt.rsplit("Filename: ", 1)[-1].lower()
+
+    def first(table, default):
+        return next((value for keyword, value in table if keyword in name), default)
+
+    sector = first(_KEYWORD_SECTORS, "Technology")
+    return json.dumps({
+        "industry_sector": sector,
+        "document_type": first(_KEYWORD_TYPES, "Company_Report"),
+        "investment_theme": {"ESG": "ESG", "Emerging_Markets": "International", "Utilities": "Dividend"}.get(
+            sector, "Growth"
+        ),
+    })
+
+
+def live_documents(conn):
+    """Return ``(document_name, content_hash)`` for every ingested, non-deleted document."""
+    rows = conn.execute(
+        f"SELECT DISTINCT r.document_name, m.content_hash FROM {RAW_DOCUMENTS_TABLE} r "
+        f"JOIN {MANIFEST_TABLE} m ON m.relative_path = r.relative_path WHERE m.deleted_at IS NULL "
+        f"ORDER BY r.document_name"
+    )
+    return [tuple(row) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify ingested research documents with a cached model.")
+    parser.add_argument("--db", default="research_pipeline.db", help="SQLite database written by the ingest stage")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    classifier = DocumentClassifier(MockModel(keyword_mock_response), ClassificationCache(conn),
+                                    batch_size=args.batch_size)
+    results = classifier.classify(live_documents(conn))
+    for (document_name, _), fields in sorted(results.items()):
+        print(json.dumps({"document_name": document_name, **(fields or {})}))
+    print(json.dumps(classifier.stats))
+
+
+if __name__ == "__main__":
+    main()
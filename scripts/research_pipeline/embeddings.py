@@ -0,0 +1,359 @@
+"""Text embeddings for the local search engine.
+
+The Cortex Search service embeds chunks server-side. Offline, ``HashingEmbedder``
+provides a deterministic stand-in: word unigrams and bigrams are hashed into a
+fixed number of signed buckets and the vector is L2-normalised, so cosine
+similarity is a dot product. It needs no model download and gives identical
+vectors across runs and machines, which keeps recall benchmarks reproducible.
+
+``EmbeddingStore`` keeps chunk vectors on disk, keyed by ``(relative_path,
+chunk_index)``:
+
+- ``vectors.bin`` is a memory-mapped ``float16`` or ``int8`` matrix (int8 rows
+  carry a float32 scale in ``scales.bin``) and ``live.bin`` flags which rows
+  are in use. Opening a store maps these files without reading them, so a
+  multi-million-chunk store opens instantly and every process that opens it
+  shares the same page-cache pages instead of holding its own copy.
+- ``store.db`` is a SQLite sidecar mapping each key to its row and to the MD5
+  of the chunk text it was embedded from. ``sync`` re-embeds only chunks whose
+  hash changed or that are new, reuses freed rows, and drops chunks that
+  disappeared.
+- ``search`` scores the matrix block by block with NumPy and keeps a running
+  top k with ``argpartition``, so memory stays bounded by the block size.
+
+    python -m research_pipeline.embeddings --db research_pipeline.db --store research_embeddings
+"""
+import argparse
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDING_DIM = 256
+STORE_DTYPES = ("float16", "int8")
+SEARCH_BLOCK_ROWS = 1 << 16
+_MIN_CAPACITY = 1024
+# Hashed features remembered per embedder, about twice the bundled corpus's unigram and bigram vocabulary
+BUCKET_CACHE_SIZE = 1 << 17
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _bucket(feature, dim):
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder over word unigrams and bigrams."""
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self._bucket = functools.lru_cache(maxsize=BUCKET_CACHE_SIZE)(functools.partial(_bucket, dim=dim))
+
+    def _features(self, text):
+        words = _TOKEN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts):
+        """Return a ``(len(texts), dim)`` float32 matrix of unit-length rows."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        bucket = self._bucket
+        for row, text in enumerate(texts):
+            buckets = [bucket(feature) for feature in self._features(text)]
+            if buckets:
+                indexes, signs = zip(*buckets)
+                matrix[row] = np.bincount(indexes, weights=signs, minlength=self.dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_one(self, text):
+        return self.embed([text])[0]
+
+
+def quantize_int8(matrix):
+    """Symmetric per-row int8 quantisation; returns ``(codes, scales)``."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def chunk_hash(text):
+    return hashlib.md5((text or "").encode("utf-8")).hexdigest()
+
+
+_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    relative_path TEXT,
+    chunk_index INTEGER,
+    row_id INTEGER,
+    content_hash TEXT,
+    PRIMARY KEY (relative_path, chunk_index)
+);
+CREATE INDEX IF NOT EXISTS chunk_embeddings_row_id ON chunk_embeddings (row_id);
+"""
+
+
+class EmbeddingStore:
+    """Memory-mapped, quantised chunk embeddings with a SQLite key sidecar.
+
+    Open with ``readonly=True`` from any number of reader processes; only one
+    process should call ``sync``/``delete`` at a time.
+    """
+
+    def __init__(self, path, dim=EMBEDDING_DIM, dtype="float16", readonly=False):
+        self.path = Path(path)
+        self.readonly = readonly
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{self.path / 'store.db'}?mode=ro", uri=True)
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path / "store.db")
+            self.conn.executescript(_STORE_SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM store_meta"))
+        if meta:
+            dim, dtype = int(meta["dim"]), meta["dtype"]
+        elif dtype not in STORE_DTYPES:
+            raise ValueError(f"dtype must be one of {STORE_DTYPES}, got {dtype!r}")
+        self.dim = dim
+        self.dtype = dtype
+        self.size = int(meta.get("size", 0))
+        self.capacity = int(meta.get("capacity", 0))
+        if not meta:
+            self._save_meta()
+        self._map()
+
+    # Files -----------------------------------------------------------------
+
+    def _files(self):
+        files = {"vectors": (np.dtype(self.dtype), (self.dim,)), "live": (np.dtype(np.uint8), ())}
+        if self.dtype == "int8":
+            files["scales"] = (np.dtype(np.float32), ())
+        return files
+
+    def _map(self):
+        mode = "r" if self.readonly else "r+"
+        for name, (dtype, row_shape) in self._files().items():
+            if self.capacity == 0:
+                setattr(self, f"_{name}", np.zeros((0, *row_shape), dtype=dtype))
+                continue
+            shape = (self.capacity, *row_shape)
+            setattr(self, f"_{name}", np.memmap(self.path / f"{name}.bin", dtype=dtype, mode=mode, shape=shape))
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * self.capacity, _MIN_CAPACITY)
+        self.flush()
+        for name, (dtype, row_shape) in self._files().items():
+            setattr(self, f"_{name}", None)
+            row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+            with open(self.path / f"{name}.bin", "ab") as f:
+                f.truncate(capacity * row_bytes)
+        self.capacity = capacity
+        self._map()
+
+    def _save_meta(self):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO store_meta VALUES (?, ?)",
+                [("dim", str(self.dim)), ("dtype", self.dtype), ("size", str(self.size)),
+                 ("capacity", str(self.capacity))],
+            )
+
+    def flush(self):
+        for name in self._files():
+            array = getattr(self, f"_{name}", None)
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def __len__(self):
+        return int(np.count_nonzero(self._live[:self.size]))
+
+    # Writes ----------------------------------------------------------------
+
+    def _write(self, row_ids, vectors):
+        if self.dtype == "int8":
+            codes, scales = quantize_int8(vectors)
+            self._vectors[row_ids] = codes
+            self._scales[row_ids] = scales
+        else:
+            self._vectors[row_ids] = vectors.astype(np.float16)
+        self._live[row_ids] = 1
+
+    def _known(self, relative_path):
+        return {
+            chunk_index: (row_id, content_hash)
+            for chunk_index, row_id, content_hash in self.conn.execute(
+                "SELECT chunk_index, row_id, content_hash FROM chunk_embeddings WHERE relative_path = ?",
+                (relative_path,),
+            )
+        }
+
+    def sync(self, rows, embedder, prune=True):
+        """Bring the store in line with ``rows`` (dicts with relative_path, chunk_index, chunk).
+
+        Only new chunks and chunks whose text hash changed are embedded. With
+        ``prune``, keys absent from ``rows`` are deleted: pass the whole
+        corpus, or ``prune=False`` when adding a subset.
+        Returns ``{"embedded": n, "unchanged": n, "deleted": n}``.
+        """
+        if self.readonly:
+            raise PermissionError("EmbeddingStore was opened read-only")
+        by_path = {}
+        for row in rows:
+            by_path.setdefault(row["relative_path"], []).append(row)
+
+        updates, inserts, stale, unchanged = [], [], [], 0
+        for relative_path, doc_rows in by_path.items():
+            known = self._known(relative_path)
+            for row in doc_rows:
+                digest = chunk_hash(row["chunk"])
+                row_id, known_hash = known.pop(row["chunk_index"], (None, None))
+                if row_id is None:
+                    inserts.append((row, digest))
+                elif known_hash != digest:
+                    updates.append((row, digest, row_id))
+                else:
+                    unchanged += 1
+            stale.extend((relative_path, chunk_index) for chunk_index in known)
+        if prune:
+            stale.extend(
+                key for key in self.conn.execute("SELECT relative_path, chunk_index FROM chunk_embeddings")
+                if key[0] not in by_path
+            )
+        deleted = self.delete(stale)
+
+        # New chunks fill rows freed by deletes before the matrix grows
+        free = np.flatnonzero(self._live[:self.size] == 0)[:len(inserts)].tolist()
+        appended = len(inserts) - len(free)
+        if self.size + appended > self.capacity:
+            self._grow(self.size + appended)
+        new_ids = free + list(range(self.size, self.size + appended))
+        self.size += appended
+
+        pending = [(row, digest, row_id) for row, digest, row_id in updates]
+        pending += [(row, digest, row_id) for (row, digest), row_id in zip(inserts, new_ids)]
+        for start in range(0, len(pending), SEARCH_BLOCK_ROWS):
+            batch = pending[start:start + SEARCH_BLOCK_ROWS]
+            row_ids = np.array([row_id for _, _, row_id in batch], dtype=np.int64)
+            self._write(row_ids, embedder.embed([row["chunk"] or "" for row, _, _ in batch]))
+        self.flush()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunk_embeddings VALUES (?, ?, ?, ?)",
+                [(row["relative_path"], row["chunk_index"], row_id, digest) for row, digest, row_id in pending],
+            )
+        self._save_meta()
+        return {"embedded": len(pending), "unchanged": unchanged, "deleted": deleted}
+
+    def delete(self, keys):
+        """Remove ``(relative_path, chunk_index)`` keys; their rows are reused by later inserts."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        row_ids = []
+        with self.conn:
+            for relative_path, chunk_index in keys:
+                found = self.conn.execute(
+                    "SELECT row_id FROM chunk_embeddings WHERE relative_path = ? AND chunk_index = ?",
+                    (relative_path, chunk_index),
+                ).fetchone()
+                if found is not None:
+                    row_ids.append(found[0])
+                    self.conn.execute(
+                        "DELETE FROM chunk_embeddings WHERE relative_path = ? AND chunk_index = ?",
+                        (relative_path, chunk_index),
+                    )
+        self._live[row_ids] = 0
+        return len(row_ids)
+
+    # Reads -----------------------------------------------------------------
+
+    def vectors(self, start=0, stop=None):
+        """Dequantised float32 rows ``[start, stop)``."""
+        stop = self.size if stop is None else min(stop, self.size)
+        block = self._vectors[start:stop].astype(np.float32)
+        if self.dtype == "int8":
+            block *= self._scales[start:stop, None]
+        return block
+
+    def top_k(self, query_vector, k=10):
+        """Return ``(row_ids, scores)`` of the ``k`` live rows most similar to ``query_vector``."""
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        best_ids = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, self.size)
+            scores = self._vectors[start:stop].astype(np.float32) @ query_vector
+            if self.dtype == "int8":
+                scores *= self._scales[start:stop]
+            scores[self._live[start:stop] == 0] = -np.inf
+            if len(scores) > k:
+                keep = np.argpartition(-scores, k)[:k]
+            else:
+                keep = np.arange(len(scores))
+            best_ids = np.concatenate([best_ids, keep + start])
+            best_scores = np.concatenate([best_scores, scores[keep]])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k)[:k]
+                best_ids, best_scores = best_ids[keep], best_scores[keep]
+        order = np.argsort(-best_scores, kind="stable")
+        best_ids, best_scores = best_ids[order], best_scores[order]
+        finite = np.isfinite(best_scores)
+        return best_ids[finite], best_scores[finite]
+
+    def keys(self, row_ids):
+        """Map row ids to ``(relative_path, chunk_index)`` keys, preserving order."""
+        row_ids = [int(row_id) for row_id in row_ids]
+        if not row_ids:
+            return []
+        found = dict(
+            (row_id, (relative_path, chunk_index))
+            for relative_path, chunk_index, row_id in self.conn.execute(
+                f"SELECT relative_path, chunk_index, row_id FROM chunk_embeddings "
+                f"WHERE row_id IN ({','.join('?' * len(row_ids))})", row_ids,
+            )
+        )
+        return [found.get(row_id) for row_id in row_ids]
+
+    def search(self, query_vector, k=10):
+        """Return ``[(relative_path, chunk_index, score)]`` for the ``k`` nearest chunks."""
+        row_ids, scores = self.top_k(query_vector, k)
+        return [(*key, float(score)) for key, score in zip(self.keys(row_ids), scores) if key is not None]
+
+    def nbytes(self):
+        """Bytes of the mapped matrices for the rows in use."""
+        return sum(getattr(self, f"_{name}")[:self.size].nbytes for name in self._files())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embed research_knowledge_base chunks into a local store.")
+    parser.add_argument("--db", default="research_pipeline.db", help="SQLite database with research_knowledge_base")
+    parser.add_argument("--store", default="research_embeddings", help="embedding store directory")
+    parser.add_argument("--dtype", choices=STORE_DTYPES, default="float16", help="storage type for new stores")
+    parser.add_argument("--query", help="print the nearest chunks to this text after syncing")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(row) for row in conn.execute(
+        "SELECT relative_path, chunk_index, chunk FROM research_knowledge_base"
+    )]
+    embedder = HashingEmbedder()
+    store = EmbeddingStore(args.store, dim=embedder.dim, dtype=args.dtype)
+    print(json.dumps({**store.sync(rows, embedder), "rows": len(store), "bytes": store.nbytes()}))
+    if args.query:
+        for relative_path, chunk_index, score in store.search(embedder.embed_one(args.query), args.limit):
+            print(json.dumps({"relative_path": relative_path, "chunk_index": chunk_index, "score": round(score, 4)}))
+
+
+if __name__ == "__main__":
+    main()
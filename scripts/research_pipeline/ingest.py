@@ -0,0 +1,211 @@
+"""Incremental, content-hashed document ingestion.
+
+Mirrors the notebook's "Incremental Document Ingestion" cells: a manifest keeps
+the content hash and size of every ``relative_path`` that has been parsed, and
+each run parses only files that are new or whose hash/size changed. Files that
+disappear from the source directory are tombstoned in the manifest and their
+parsed rows and chunks removed; re-parsed files lose their chunks until they
+are chunked again.
+
+The local runner stores the manifest and parsed documents in SQLite tables
+named after their Snowflake counterparts. The default ``stub_parser`` returns
+deterministic placeholder text instead of calling ``PARSE_DOCUMENT``, so change
+detection can be exercised offline:
+
+    python -m research_pipeline.ingest generated_pdfs --db /tmp/research.db
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_TABLE = "research_document_manifest"
+RAW_DOCUMENTS_TABLE = "research_knowledge_base_raw_documents"
+KNOWLEDGE_BASE_TABLE = "research_knowledge_base"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+    relative_path TEXT PRIMARY KEY,
+    content_hash TEXT,
+    file_size INTEGER,
+    last_modified REAL,
+    parsed_at TEXT,
+    deleted_at TEXT
+);
+CREATE TABLE IF NOT EXISTS {RAW_DOCUMENTS_TABLE} (
+    relative_path TEXT,
+    document_name TEXT,
+    file_size INTEGER,
+    file_url TEXT,
+    scoped_file_url TEXT,
+    presigned_url TEXT,
+    file_content TEXT
+);
+CREATE TABLE IF NOT EXISTS {KNOWLEDGE_BASE_TABLE} (
+    relative_path TEXT,
+    document_name TEXT,
+    chunk TEXT,
+    chunk_index INTEGER
+);
+"""
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass
+class FileState:
+    relative_path: str
+    file_size: int
+    last_modified: float
+    content_hash: str
+
+
+@dataclass
+class ChangeSet:
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+
+    @property
+    def to_parse(self):
+        return self.new + self.changed
+
+    def summary(self):
+        return {name: len(getattr(self, name)) for name in ("new", "changed", "unchanged", "deleted")}
+
+
+def file_md5(path):
+    """MD5 of a file, matching the ``MD5`` column of a Snowflake directory table."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_directory(root, previous=None, pattern="*.pdf"):
+    """Return ``{relative_path: FileState}`` for every file under ``root``.
+
+    A file whose size and modification time match ``previous`` reuses the
+    recorded hash instead of being read again.
+    """
+    root = Path(root)
+    previous = previous or {}
+    states = {}
+    for path in sorted(root.rglob(pattern)):
+        relative_path = path.relative_to(root).as_posix()
+        stat = path.stat()
+        known = previous.get(relative_path)
+        if known and known.file_size == stat.st_size and known.last_modified == stat.st_mtime:
+            content_hash = known.content_hash
+        else:
+            content_hash = file_md5(path)
+        states[relative_path] = FileState(relative_path, stat.st_size, stat.st_mtime, content_hash)
+    return states
+
+
+def diff_states(previous, current):
+    """Classify ``current`` files against the live (non-tombstoned) ``previous`` manifest."""
+    changes = ChangeSet()
+    for relative_path, state in current.items():
+        known = previous.get(relative_path)
+        if known is None:
+            changes.new.append(relative_path)
+        elif known.content_hash != state.content_hash or known.file_size != state.file_size:
+            changes.changed.append(relative_path)
+        else:
+            changes.unchanged.append(relative_path)
+    changes.deleted = sorted(set(previous) - set(current))
+    return changes
+
+
+def stub_parser(path, state):
+    """Stand-in for ``PARSE_DOCUMENT``: deterministic text derived from the file's scanned ``FileState``."""
+    return json.dumps({
+        "content": f"[stub parse] {Path(path).name} ({state.file_size} bytes, md5 {state.content_hash})",
+        "metadata": {"pageCount": None},
+    })
+
+
+class LocalIngestRunner:
+    """Incremental ingestion of a local directory into SQLite.
+
+    ``parser(path, state)`` returns the parsed document text; ``state`` is the
+    file's ``FileState`` from the scan, so the parser need not hash it again.
+    """
+
+    def __init__(self, db_path=":memory:", parser=stub_parser):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+        self.parser = parser
+
+    def manifest(self):
+        """Return the live manifest as ``{relative_path: FileState}``."""
+        rows = self.conn.execute(
+            f"SELECT relative_path, file_size, last_modified, content_hash "
+            f"FROM {MANIFEST_TABLE} WHERE deleted_at IS NULL"
+        )
+        return {row[0]: FileState(*row) for row in rows}
+
+    def plan(self, root):
+        previous = self.manifest()
+        current = scan_directory(root, previous)
+        return diff_states(previous, current), current
+
+    def run(self, root):
+        """Parse new and changed files under ``root`` and tombstone deleted ones."""
+        root = Path(root).resolve()
+        changes, current = self.plan(root)
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            for relative_path in changes.to_parse:
+                state = current[relative_path]
+                path = root / relative_path
+                content = self.parser(path, state)
+                self._drop_parsed(relative_path)
+                self.conn.execute(
+                    f"INSERT INTO {RAW_DOCUMENTS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (relative_path, path.name, state.file_size, path.as_uri(), path.as_uri(), None, content),
+                )
+                self.conn.execute(
+                    f"INSERT INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, NULL) "
+                    f"ON CONFLICT(relative_path) DO UPDATE SET content_hash = excluded.content_hash, "
+                    f"file_size = excluded.file_size, last_modified = excluded.last_modified, "
+                    f"parsed_at = excluded.parsed_at, deleted_at = NULL",
+                    (relative_path, state.content_hash, state.file_size, state.last_modified, now),
+                )
+            for relative_path in changes.unchanged:
+                # Refresh the mtime so the next scan can skip re-hashing this file
+                self.conn.execute(
+                    f"UPDATE {MANIFEST_TABLE} SET last_modified = ? WHERE relative_path = ?",
+                    (current[relative_path].last_modified, relative_path),
+                )
+            for relative_path in changes.deleted:
+                self.conn.execute(
+                    f"UPDATE {MANIFEST_TABLE} SET deleted_at = ? WHERE relative_path = ?", (now, relative_path)
+                )
+                self._drop_parsed(relative_path)
+        return changes
+
+    def _drop_parsed(self, relative_path):
+        """Remove the parsed document and its chunks, which are stale once the file changes or goes."""
+        for table in (RAW_DOCUMENTS_TABLE, KNOWLEDGE_BASE_TABLE):
+            self.conn.execute(f"DELETE FROM {table} WHERE relative_path = ?", (relative_path,))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally ingest a directory of research PDFs.")
+    parser.add_argument("root", help="directory to ingest, e.g. generated_pdfs")
+    parser.add_argument("--db", default="research_pipeline.db", help="SQLite database holding the manifest")
+    args = parser.parse_args(argv)
+
+    changes = LocalIngestRunner(args.db).run(args.root)
+    print(json.dumps(changes.summary()))
+
+
+if __name__ == "__main__":
+    main()
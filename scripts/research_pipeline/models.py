@@ -0,0 +1,64 @@
+"""LLM clients used by the pipeline stages.
+
+Stages talk to a model through one method::
+
+    complete_batch(model, prompts, response_format=None) -> list[str]
+
+``CortexModel`` sends a whole batch to ``SNOWFLAKE.CORTEX.COMPLETE`` in a
+single SQL statement; ``MockModel`` answers locally from a Python function so
+stages can be tested and benchmarked offline.
+"""
+import json
+import threading
+
+
+class CortexModel:
+    """Batched ``SNOWFLAKE.CORTEX.COMPLETE`` calls through a Snowpark session."""
+
+    def __init__(self, session, temperature=0):
+        self.session = session
+        self.temperature = temperature
+
+    def complete_batch(self, model, prompts, response_format=None):
+        if not prompts:
+            return []
+        options = {"temperature": self.temperature}
+        if response_format is not None:
+            options["response_format"] = response_format
+            # Structured output comes back as an object, not as message text
+            extract = "TO_JSON(response:structured_output[0]:raw_message)"
+        else:
+            extract = "response:choices[0]:messages::STRING"
+        rows = self.session.sql(
+            f"""
+            SELECT idx, {extract} AS response
+            FROM (
+                SELECT f.index AS idx,
+                       SNOWFLAKE.CORTEX.COMPLETE(
+                           ?,
+                           [OBJECT_CONSTRUCT('role', 'user', 'content', f.value::STRING)],
+                           PARSE_JSON(?)
+                       ) AS response
+                FROM TABLE(FLATTEN(INPUT => PARSE_JSON(?))) f
+            )
+            ORDER BY idx
+            """,
+            params=[model, json.dumps(options), json.dumps(list(prompts))],
+        ).collect()
+        return [row["RESPONSE"] for row in rows]
+
+
+class MockModel:
+    """Local stand-in that answers each prompt with ``respond(model, prompt)``."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def complete_batch(self, model, prompts, response_format=None):
+        with self._lock:
+            self.calls += len(prompts)
+            self.batches += 1
+        return [self.respond(model, prompt) for prompt in prompts]
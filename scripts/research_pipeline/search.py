@@ -0,0 +1,263 @@
+"""Offline hybrid search engine mirroring ``investment_search_svc``.
+
+The notebook's Cortex Search service is built ``ON chunk`` with the
+``ATTRIBUTES`` below. ``SearchIndex`` offers the same interface over local
+``research_knowledge_base`` rows::
+
+    index.search(query, columns=["chunk", "document_name"],
+                 filter={"@eq": {"industry_sector": "Technology"}}, limit=10)
+    # -> {"results": [{"chunk": ..., "document_name": ...}, ...]}
+
+Filters use the Cortex Search syntax: ``@eq``, ``@gte``, ``@lte``, ``@and``,
+``@or`` and ``@not``.
+
+Three structures are built once per index:
+
+- a BM25 inverted index: per term, the chunk ids and term frequencies;
+- a vector index: one unit-length embedding per chunk;
+- per-attribute bitmaps: for each attribute value, a boolean mask of the chunks
+  carrying it.
+
+A filter is evaluated purely on bitmaps. BM25 then discards postings outside
+the mask and vector scoring only multiplies the rows inside it, so chunks that
+fail the filter are never scored. Keyword and vector rankings are fused with
+reciprocal rank fusion.
+
+    python -m research_pipeline.search "growth catalysts" --db research_pipeline.db
+"""
+import argparse
+import json
+import math
+import re
+import sqlite3
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from research_pipeline.classify import CACHE_TABLE, CLASSIFICATION_MODEL, PROMPT_HASH, ClassificationCache
+from research_pipeline.embeddings import HashingEmbedder
+
+ATTRIBUTES = (
+    "industry_sector", "document_type", "company_ticker", "coverage_universe", "document_year", "analyst_name",
+)
+SEARCH_COLUMN = "chunk"
+DEFAULT_LIMIT = 10
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+# Each ranker contributes this many candidates (times the limit) to the fusion
+CANDIDATE_MULTIPLIER = 5
+MODES = ("hybrid", "keyword", "vector")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to was were what "
+    "which will with".split()
+)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _top_k(scores, k):
+    """Indices of the ``k`` largest ``scores``, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class SearchIndex:
+    """BM25 + vector index with attribute bitmaps over a list of chunk rows."""
+
+    def __init__(self, rows, embedder=None):
+        self.rows = list(rows)
+        self.embedder = embedder or HashingEmbedder()
+        size = len(self.rows)
+        self._all = np.ones(size, dtype=bool)
+
+        postings = defaultdict(lambda: ([], []))
+        lengths = np.zeros(size, dtype=np.float32)
+        for chunk_id, row in enumerate(self.rows):
+            terms = Counter(tokenize(row[SEARCH_COLUMN] or ""))
+            lengths[chunk_id] = sum(terms.values())
+            for term, count in terms.items():
+                ids, tfs = postings[term]
+                ids.append(chunk_id)
+                tfs.append(count)
+        self._postings = {
+            term: (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (ids, tfs) in postings.items()
+        }
+        self._idf = {
+            term: math.log(1 + (size - len(ids) + 0.5) / (len(ids) + 0.5))
+            for term, (ids, _) in self._postings.items()
+        }
+        avg_length = lengths.mean() if size else 1.0
+        self._length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(avg_length, 1.0))
+
+        self._vectors = self.embedder.embed([row[SEARCH_COLUMN] or "" for row in self.rows])
+
+        self._bitmaps = {}
+        for attribute in ATTRIBUTES:
+            values = defaultdict(lambda: np.zeros(size, dtype=bool))
+            for chunk_id, row in enumerate(self.rows):
+                value = row.get(attribute)
+                if value is not None:
+                    values[value][chunk_id] = True
+            self._bitmaps[attribute] = dict(values)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # Filters -------------------------------------------------------------
+
+    def _values(self, attribute):
+        if attribute not in self._bitmaps:
+            raise ValueError(f"Unknown filter attribute: {attribute!r}")
+        return self._bitmaps[attribute]
+
+    def _range(self, attribute, predicate):
+        mask = np.zeros(len(self.rows), dtype=bool)
+        for value, bitmap in self._values(attribute).items():
+            if predicate(value):
+                mask |= bitmap
+        return mask
+
+    def filter_mask(self, spec):
+        """Evaluate a Cortex Search filter to a boolean chunk mask."""
+        if spec is None:
+            return self._all
+        if not isinstance(spec, dict) or len(spec) != 1:
+            raise ValueError(f"A filter must be a single-operator object, got {spec!r}")
+        (operator, operand), = spec.items()
+        if operator == "@and":
+            return np.logical_and.reduce([self.filter_mask(item) for item in operand] or [self._all])
+        if operator == "@or":
+            return np.logical_or.reduce([self.filter_mask(item) for item in operand] or [~self._all])
+        if operator == "@not":
+            return ~self.filter_mask(operand)
+        if operator in ("@eq", "@gte", "@lte"):
+            (attribute, target), = operand.items()
+            if operator == "@eq":
+                bitmap = self._values(attribute).get(target)
+                return bitmap if bitmap is not None else np.zeros(len(self.rows), dtype=bool)
+            if operator == "@gte":
+                return self._range(attribute, lambda value: value >= target)
+            return self._range(attribute, lambda value: value <= target)
+        raise ValueError(f"Unsupported filter operator: {operator!r}")
+
+    # Rankers -------------------------------------------------------------
+
+    def keyword_scores(self, query, mask):
+        """Return ``(chunk_ids, scores)`` for chunks in ``mask`` matching any query term."""
+        totals = np.zeros(len(self.rows), dtype=np.float64)
+        matched = []
+        for term in set(tokenize(query)):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            ids, tfs = entry
+            if mask is not self._all:
+                keep = mask[ids]
+                ids, tfs = ids[keep], tfs[keep]
+            # A term's postings hold each chunk once, so fancy-index addition is safe
+            totals[ids] += self._idf[term] * tfs * (BM25_K1 + 1) / (tfs + self._length_norm[ids])
+            matched.append(ids)
+        ids = np.unique(np.concatenate(matched)) if matched else np.zeros(0, dtype=np.int32)
+        return ids, totals[ids]
+
+    def vector_scores(self, query, mask):
+        """Return ``(chunk_ids, cosine similarities)`` for every chunk in ``mask``."""
+        query_vector = self.embedder.embed_one(query)
+        if mask is self._all:
+            return np.arange(len(self.rows)), self._vectors @ query_vector
+        ids = np.flatnonzero(mask)
+        return ids, self._vectors[ids] @ query_vector
+
+    def rank(self, query, filter=None, limit=DEFAULT_LIMIT, mode="hybrid"):
+        """Return the ids of the best ``limit`` chunks for ``query``."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        mask = self.filter_mask(filter)
+        depth = limit * CANDIDATE_MULTIPLIER if mode == "hybrid" else limit
+        rankings = []
+        if mode in ("hybrid", "keyword"):
+            ids, scores = self.keyword_scores(query, mask)
+            rankings.append(ids[_top_k(scores, depth)])
+        if mode in ("hybrid", "vector"):
+            ids, scores = self.vector_scores(query, mask)
+            rankings.append(ids[_top_k(scores, depth)])
+        if len(rankings) == 1:
+            return rankings[0][:limit].tolist()
+
+        fused = defaultdict(float)
+        for ranking in rankings:
+            for rank, chunk_id in enumerate(ranking.tolist()):
+                fused[chunk_id] += 1.0 / (RRF_K + rank + 1)
+        return sorted(fused, key=lambda chunk_id: (-fused[chunk_id], chunk_id))[:limit]
+
+    def search(self, query, columns=None, filter=None, limit=DEFAULT_LIMIT, mode="hybrid"):
+        """Query the index like ``SEARCH_PREVIEW`` and return ``{"results": [...]}``."""
+        columns = columns or [SEARCH_COLUMN]
+        return {
+            "results": [
+                {column: self.rows[chunk_id].get(column) for column in columns}
+                for chunk_id in self.rank(query, filter, limit, mode)
+            ]
+        }
+
+
+def with_filename_attributes(row):
+    """Fill ``company_ticker`` and ``document_year`` from the file name, as the notebook's enrichment does."""
+    ticker = re.search(r"[A-Z]{2,5}", row["document_name"].upper())
+    year = re.search(r"\d{4}", row["document_name"])
+    row.setdefault("company_ticker", ticker.group(0) if ticker else None)
+    row.setdefault("document_year", int(year.group(0)) if year else None)
+    row.setdefault("coverage_universe", None)
+    row.setdefault("analyst_name", None)
+    return row
+
+
+def load_knowledge_base(conn):
+    """Read chunk rows with their search attributes from a local pipeline database.
+
+    Chunks come from ``research_knowledge_base`` (written by the chunking
+    stage); sector and document type come from the classification cache, and
+    ticker/year are derived from the file name as in the notebook's
+    enrichment step.
+    """
+    ClassificationCache(conn)  # make sure the cache table exists even if nothing was classified yet
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        "SELECT kb.relative_path, kb.document_name, kb.chunk, kb.chunk_index, "
+        "c.industry_sector, c.document_type "
+        "FROM research_knowledge_base kb "
+        f"LEFT JOIN (SELECT document_name, MAX(industry_sector) AS industry_sector, "
+        f"           MAX(document_type) AS document_type FROM {CACHE_TABLE} "
+        "           WHERE model = ? AND prompt_hash = ? GROUP BY document_name) c "
+        "ON c.document_name = kb.document_name "
+        "ORDER BY kb.relative_path, kb.chunk_index",
+        (CLASSIFICATION_MODEL, PROMPT_HASH),
+    ).fetchall()
+    return [with_filename_attributes(dict(row)) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the local research search index.")
+    parser.add_argument("query")
+    parser.add_argument("--db", default="research_pipeline.db", help="SQLite database with research_knowledge_base")
+    parser.add_argument("--filter", type=json.loads, default=None, help='e.g. \'{"@eq": {"document_type": "SEC_Filing"}}\'')
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--mode", choices=MODES, default="hybrid")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(load_knowledge_base(sqlite3.connect(args.db)))
+    response = index.search(args.query, ["document_name", "chunk_index", "industry_sector", "chunk"],
+                            args.filter, args.limit, args.mode)
+    print(json.dumps(response, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Token-aware, layout-aware chunking with near-duplicate elimination.
+
+``SPLIT_TEXT_RECURSIVE_CHARACTER`` sizes chunks by characters, so chunk token
+counts vary widely, and boilerplate (disclaimers, 10-K headers, repeated
+report footers) is indexed once per occurrence. This stage instead:
+
+- reads ``PARSE_DOCUMENT`` LAYOUT output as markdown blocks: ``#`` headings
+  start a new section and ``|`` rows form tables. Chunks never span two
+  sections, every chunk is prefixed with its section heading, and tables are
+  only split between rows, repeating the header row in each piece;
+- packs blocks up to ``max_tokens`` tokens, carrying ``overlap_tokens`` of the
+  previous prose chunk into the next one within the same section. Prose
+  blocks longer than a chunk are cut ``overlap_tokens`` short of the budget
+  so the carry still fits, e.g. a whole pypdf page arriving as one block;
+- drops chunks whose MinHash signature shows an estimated Jaccard similarity
+  of at least ``threshold`` with a chunk already kept, using LSH banding so
+  each chunk is compared only with bucket-mates.
+
+Tokens are counted as words and punctuation marks; ``DEFAULT_MAX_TOKENS``
+leaves headroom for the subword tokenizers used by the embedding models.
+
+PDFs read through pypdf come out as plain text, so only the ``--raw-documents``
+mode, which chunks the ``PARSE_DOCUMENT`` LAYOUT output stored in
+``research_knowledge_base_raw_documents`` (see ingest.py), exercises the
+heading and table handling on real parser output:
+
+    python -m research_pipeline.token_chunking generated_pdfs --db research_pipeline.db
+    python -m research_pipeline.token_chunking --raw-documents --db research_pipeline.db
+"""
+import argparse
+import functools
+import json
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from research_pipeline.chunking import SQLiteChunkSink, iter_chunks, write_batches
+from research_pipeline.ingest import RAW_DOCUMENTS_TABLE
+
+DEFAULT_MAX_TOKENS = 384
+DEFAULT_OVERLAP_TOKENS = 48
+DEDUP_THRESHOLD = 0.8
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+SHINGLE_SIZE = 5
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"\w+")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+\S")
+_TABLE_ROW = re.compile(r"^\s*\|")
+_TABLE_RULE = re.compile(r"^\s*\|?[\s:|-]+\|?\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def count_tokens(text):
+    return sum(1 for _ in _TOKEN.finditer(text))
+
+
+def _head_tokens(text, limit):
+    """The prefix of ``text`` holding its first ``limit`` tokens, and the rest."""
+    for i, match in enumerate(_TOKEN.finditer(text)):
+        if i == limit - 1:
+            return text[:match.end()], text[match.end():]
+    return text, ""
+
+
+def _tail_tokens(text, limit):
+    """The suffix of ``text`` holding its last ``limit`` tokens."""
+    starts = [match.start() for match in _TOKEN.finditer(text)]
+    return text[starts[-limit]:] if limit and len(starts) > limit else (text if limit else "")
+
+
+def layout_blocks(text):
+    """Yield ``(kind, text)`` blocks from LAYOUT markdown: ``heading``, ``table`` or ``text``."""
+    kind, lines = None, []
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            line_kind = "heading"
+        elif _TABLE_ROW.match(line):
+            line_kind = "table"
+        elif not line.strip():
+            line_kind = None
+        else:
+            line_kind = "text"
+        if line_kind != kind or line_kind == "heading":
+            if kind and lines:
+                yield kind, "\n".join(lines).strip()
+            kind, lines = line_kind, []
+        if line_kind:
+            lines.append(line)
+    if kind and lines:
+        yield kind, "\n".join(lines).strip()
+
+
+def _split_text(text, limit):
+    """Split prose into pieces of at most ``limit`` tokens, preferring sentence boundaries."""
+    if count_tokens(text) <= limit:
+        return [text]
+    pieces, current, current_tokens = [], [], 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = count_tokens(sentence)
+        while tokens > limit:
+            head, sentence = _head_tokens(sentence, limit)
+            pieces.append(head.strip())
+            tokens = count_tokens(sentence)
+        if current and current_tokens + tokens > limit:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        if sentence.strip():
+            current.append(sentence.strip())
+            current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _split_table(table, limit):
+    """Split a markdown table between rows, repeating its header in every piece."""
+    if count_tokens(table) <= limit:
+        return [table]
+    rows = table.splitlines()
+    header_rows = 2 if len(rows) > 1 and _TABLE_RULE.match(rows[1]) else 1
+    header, body = rows[:header_rows], rows[header_rows:]
+    header_tokens = count_tokens("\n".join(header))
+    if header_tokens >= limit:
+        return _split_text(table, limit)
+    pieces, current, current_tokens = [], [], header_tokens
+    for row in body:
+        tokens = count_tokens(row)
+        if current and current_tokens + tokens > limit:
+            pieces.append("\n".join(header + current))
+            current, current_tokens = [], header_tokens
+        if header_tokens + tokens > limit:
+            pieces.extend(_split_text(row, limit))
+            continue
+        current.append(row)
+        current_tokens += tokens
+    if current:
+        pieces.append("\n".join(header + current))
+    return pieces
+
+
+def chunk_document(text, max_tokens=DEFAULT_MAX_TOKENS, overlap_tokens=DEFAULT_OVERLAP_TOKENS):
+    """Split LAYOUT markdown (or plain text) into section-aligned chunks of at most ``max_tokens``."""
+    chunks = []
+    heading, heading_tokens = "", 0
+    pieces, used, last_kind = [], 0, None
+
+    def emit():
+        body = "\n\n".join(pieces).strip()
+        if body:
+            chunks.append(f"{heading}\n\n{body}" if heading else body)
+
+    for kind, block in layout_blocks(text):
+        if kind == "heading":
+            emit()
+            pieces, used, last_kind = [], 0, None
+            heading = block
+            heading_tokens = count_tokens(heading)
+            if heading_tokens >= max_tokens // 2:
+                # Runaway "headings" (e.g. OCR noise) would starve the body; treat them as text
+                heading, heading_tokens = "", 0
+                kind = "text"
+            else:
+                continue
+        budget = max(max_tokens - heading_tokens, 1)
+        if kind == "table":
+            split_pieces = _split_table(block, budget)
+        elif count_tokens(block) > budget and overlap_tokens < budget:
+            # Leave room for the carried overlap in front of every piece after the first
+            split_pieces = _split_text(block, budget - overlap_tokens)
+        else:
+            split_pieces = [block]
+        for piece in split_pieces:
+            tokens = count_tokens(piece)
+            if pieces and used + tokens > budget:
+                emit()
+                carry = _tail_tokens(pieces[-1], overlap_tokens) if last_kind == "text" else ""
+                carry_tokens = count_tokens(carry)
+                pieces, used = ([carry], carry_tokens) if carry and carry_tokens + tokens <= budget else ([], 0)
+            pieces.append(piece)
+            used += tokens
+            last_kind = kind
+    emit()
+    return chunks
+
+
+def chunk_pages(pages, max_tokens=DEFAULT_MAX_TOKENS, overlap_tokens=DEFAULT_OVERLAP_TOKENS):
+    """``iter_chunks`` splitter: chunk a document's pages as one text."""
+    return chunk_document("\n\n".join(pages), max_tokens, overlap_tokens)
+
+
+class NearDuplicateFilter:
+    """Streaming MinHash/LSH filter that remembers every chunk it has kept."""
+
+    def __init__(self, threshold=DEDUP_THRESHOLD, num_perm=NUM_PERMUTATIONS, bands=LSH_BANDS,
+                 shingle_size=SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # a * h stays below 2**64 because a and h are both 32-bit
+        self._a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = []
+        self.kept = 0
+        self.dropped = 0
+
+    def signature(self, text):
+        words = _WORD.findall(text.lower())
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (hashes[:, None] * self._a + self._b) % np.uint64((1 << 61) - 1)
+        return (permuted & np.uint64(0xFFFFFFFF)).min(axis=0)
+
+    def is_duplicate(self, text):
+        """Return True if ``text`` nearly duplicates a kept chunk; otherwise keep it."""
+        signature = self.signature(text)
+        keys = [signature[i * self.rows_per_band:(i + 1) * self.rows_per_band].tobytes() for i in range(self.bands)]
+        seen = set()
+        for band, key in zip(self._buckets, keys):
+            for candidate in band.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                    self.dropped += 1
+                    return True
+        chunk_id = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in zip(self._buckets, keys):
+            band.setdefault(key, []).append(chunk_id)
+        self.kept += 1
+        return False
+
+    def filter(self, rows, column="chunk"):
+        """Yield the rows whose ``column`` is not a near-duplicate of an earlier row."""
+        for row in rows:
+            if not self.is_duplicate(row[column]):
+                yield row
+
+
+def iter_token_chunks(paths, root=None, workers=None, max_tokens=DEFAULT_MAX_TOKENS,
+                      overlap_tokens=DEFAULT_OVERLAP_TOKENS, dedup=None, **kwargs):
+    """``iter_chunks`` with the token-aware splitter, optionally filtered by a ``NearDuplicateFilter``.
+
+    Dropped chunks leave gaps in ``chunk_index`` so the remaining keys stay stable.
+    """
+    splitter = functools.partial(chunk_pages, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    rows = iter_chunks(paths, root=root, workers=workers, splitter=splitter, **kwargs)
+    return dedup.filter(rows) if dedup is not None else rows
+
+
+def parsed_content(file_content):
+    """Markdown text of a ``TO_VARCHAR(PARSE_DOCUMENT(...))`` value; other text is returned unchanged."""
+    try:
+        parsed = json.loads(file_content)
+    except (TypeError, ValueError):
+        return file_content or ""
+    return parsed.get("content") or "" if isinstance(parsed, dict) else file_content
+
+
+def iter_raw_document_chunks(conn, max_tokens=DEFAULT_MAX_TOKENS, overlap_tokens=DEFAULT_OVERLAP_TOKENS, dedup=None):
+    """Chunk rows from the parsed documents in ``research_knowledge_base_raw_documents``, one document at a time."""
+
+    def rows():
+        documents = conn.execute(
+            f"SELECT relative_path, document_name, file_content FROM {RAW_DOCUMENTS_TABLE} ORDER BY relative_path"
+        )
+        for relative_path, document_name, file_content in documents:
+            for index, chunk in enumerate(chunk_document(parsed_content(file_content), max_tokens, overlap_tokens)):
+                yield {"relative_path": relative_path, "document_name": document_name, "chunk_index": index,
+                       "chunk": chunk}
+
+    return dedup.filter(rows()) if dedup is not None else rows()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Token-aware chunking with near-duplicate removal.")
+    parser.add_argument("root", nargs="?", help="directory of PDFs, e.g. generated_pdfs")
+    parser.add_argument("--raw-documents", action="store_true",
+                        help=f"chunk the parsed documents in {RAW_DOCUMENTS_TABLE} in --db instead of PDFs")
+    parser.add_argument("--db", default="research_pipeline.db", help="SQLite database receiving the chunks")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=DEFAULT_OVERLAP_TOKENS)
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD, help="Jaccard similarity to drop at")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if not args.raw_documents and not args.root:
+        parser.error("give a PDF directory or --raw-documents")
+
+    dedup = NearDuplicateFilter(args.threshold)
+    sink = SQLiteChunkSink(args.db)
+    if args.raw_documents:
+        relative_paths = [row[0] for row in sink.conn.execute(f"SELECT relative_path FROM {RAW_DOCUMENTS_TABLE}")]
+        # Materialized so the reads finish before the same connection starts writing
+        rows = list(iter_raw_document_chunks(sink.conn, args.max_tokens, args.overlap_tokens, dedup))
+    else:
+        root = Path(args.root).resolve()
+        paths = sorted(root.glob("*.pdf"))
+        relative_paths = [path.relative_to(root).as_posix() for path in paths]
+        rows = iter_token_chunks(paths, root, args.workers, args.max_tokens, args.overlap_tokens, dedup)
+    with sink.conn:
+        # Re-chunking replaces the previous chunks of these documents
+        sink.conn.executemany("DELETE FROM research_knowledge_base WHERE relative_path = ?",
+                              [(relative_path,) for relative_path in relative_paths])
+    written = write_batches(rows, sink)
+    print(json.dumps({"chunks": written, "near_duplicates_dropped": dedup.dropped}))
+
+
+if __name__ == "__main__":
+    main()
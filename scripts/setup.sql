@@ -103,6 +103,139 @@ INSERT INTO PORTFOLIO_HOLDINGS VALUES
 ('H012', 'Conservative Income', 'Vanguard REIT ETF', 'Real Estate', 500000.00, 3.26, 'Low', '2024-02-15'),
 ('H013', 'Utilities Income Fund', 'NextEra Energy Inc', 'Utilities', 950000.00, 6.19, 'Low', '2024-02-15');
 
+-- Portfolio-level performance and AI sentiment read by the Streamlit dashboard
+CREATE OR REPLACE TABLE PORTFOLIO_METRICS (
+    PORTFOLIO_NAME VARCHAR(50),
+    RISK_SCORE NUMBER(4,1),
+    YTD_RETURN NUMBER(6,2),
+    SHARPE_RATIO NUMBER(5,2),
+    AI_SENTIMENT VARCHAR(20),
+    AS_OF_DATE DATE
+);
+
+INSERT INTO PORTFOLIO_METRICS VALUES
+('Growth Fund Alpha', 6.5, 12.40, 1.20, 'Bullish', '2024-02-15'),
+('ESG Impact Fund', 5.2, 8.70, 1.10, 'Neutral', '2024-02-15'),
+('Emerging Markets Fund', 8.1, -2.30, 0.80, 'Bearish', '2024-02-15'),
+('Real Estate Fund', 4.8, 6.10, 1.00, 'Neutral', '2024-02-15'),
+('Conservative Income', 3.2, 4.20, 1.30, 'Bullish', '2024-02-15'),
+('Utilities Income Fund', 3.9, 5.30, 1.10, 'Neutral', '2024-02-15');
+
+-- Daily snapshots of PORTFOLIO_HOLDINGS, appended by the dashboard once per day (see streamlit/history.py)
+CREATE OR REPLACE TABLE PORTFOLIO_HOLDINGS_HISTORY (
+    AS_OF_DATE DATE,
+    HOLDING_ID VARCHAR(10),
+    PORTFOLIO_NAME VARCHAR(50),
+    SECURITY_NAME VARCHAR(100),
+    SECTOR VARCHAR(50),
+    MARKET_VALUE NUMBER(15,2),
+    WEIGHT_PERCENT NUMBER(5,2),
+    RISK_LEVEL VARCHAR(20)
+);
+
+-- Rollups only read a few dates at a time; clustering by date keeps those reads to a few micro-partitions
+ALTER TABLE PORTFOLIO_HOLDINGS_HISTORY CLUSTER BY (AS_OF_DATE);
+
+-- One row per time-range window, portfolio and sector, rolled forward incrementally as each day lands
+CREATE OR REPLACE TABLE PORTFOLIO_VALUE_ROLLUPS (
+    WINDOW_DAYS NUMBER(4,0),
+    PORTFOLIO_NAME VARCHAR(50),
+    SECTOR VARCHAR(50),
+    AS_OF_DATE DATE,
+    START_DATE DATE,
+    START_VALUE NUMBER(18,2),
+    END_VALUE NUMBER(18,2),
+    VALUE_SUM NUMBER(22,2),
+    DAYS NUMBER(6,0)
+);
+
+-- Risk metrics computed from the holdings history once per recorded day (see streamlit/risk_analytics.py)
+CREATE OR REPLACE TABLE PORTFOLIO_RISK_METRICS (
+    PORTFOLIO_NAME VARCHAR(50),
+    AS_OF_DATE DATE,
+    YTD_RETURN NUMBER(8,2),
+    ANNUAL_RETURN NUMBER(8,2),
+    VOLATILITY NUMBER(8,2),
+    SHARPE_RATIO NUMBER(8,4),
+    VAR_95 NUMBER(8,2),
+    MAX_DRAWDOWN NUMBER(8,2),
+    SECTOR_HHI NUMBER(6,4),
+    RISK_SCORE NUMBER(4,1),
+    OBSERVATIONS NUMBER(6,0)
+);
+
+-- AI risk assessments read by the Streamlit dashboard, maintained incrementally by the notebook's
+-- AI_AGG cell and the dashboard: a portfolio is re-assessed only when its holdings fingerprint changes
+CREATE OR REPLACE TABLE PORTFOLIO_RISK_ASSESSMENT (
+    PORTFOLIO_NAME VARCHAR(50),
+    RISK_SCORE NUMBER(4,1),
+    AI_SENTIMENT VARCHAR(20),
+    RATIONALE VARCHAR(2000),
+    HOLDINGS_FINGERPRINT VARCHAR(40),
+    PROMPT_HASH VARCHAR(64),
+    MODEL VARCHAR(100),
+    ASSESSED_AT TIMESTAMP_NTZ
+);
+
+-- Rule inputs and alert state per portfolio; alert rules rerun only when the inputs change (see streamlit/alerts.py)
+CREATE OR REPLACE TABLE PORTFOLIO_ALERT_STATE (
+    PORTFOLIO_NAME VARCHAR(50),
+    INPUT_FINGERPRINT VARCHAR(100),
+    ALERT_STATE VARCHAR(4000),
+    EVALUATED_AT TIMESTAMP_NTZ,
+    QUIET_UNTIL TIMESTAMP_NTZ                -- End of the earliest cooldown of a silent alert, if any
+);
+
+-- Bounded log of alert firings and resolutions read by the "Real-time Alerts" panel
+CREATE OR REPLACE TABLE PORTFOLIO_ALERTS (
+    FIRED_AT TIMESTAMP_NTZ,
+    PORTFOLIO_NAME VARCHAR(50),
+    RULE VARCHAR(50),
+    SUBJECT VARCHAR(50),
+    SEVERITY VARCHAR(20),
+    MESSAGE VARCHAR(500)
+);
+
+-- Sector-level research sentiment read by the Streamlit dashboard
+CREATE OR REPLACE TABLE SECTOR_RESEARCH (
+    SECTOR VARCHAR(50),
+    RESEARCH_SENTIMENT VARCHAR(20),
+    AI_SCORE NUMBER(3,1),
+    RISK_LEVEL VARCHAR(20)
+);
+
+INSERT INTO SECTOR_RESEARCH VALUES
+('Technology', 'Bullish', 8.2, 'Medium'),
+('Healthcare', 'Bullish', 7.8, 'Medium'),
+('Real Estate', 'Bearish', 4.3, 'High'),
+('ESG/Renewable', 'Bullish', 8.9, 'Low'),
+('Consumer Goods', 'Neutral', 6.1, 'Medium'),
+('Utilities', 'Neutral', 6.4, 'Low');
+
+-- AI document summaries written by the dashboard, one row per document content hash
+CREATE OR REPLACE TABLE RESEARCH_DOCUMENT_INSIGHTS (
+    CONTENT_HASH VARCHAR(32),
+    DOCUMENT_NAME VARCHAR(500),
+    AI_SUMMARY VARCHAR(4000),
+    KEY_RISK VARCHAR(1000),
+    RECOMMENDATION VARCHAR(1000),
+    SENTIMENT VARCHAR(20),
+    MODEL VARCHAR(100),
+    GENERATED_AT TIMESTAMP_NTZ
+);
+
+-- The dashboard stores summaries it generates so each document is summarized once
+GRANT INSERT ON TABLE RESEARCH_DOCUMENT_INSIGHTS TO ROLE asset_management_ai_role;
+-- ...and refreshes the risk assessments of portfolios whose holdings changed
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_RISK_ASSESSMENT TO ROLE asset_management_ai_role;
+-- ...and records the daily holdings history and its time-range rollups
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_HOLDINGS_HISTORY TO ROLE asset_management_ai_role;
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_VALUE_ROLLUPS TO ROLE asset_management_ai_role;
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_RISK_METRICS TO ROLE asset_management_ai_role;
+-- ...and evaluates the alert rules
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_ALERT_STATE TO ROLE asset_management_ai_role;
+GRANT INSERT, DELETE ON TABLE PORTFOLIO_ALERTS TO ROLE asset_management_ai_role;
+
 -- Grant SELECT privileges on all tables for Cortex Analyst semantic models
 GRANT SELECT ON ALL TABLES IN SCHEMA ASSET_MANAGEMENT_AI.public TO ROLE asset_management_ai_role;
 GRANT SELECT ON ALL TABLES IN SCHEMA ASSET_MANAGEMENT_AI.RESEARCH_ANALYTICS TO ROLE asset_management_ai_role;
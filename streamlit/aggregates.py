@@ -0,0 +1,123 @@
+"""Dashboard KPIs computed in the database.
+
+The metrics bar and the "Performance Summary" column used to reduce the whole
+portfolio frame in pandas on every rerun. ``KPI_SQL`` pushes that work down to
+the data source: holdings are grouped by PORTFOLIO_NAME and SECTOR, rolled up
+per portfolio, and reduced to a single row holding every KPI, so the app only
+ever receives one row regardless of the number of holdings.
+
+Risk scores and AI sentiment come from ``PORTFOLIO_RISK_ASSESSMENT`` (see
+risk_assessment.py); YTD return, Sharpe ratio and the fallback risk score come
+from ``PORTFOLIO_RISK_METRICS`` (see risk_analytics.py). The hardcoded
+``PORTFOLIO_METRICS`` values are used only for portfolios missing from both.
+
+tests/test_aggregates.py checks the SQL results against the original pandas
+calculations on the local sample data.
+"""
+
+# One AI assessment per portfolio; grouped so a duplicate row can never double-count holdings
+ASSESSMENTS = """
+    SELECT PORTFOLIO_NAME, MAX(RISK_SCORE) AS RISK_SCORE, MAX(AI_SENTIMENT) AS AI_SENTIMENT
+    FROM PORTFOLIO_RISK_ASSESSMENT
+    GROUP BY PORTFOLIO_NAME
+"""
+
+# Metrics computed from the holdings history, grouped for the same reason
+COMPUTED_METRICS = """
+    SELECT PORTFOLIO_NAME, MAX(RISK_SCORE) AS RISK_SCORE, MAX(YTD_RETURN) AS YTD_RETURN,
+           MAX(SHARPE_RATIO) AS SHARPE_RATIO
+    FROM PORTFOLIO_RISK_METRICS
+    GROUP BY PORTFOLIO_NAME
+"""
+
+# One row per portfolio for the scatter plot and insights panel
+PORTFOLIO_SQL = f"""
+SELECT
+    h.PORTFOLIO_NAME AS "Portfolio",
+    SUM(h.MARKET_VALUE) / 1000000.0 AS "Total_Value",
+    COALESCE(a.RISK_SCORE, r.RISK_SCORE, m.RISK_SCORE) AS "Risk_Score",
+    100.0 * SUM(CASE WHEN h.SECTOR = 'Technology' THEN h.MARKET_VALUE ELSE 0 END)
+        / SUM(h.MARKET_VALUE) AS "Tech_Allocation",
+    COALESCE(r.YTD_RETURN, m.YTD_RETURN) AS "YTD_Return",
+    COALESCE(r.SHARPE_RATIO, m.SHARPE_RATIO) AS "Sharpe_Ratio",
+    COALESCE(a.AI_SENTIMENT, m.AI_SENTIMENT, 'Neutral') AS "AI_Sentiment"
+FROM PORTFOLIO_HOLDINGS h
+LEFT JOIN PORTFOLIO_METRICS m ON m.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+LEFT JOIN ({ASSESSMENTS}) a ON a.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+LEFT JOIN ({COMPUTED_METRICS}) r ON r.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+GROUP BY h.PORTFOLIO_NAME, m.RISK_SCORE, m.YTD_RETURN, m.SHARPE_RATIO, m.AI_SENTIMENT, a.RISK_SCORE, a.AI_SENTIMENT,
+    r.RISK_SCORE, r.YTD_RETURN, r.SHARPE_RATIO
+ORDER BY "Total_Value" DESC
+"""
+
+# One row per sector for the allocation pie and sector table
+SECTOR_SQL = """
+SELECT
+    h.SECTOR AS "Sector",
+    SUM(h.MARKET_VALUE) / 1000000.0 AS "Total_Allocation",
+    COALESCE(r.RESEARCH_SENTIMENT, 'Neutral') AS "Research_Sentiment",
+    r.AI_SCORE AS "AI_Score",
+    COALESCE(r.RISK_LEVEL, 'Medium') AS "Risk_Level"
+FROM PORTFOLIO_HOLDINGS h
+LEFT JOIN SECTOR_RESEARCH r ON r.SECTOR = h.SECTOR
+GROUP BY h.SECTOR, r.RESEARCH_SENTIMENT, r.AI_SCORE, r.RISK_LEVEL
+ORDER BY "Total_Allocation" DESC
+"""
+
+KPI_SQL = f"""
+WITH positions AS (
+    SELECT PORTFOLIO_NAME, SECTOR, SUM(MARKET_VALUE) AS MARKET_VALUE
+    FROM PORTFOLIO_HOLDINGS
+    GROUP BY PORTFOLIO_NAME, SECTOR
+),
+portfolios AS (
+    SELECT
+        p.PORTFOLIO_NAME,
+        SUM(p.MARKET_VALUE) AS MARKET_VALUE,
+        MAX(COALESCE(a.RISK_SCORE, r.RISK_SCORE, m.RISK_SCORE)) AS RISK_SCORE,
+        MAX(COALESCE(r.YTD_RETURN, m.YTD_RETURN)) AS YTD_RETURN,
+        MAX(COALESCE(r.SHARPE_RATIO, m.SHARPE_RATIO)) AS SHARPE_RATIO,
+        MAX(COALESCE(a.AI_SENTIMENT, m.AI_SENTIMENT)) AS AI_SENTIMENT
+    FROM positions p
+    LEFT JOIN PORTFOLIO_METRICS m ON m.PORTFOLIO_NAME = p.PORTFOLIO_NAME
+    LEFT JOIN ({ASSESSMENTS}) a ON a.PORTFOLIO_NAME = p.PORTFOLIO_NAME
+    LEFT JOIN ({COMPUTED_METRICS}) r ON r.PORTFOLIO_NAME = p.PORTFOLIO_NAME
+    GROUP BY p.PORTFOLIO_NAME
+),
+ranked AS (
+    SELECT
+        portfolios.*,
+        ROW_NUMBER() OVER (ORDER BY YTD_RETURN DESC, PORTFOLIO_NAME) AS BEST_RANK,
+        ROW_NUMBER() OVER (ORDER BY YTD_RETURN ASC, PORTFOLIO_NAME) AS WORST_RANK
+    FROM portfolios
+    WHERE YTD_RETURN IS NOT NULL
+)
+SELECT
+    (SELECT COUNT(*) FROM portfolios) AS "portfolio_count",
+    (SELECT SUM(MARKET_VALUE) FROM portfolios) / 1000000.0 AS "total_aum",
+    (SELECT AVG(RISK_SCORE) FROM portfolios) AS "avg_risk_score",
+    AVG(YTD_RETURN) AS "avg_ytd_return",
+    AVG(SHARPE_RATIO) AS "avg_sharpe_ratio",
+    SUM(CASE WHEN YTD_RETURN > 10 THEN 1 ELSE 0 END) AS "high_performers",
+    (SELECT COUNT(*) FROM portfolios WHERE AI_SENTIMENT = 'Bullish') AS "bullish_count",
+    MAX(CASE WHEN BEST_RANK = 1 THEN PORTFOLIO_NAME END) AS "best_portfolio",
+    MAX(CASE WHEN BEST_RANK = 1 THEN YTD_RETURN END) AS "best_return",
+    MAX(CASE WHEN WORST_RANK = 1 THEN PORTFOLIO_NAME END) AS "worst_portfolio",
+    MAX(CASE WHEN WORST_RANK = 1 THEN YTD_RETURN END) AS "worst_return"
+FROM ranked
+"""
+
+KPI_FIELDS = [
+    "portfolio_count", "total_aum", "avg_risk_score", "avg_ytd_return", "avg_sharpe_ratio",
+    "high_performers", "bullish_count", "best_portfolio", "best_return",
+    "worst_portfolio", "worst_return",
+]
+
+
+def query_kpis(source):
+    """Run ``KPI_SQL`` against a DataSource and return the KPIs as a dict."""
+    row = source.query(KPI_SQL).iloc[0]
+    kpis = {field: row[field] for field in KPI_FIELDS}
+    for field in ("portfolio_count", "high_performers", "bullish_count"):
+        kpis[field] = int(kpis[field] or 0)
+    return kpis
@@ -0,0 +1,239 @@
+"""Incremental alert rules for the "Real-time Alerts" panel.
+
+The rules are the Dashboard Guide's alert thresholds, checked per portfolio:
+
+- ``HIGH_RISK``: risk score above ``RISK_SCORE_LIMIT`` (requires senior approval);
+- ``SECTOR_CONCENTRATION``: one sector above ``SECTOR_ALLOCATION_LIMIT`` of the
+  portfolio's market value (flag for review), one alert per sector;
+- ``NEGATIVE_SENTIMENT``: Bearish AI sentiment (investigate immediately).
+
+``PORTFOLIO_ALERT_STATE`` keeps, per portfolio, a fingerprint of the rule
+inputs (``HASH_AGG`` over sector and market value of every holding, plus the
+risk score and sentiment the dashboard shows) and the state of each of its
+alerts. ``evaluate_alerts`` compares current fingerprints with the stored ones,
+as risk_assessment.py does, and runs the rules only for the portfolios that
+differ, so the rule work follows the size of the change rather than the book.
+
+An alert is logged when its condition starts to hold and again when it clears;
+a condition that stays true logs nothing, and one that returns within
+``ALERT_COOLDOWN`` of its last firing is tracked silently. A silent condition
+still holding when the cooldown ends is logged as a new firing then:
+``QUIET_UNTIL`` records when the first cooldown of a portfolio ends, and that
+portfolio is re-evaluated from then on even if its inputs did not change.
+``PORTFOLIO_ALERTS`` keeps only the newest ``ALERT_LOG_LIMIT`` entries.
+"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from aggregates import ASSESSMENTS, COMPUTED_METRICS
+
+RISK_SCORE_LIMIT = 8.0
+SECTOR_ALLOCATION_LIMIT = 30.0
+NEGATIVE_SENTIMENT = "Bearish"
+ALERT_COOLDOWN = timedelta(hours=1)
+ALERT_LOG_LIMIT = 500
+ALERT_BATCH_SIZE = 500
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Rule inputs of every portfolio whose fingerprint differs from the one its alerts were last evaluated on,
+# or with a silent alert whose cooldown has ended
+CHANGED_PORTFOLIOS_SQL = f"""
+WITH holdings AS (
+    SELECT PORTFOLIO_NAME, CAST(HASH_AGG(SECTOR, MARKET_VALUE) AS VARCHAR) AS HOLDINGS_FINGERPRINT
+    FROM PORTFOLIO_HOLDINGS
+    GROUP BY PORTFOLIO_NAME
+),
+inputs AS (
+    SELECT
+        h.PORTFOLIO_NAME,
+        COALESCE(a.RISK_SCORE, r.RISK_SCORE, m.RISK_SCORE) AS RISK_SCORE,
+        COALESCE(a.AI_SENTIMENT, m.AI_SENTIMENT, 'Neutral') AS AI_SENTIMENT,
+        h.HOLDINGS_FINGERPRINT || '|' || COALESCE(CAST(COALESCE(a.RISK_SCORE, r.RISK_SCORE, m.RISK_SCORE) AS VARCHAR), '')
+            || '|' || COALESCE(a.AI_SENTIMENT, m.AI_SENTIMENT, 'Neutral') AS INPUT_FINGERPRINT
+    FROM holdings h
+    LEFT JOIN PORTFOLIO_METRICS m ON m.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+    LEFT JOIN ({ASSESSMENTS}) a ON a.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+    LEFT JOIN ({COMPUTED_METRICS}) r ON r.PORTFOLIO_NAME = h.PORTFOLIO_NAME
+)
+SELECT i.PORTFOLIO_NAME, i.RISK_SCORE, i.AI_SENTIMENT, i.INPUT_FINGERPRINT, s.ALERT_STATE
+FROM inputs i
+LEFT JOIN PORTFOLIO_ALERT_STATE s ON s.PORTFOLIO_NAME = i.PORTFOLIO_NAME
+WHERE s.PORTFOLIO_NAME IS NULL OR s.INPUT_FINGERPRINT <> i.INPUT_FINGERPRINT OR s.QUIET_UNTIL <= ?
+ORDER BY i.PORTFOLIO_NAME
+"""
+
+SECTOR_WEIGHTS_SQL = """
+SELECT
+    PORTFOLIO_NAME,
+    SECTOR,
+    100.0 * SUM(MARKET_VALUE) / SUM(SUM(MARKET_VALUE)) OVER (PARTITION BY PORTFOLIO_NAME) AS SECTOR_PERCENT
+FROM PORTFOLIO_HOLDINGS
+WHERE PORTFOLIO_NAME IN ({placeholders})
+GROUP BY PORTFOLIO_NAME, SECTOR
+"""
+
+STATE_COLUMNS = ["PORTFOLIO_NAME", "INPUT_FINGERPRINT", "ALERT_STATE", "EVALUATED_AT", "QUIET_UNTIL"]
+
+# Portfolios that no longer hold anything keep no alert state
+PRUNE_STATE_SQL = """
+DELETE FROM PORTFOLIO_ALERT_STATE
+WHERE PORTFOLIO_NAME NOT IN (SELECT PORTFOLIO_NAME FROM PORTFOLIO_HOLDINGS)
+"""
+
+INSERT_ALERT_SQL = """
+INSERT INTO PORTFOLIO_ALERTS (FIRED_AT, PORTFOLIO_NAME, RULE, SUBJECT, SEVERITY, MESSAGE)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+PRUNE_ALERTS_SQL = """
+DELETE FROM PORTFOLIO_ALERTS
+WHERE FIRED_AT < (
+    SELECT MIN(FIRED_AT) FROM (SELECT FIRED_AT FROM PORTFOLIO_ALERTS ORDER BY FIRED_AT DESC LIMIT {limit})
+)
+"""
+
+RECENT_ALERTS_SQL = """
+SELECT FIRED_AT, PORTFOLIO_NAME, RULE, SUBJECT, SEVERITY, MESSAGE
+FROM PORTFOLIO_ALERTS
+ORDER BY FIRED_AT DESC, CASE SEVERITY WHEN 'warning' THEN 0 WHEN 'success' THEN 1 ELSE 2 END, PORTFOLIO_NAME
+LIMIT {limit}
+"""
+
+# What each rule watches for, used when an alert clears
+RULE_LABELS = {
+    "HIGH_RISK": f"risk score above {RISK_SCORE_LIMIT:g}",
+    "SECTOR_CONCENTRATION": f"over {SECTOR_ALLOCATION_LIMIT:g}% in {{subject}}",
+    "NEGATIVE_SENTIMENT": f"{NEGATIVE_SENTIMENT} AI sentiment",
+}
+
+# One evaluation per process at a time, so concurrent sessions never log the same firing twice
+_evaluate_lock = threading.Lock()
+
+
+def evaluate_rules(portfolio, risk_score, sentiment, sector_percents):
+    """Conditions that hold for one portfolio, as ``{(rule, subject): (severity, message)}``."""
+    conditions = {}
+    if risk_score is not None and risk_score == risk_score and float(risk_score) > RISK_SCORE_LIMIT:
+        conditions[("HIGH_RISK", "")] = (
+            "warning", f"{portfolio} risk score is {float(risk_score):.1f} - requires senior approval"
+        )
+    for sector, percent in sector_percents.items():
+        if percent > SECTOR_ALLOCATION_LIMIT:
+            conditions[("SECTOR_CONCENTRATION", sector)] = (
+                "info", f"{portfolio} holds {percent:.0f}% in {sector} - flagged for review"
+            )
+    if sentiment == NEGATIVE_SENTIMENT:
+        conditions[("NEGATIVE_SENTIMENT", "")] = (
+            "warning", f"{portfolio} AI sentiment turned {NEGATIVE_SENTIMENT} - investigate"
+        )
+    return conditions
+
+
+def apply_transitions(portfolio, state, conditions, now):
+    """Advance one portfolio's alert state; return ``(state, log_rows, suppressed)``.
+
+    ``state`` maps ``"RULE|SUBJECT"`` to ``{"active", "fired_at", "quiet"}``;
+    ``quiet`` marks a condition re-raised inside the cooldown, whose clearing is
+    not logged either. One still holding once the cooldown has passed fires anew.
+    """
+    stamp = now.strftime(TIMESTAMP_FORMAT)
+    cooldown_start = (now - ALERT_COOLDOWN).strftime(TIMESTAMP_FORMAT)
+    state = dict(state)
+    rows, suppressed = [], 0
+    for (rule, subject), (severity, message) in conditions.items():
+        key = f"{rule}|{subject}"
+        previous = state.get(key)
+        if previous and previous["active"]:
+            if not previous["quiet"] or previous["fired_at"] > cooldown_start:
+                continue
+            # Re-raised inside the cooldown and still holding after it: this is the firing to log
+        elif previous and previous["fired_at"] > cooldown_start:
+            state[key] = {**previous, "active": True, "quiet": True}
+            suppressed += 1
+            continue
+        state[key] = {"active": True, "fired_at": stamp, "quiet": False}
+        rows.append((stamp, portfolio, rule, subject, severity, message))
+    for key, entry in list(state.items()):
+        rule, subject = key.split("|", 1)
+        if (rule, subject) in conditions:
+            continue
+        if entry["active"]:
+            if not entry["quiet"]:
+                label = RULE_LABELS[rule].format(subject=subject)
+                rows.append((stamp, portfolio, rule, subject, "success", f"{portfolio} cleared: {label}"))
+            state[key] = {**entry, "active": False}
+        elif entry["fired_at"] <= cooldown_start:
+            # Past the cooldown an inactive entry no longer affects anything
+            del state[key]
+    return state, rows, suppressed
+
+
+def quiet_until(state):
+    """When the earliest cooldown of a silent, still active alert in ``state`` ends; None if there is none."""
+    starts = [entry["fired_at"] for entry in state.values() if entry["active"] and entry["quiet"]]
+    if not starts:
+        return None
+    ends = datetime.strptime(min(starts), TIMESTAMP_FORMAT) + ALERT_COOLDOWN
+    return ends.strftime(TIMESTAMP_FORMAT)
+
+
+def _sector_percents(source, names):
+    placeholders = ", ".join("?" * len(names))
+    df = source.query(SECTOR_WEIGHTS_SQL.format(placeholders=placeholders), list(names))
+    percents = {name: {} for name in names}
+    for row in df.itertuples(index=False):
+        percents[row.PORTFOLIO_NAME][row.SECTOR] = float(row.SECTOR_PERCENT)
+    return percents
+
+
+def evaluate_alerts(source, now=None, batch_size=ALERT_BATCH_SIZE):
+    """Run the alert rules for portfolios whose inputs changed since the last evaluation; return stats."""
+    now = now or datetime.now(timezone.utc)
+    with _evaluate_lock:
+        changed = source.query(CHANGED_PORTFOLIOS_SQL, [now.strftime(TIMESTAMP_FORMAT)])
+        stats = {"changed": len(changed), "fired": 0, "resolved": 0, "suppressed": 0}
+        records = list(changed.itertuples(index=False))
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            percents = _sector_percents(source, [row.PORTFOLIO_NAME for row in batch])
+            state_rows, alert_rows = [], []
+            for row in batch:
+                previous = json.loads(row.ALERT_STATE) if isinstance(row.ALERT_STATE, str) else {}
+                conditions = evaluate_rules(row.PORTFOLIO_NAME, row.RISK_SCORE, row.AI_SENTIMENT,
+                                            percents[row.PORTFOLIO_NAME])
+                state, rows, suppressed = apply_transitions(row.PORTFOLIO_NAME, previous, conditions, now)
+                state_rows.append((row.PORTFOLIO_NAME, str(row.INPUT_FINGERPRINT), json.dumps(state, sort_keys=True),
+                                   now.strftime(TIMESTAMP_FORMAT), quiet_until(state)))
+                alert_rows.extend(rows)
+                stats["suppressed"] += suppressed
+            source.replace_rows("PORTFOLIO_ALERT_STATE", STATE_COLUMNS, state_rows, key="PORTFOLIO_NAME")
+            source.executemany(INSERT_ALERT_SQL, alert_rows)
+            stats["resolved"] += sum(1 for row in alert_rows if row[4] == "success")
+            stats["fired"] += sum(1 for row in alert_rows if row[4] != "success")
+        source.execute(PRUNE_STATE_SQL)
+        if stats["fired"] or stats["resolved"]:
+            source.execute(PRUNE_ALERTS_SQL.format(limit=int(ALERT_LOG_LIMIT)))
+        return stats
+
+
+def recent_alerts(source, limit=5):
+    """Newest logged alerts first."""
+    return source.query(RECENT_ALERTS_SQL.format(limit=int(limit)))
+
+
+def time_ago(fired_at, now=None):
+    """``"2 min ago"``-style age of a logged alert."""
+    now = now or datetime.now(timezone.utc)
+    fired = datetime.strptime(str(fired_at)[:19], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    minutes = max(int((now - fired).total_seconds() // 60), 0)
+    if minutes < 1:
+        return "just now"
+    if minutes < 60:
+        return f"{minutes} min ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} hour{'s' if hours > 1 else ''} ago"
+    days = hours // 24
+    return f"{days} day{'s' if days > 1 else ''} ago"
@@ -0,0 +1,576 @@
+"""🏦 Dashboard page.
+
+Heavy dependencies (pandas, NumPy, Plotly) are imported here rather than in
+app.py, so they load only the first time this page is shown.
+"""
+import logging
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures import as_completed
+
+import streamlit as st
+
+import instrumentation
+from aggregates import PORTFOLIO_SQL, SECTOR_SQL, query_kpis
+from alerts import evaluate_alerts, recent_alerts, time_ago
+from charts import build_risk_scatter, build_sector_pie
+from data_source import CACHE_TTL_SECONDS, SnowflakeDataSource, get_data_source
+from document_analysis import (
+    PANEL_DOCUMENT_LIMIT, SUMMARY_TIMEOUT_SECONDS, CortexSummarizer, FakeSummarizer, SummaryService,
+    research_documents, stored_insights,
+)
+from history import TIME_RANGES, load_rollups, record_day
+from instrumentation import EXPORT_ENV_VAR, REGISTRY, cached_loader, export_path, timed
+from holdings_store import HoldingsStore, compact_frame
+from insights import (
+    DEFAULT_PAGE_SIZE, INSIGHT_SORT_KEYS, SENTIMENT_ADVICE, SENTIMENT_EMOJI, format_insights, select_window,
+)
+from risk_analytics import refresh_risk_metrics
+from risk_assessment import CortexAssessor, FakeAssessor, refresh_risk_assessments
+from semantic_index import (
+    ANALYST_REPLIES, CortexAnalyst, SemanticIndex, ask, dimension_values, load_semantic_model, semantic_model_mtime,
+)
+from scenarios import EDIT_KINDS, ScenarioBase, compare, describe, replay
+from sections import SECTION_NAMES, begin_full_run, end_full_run, last_rerun, section
+from sidebar import render_instrumentation, render_technical_details
+
+st.title("🏦 Asset Management Intelligence Dashboard")
+st.markdown("### Powered by Snowflake Cortex AI")
+st.markdown("---")
+
+begin_full_run()
+
+# Sidebar Controls
+st.sidebar.header("📊 Dashboard Controls")
+refresh_data = st.sidebar.button("🔄 Refresh Data", type="primary")
+selected_time_range = st.sidebar.selectbox(
+    "📅 Time Range",
+    list(TIME_RANGES)
+)
+
+# Help Section
+st.sidebar.markdown("---")
+st.sidebar.markdown("### 💡 Need Help?")
+st.sidebar.markdown("Switch to the **📖 Dashboard Guide** page for detailed explanations!")
+
+# Streamlit runs this page as __main__, so name the logger after the page
+logger = logging.getLogger("dashboard")
+
+# Re-assess only portfolios whose holdings changed since their last AI assessment (see risk_assessment.py)
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def refresh_portfolio_assessments():
+    source = get_data_source()
+    assessor = CortexAssessor(source) if isinstance(source, SnowflakeDataSource) else FakeAssessor(source)
+    try:
+        return refresh_risk_assessments(source, assessor)
+    except Exception:
+        # Stored (or fallback) scores are still shown; the next refresh retries
+        logger.exception("Refreshing portfolio risk assessments failed")
+        return None
+
+# Portfolio data from PORTFOLIO_HOLDINGS via the shared data source (see data_source.py)
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_portfolio_data():
+    return get_data_source().query(PORTFOLIO_SQL)
+
+# Holdings indexed once for what-if scenarios; every session's scenarios overlay this copy (see scenarios.py)
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_scenario_base():
+    return ScenarioBase.from_source(get_data_source(), load_portfolio_data())
+
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_sector_data():
+    return compact_frame(get_data_source().query(SECTOR_SQL))
+
+# Indexed, read-only store shared by all sessions; filters become range lookups
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_holdings_store():
+    return HoldingsStore(load_portfolio_data())
+
+# Insight text for every portfolio, formatted once per data load
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_insights_table():
+    return format_insights(load_holdings_store().frame)
+
+# Figures are cached on the filter key so unrelated widget changes reuse them
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def load_scatter_figure(min_value, max_risk):
+    store = load_holdings_store()
+    return build_risk_scatter(store.filter(min_value=min_value, max_risk=max_risk))
+
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_sector_figure():
+    return build_sector_pie(load_sector_data())
+
+# Every KPI in one aggregate query (see aggregates.py)
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_dashboard_kpis():
+    return query_kpis(get_data_source())
+
+# Documents in RESEARCH_KNOWLEDGE_BASE with their manifest content hashes; None until the notebook has built it
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_research_documents():
+    try:
+        return research_documents(get_data_source())
+    except Exception:
+        return None
+
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_document_insights():
+    return stored_insights(get_data_source())
+
+# One summary pool per server process, so concurrent sessions share in-flight calls
+@cached_loader(st.cache_resource, show_spinner=False)
+def get_summary_service():
+    source = get_data_source()
+    summarizer = CortexSummarizer(source) if isinstance(source, SnowflakeDataSource) else FakeSummarizer()
+    return SummaryService(source, summarizer)
+
+# Today's holdings join the history once per day, rolling every window forward (see history.py)
+# and recomputing the risk metrics the portfolio queries read (see risk_analytics.py)
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_history_rollups():
+    source = get_data_source()
+    record_day(source)
+    refresh_risk_metrics(source)
+    return load_rollups(source)
+
+# Alert rules rerun only for portfolios whose risk, sentiment or sector mix changed (see alerts.py)
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def refresh_alerts():
+    try:
+        return evaluate_alerts(get_data_source())
+    except Exception:
+        # The log keeps showing the last evaluation; the next refresh retries
+        logger.exception("Evaluating portfolio alerts failed")
+        return None
+
+@cached_loader(st.cache_data, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_recent_alerts():
+    return recent_alerts(get_data_source())
+
+# Compiled once per model file version; the mtime argument recompiles it when the YAML changes
+@cached_loader(st.cache_resource, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_semantic_index(model_mtime):
+    if model_mtime is None:
+        return None
+    source = get_data_source()
+    model = load_semantic_model()
+    return SemanticIndex(model, dimension_values(source, model))
+
+if refresh_data:
+    # Drop cached results so every loader re-queries the data source
+    refresh_portfolio_assessments.clear()
+    load_portfolio_data.clear()
+    load_sector_data.clear()
+    load_dashboard_kpis.clear()
+    load_holdings_store.clear()
+    load_scenario_base.clear()
+    load_insights_table.clear()
+    load_scatter_figure.clear()
+    load_sector_figure.clear()
+    load_semantic_index.clear()
+    load_history_rollups.clear()
+    refresh_alerts.clear()
+    load_recent_alerts.clear()
+    load_research_documents.clear()
+    load_document_insights.clear()
+    ANALYST_REPLIES.clear()
+
+# Load data
+refresh_portfolio_assessments()
+history_rollups = load_history_rollups()
+refresh_alerts()
+holdings_store = load_holdings_store()
+sector_df = load_sector_data()
+kpis = load_dashboard_kpis()
+# Switching the time range picks a precomputed window; None until the first day is recorded
+time_window = history_rollups.get(TIME_RANGES[selected_time_range])
+
+# Each section is a fragment: widgets inside a section rerun only that section
+@section("KPIs")
+def render_kpis():
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total AUM", f"${kpis['total_aum']:.1f}M", f"{kpis['avg_ytd_return']:.1f}%")
+    with col2:
+        st.metric("Avg Risk Score", f"{kpis['avg_risk_score']:.1f}", f"{kpis['portfolio_count']} portfolios")
+    with col3:
+        high_performers = kpis['high_performers']
+        st.metric("High Performers", high_performers, f"{high_performers/kpis['portfolio_count']*100:.0f}%")
+    with col4:
+        bullish_count = kpis['bullish_count']
+        st.metric("AI Bullish Signals", bullish_count, f"{bullish_count/kpis['portfolio_count']*100:.0f}%")
+
+@section("Portfolio Analysis")
+def render_portfolio_analysis():
+    # Filter controls live with the charts they drive, so moving them reruns only this section
+    filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+    with filter_col1:
+        risk_threshold = st.slider("⚠️ Risk Threshold", 1.0, 10.0, 7.0, 0.5, key="risk_threshold")
+    with filter_col2:
+        min_portfolio_value = st.number_input("💰 Min Portfolio Value ($M)", 0.0, 100.0, 1.0, key="min_portfolio_value")
+
+    # Filter data based on the controls above
+    filtered_rows = holdings_store.filter_rows(min_value=min_portfolio_value, max_risk=risk_threshold)
+    with filter_col3:
+        st.metric("Matching Portfolios", len(filtered_rows))
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1, timed("dashboard_section_seconds", section="Risk Scatter"):
+        st.subheader("📈 Portfolio Risk vs Performance Analysis")
+
+        # Interactive scatter plot (WebGL, density-binned at production scale)
+        fig_scatter = load_scatter_figure(min_portfolio_value, risk_threshold)
+        st.plotly_chart(fig_scatter, use_container_width=True)
+
+    with col2, timed("dashboard_section_seconds", section="AI Insights"):
+        st.subheader("🎯 AI Investment Insights")
+
+        # AI Insights Panel: sort, search and page over preformatted rows
+        insight_sort = st.selectbox("Sort by", list(INSIGHT_SORT_KEYS), key="insight_sort")
+        insight_search = st.text_input("🔍 Find portfolio", key="insight_search")
+        insight_rows = load_insights_table().iloc[filtered_rows]
+        window, match_count, page_count = select_window(insight_rows, insight_sort, insight_search)
+        insight_page = 1
+        if page_count > 1:
+            insight_page = st.number_input("Page", 1, page_count, 1, key="insight_page")
+            window, match_count, page_count = select_window(
+                insight_rows, insight_sort, insight_search, insight_page, DEFAULT_PAGE_SIZE
+            )
+        st.caption(f"Showing {len(window)} of {match_count} portfolios (page {insight_page} of {page_count})")
+
+        for label, details, sentiment in zip(window['Label'], window['Details'], window['Sentiment']):
+            with st.expander(label):
+                st.markdown(details)
+
+                if sentiment == 'Bullish':
+                    st.success(SENTIMENT_ADVICE[sentiment])
+                elif sentiment == 'Bearish':
+                    st.error(SENTIMENT_ADVICE[sentiment])
+                else:
+                    st.info(SENTIMENT_ADVICE['Neutral'])
+
+@section("Ask Your Portfolio")
+def render_ask_portfolio():
+    st.subheader("💬 Ask Your Portfolio")
+    question = st.text_input(
+        "Ask a question about the holdings", placeholder="e.g. total market value by sector", key="portfolio_question"
+    )
+    if not question:
+        return
+
+    # Simple questions are answered from the compiled semantic index; the rest go to Cortex Analyst
+    source = get_data_source()
+    analyst = CortexAnalyst() if isinstance(source, SnowflakeDataSource) else None
+    try:
+        answer = ask(question, load_semantic_index(semantic_model_mtime()), source, analyst, ANALYST_REPLIES)
+    except Exception as exc:
+        st.error(f"Could not answer that question: {exc}")
+        return
+
+    if answer['route'] == "unanswered":
+        st.info("This question needs Cortex Analyst, which is available when the app runs in Snowflake.")
+        return
+    if answer['route'] == "local":
+        st.caption(f"⚡ Answered from the semantic model in {answer['elapsed_ms']:.0f} ms: {answer['text']}")
+    else:
+        st.caption(f"🤖 Answered by Cortex Analyst in {answer['elapsed_ms'] / 1000:.1f} s")
+        st.markdown(answer['text'])
+    if answer['data'] is not None:
+        st.dataframe(answer['data'], use_container_width=True, hide_index=True)
+    if answer['sql']:
+        with st.expander("SQL"):
+            st.code(answer['sql'], language="sql")
+
+@section("What-If Scenarios")
+def render_scenarios():
+    st.subheader("🧪 What-If Scenarios")
+    st.caption("Edits apply to an in-memory copy of the holdings - nothing is written to the database")
+    base = load_scenario_base()
+    # Edits per scenario name, replayed onto a fresh base after a refresh
+    scenario_edits = st.session_state.setdefault("scenario_edits", {"Scenario A": []})
+    built = st.session_state.setdefault("scenario_cache", {})
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        with st.expander("➕ New scenario"):
+            new_name = st.text_input("Name", key="scenario_new_name", placeholder="e.g. Tech drawdown")
+            if st.button("Create", key="scenario_create") and new_name and new_name not in scenario_edits:
+                scenario_edits[new_name] = []
+        target = st.selectbox("Scenario", list(scenario_edits), key="scenario_target")
+        kind = st.selectbox("Edit", list(EDIT_KINDS), format_func=EDIT_KINDS.get, key="scenario_kind")
+        portfolios, sectors = sorted(base.holdings), sorted(base.by_sector)
+        with st.form("scenario_edit"):
+            if kind == "add":
+                edit = {
+                    "kind": "add",
+                    "portfolio": st.selectbox("Portfolio", portfolios),
+                    "security": st.text_input("Security", "OpenAI Corp"),
+                    "sector": st.selectbox("Sector", sectors),
+                    "market_value": st.number_input("Market value ($M)", 0.01, 1000.0, 0.5) * 1e6,
+                    "risk_level": st.selectbox("Risk level", ["Low", "Medium", "High"], index=2),
+                }
+            elif kind == "scale":
+                edit = {
+                    "kind": "scale",
+                    "security": st.selectbox("Security", sorted(base.by_security)),
+                    "factor": st.number_input("Weight multiplier", 0.0, 10.0, 1.10, 0.05),
+                    "portfolio": st.selectbox("Portfolio", [None, *portfolios],
+                                              format_func=lambda p: p or "All portfolios"),
+                }
+            else:
+                edit = {
+                    "kind": "shock",
+                    "sector": st.selectbox("Sector", sectors),
+                    "change_pct": st.number_input("Value change (%)", -100.0, 500.0, -10.0, 1.0),
+                    "portfolio": st.selectbox("Portfolio", [None, *portfolios],
+                                              format_func=lambda p: p or "All portfolios"),
+                }
+            if st.form_submit_button("Apply"):
+                scenario_edits[target].append(edit)
+        if scenario_edits[target] and st.button("↩️ Undo last edit", key="scenario_undo"):
+            scenario_edits[target].pop()
+
+    with col2:
+        start = time.perf_counter()
+        scenarios = []
+        for name, edits in scenario_edits.items():
+            built[name] = replay(base, name, edits, built.get(name))
+            scenarios.append(built[name])
+        comparison = compare([base.scenario("Baseline"), *scenarios])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.dataframe(comparison, use_container_width=True)
+        st.caption(f"⚡ {len(scenarios)} scenario(s) over {len(base)} portfolios recomputed in {elapsed_ms:.1f} ms")
+        for scenario in scenarios:
+            if not scenario.edits:
+                continue
+            with st.expander(f"{scenario.name}: {len(scenario.edits)} edit(s), "
+                             f"{len(scenario.touched)} portfolio(s) affected"):
+                for i, edit in enumerate(scenario.edits, 1):
+                    st.write(f"**{i}.** {describe(edit)}")
+                st.dataframe(scenario.changes(), use_container_width=True, hide_index=True)
+
+@section("Sector Allocation")
+def render_sector_allocation():
+    st.subheader("🏭 Sector Allocation with AI Sentiment")
+
+    # Interactive pie chart with sentiment colors (top sectors plus "Other")
+    with timed("dashboard_section_seconds", section="Sector Pie"):
+        fig_pie = load_sector_figure()
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+    # Sector performance table
+    st.subheader("📊 Sector Performance Metrics")
+    sector_display = sector_df.copy()
+    sector_display['Total_Allocation'] = sector_display['Total_Allocation'].apply(lambda x: f"${x:.1f}M")
+    sector_display['AI_Score'] = sector_display['AI_Score'].apply(lambda x: f"{x:.1f}/10")
+    columns = ['Sector', 'Total_Allocation', 'AI_Score', 'Research_Sentiment', 'Risk_Level']
+    if time_window is not None:
+        change = sector_display['Sector'].map(time_window['by_sector']['CHANGE_PCT'])
+        sector_display['Value_Change'] = change.apply(lambda x: "n/a" if x != x else f"{x:+.1f}%")
+        columns.insert(2, 'Value_Change')
+
+    with timed("dashboard_section_seconds", section="Sector Table"):
+        st.dataframe(
+            sector_display[columns],
+            use_container_width=True,
+            hide_index=True
+        )
+
+def render_document_insight(placeholder, document_name, insight):
+    with placeholder.container():
+        sentiment_emoji = SENTIMENT_EMOJI.get(insight['sentiment'], "🟡")
+
+        with st.expander(f"{sentiment_emoji} {document_name[:25]}..."):
+            st.write(f"**AI Summary:** {insight['ai_summary']}")
+            st.write(f"**Key Risk:** {insight['key_risk']}")
+            st.write(f"**Recommendation:** {insight['recommendation']}")
+
+            if insight['sentiment'] == 'Bullish':
+                st.success(f"AI Sentiment: {insight['sentiment']} - Positive outlook")
+            else:
+                st.info(f"AI Sentiment: {insight['sentiment']}")
+
+@section("Document Analysis")
+def render_document_analysis():
+    st.subheader("📄 AI Document Analysis")
+
+    documents = load_research_documents()
+    if not documents:
+        st.info("No documents in RESEARCH_KNOWLEDGE_BASE yet - run the research notebook to build it.")
+        return
+
+    # Stored summaries render immediately; missing ones are generated concurrently (see document_analysis.py)
+    insights = load_document_insights()
+    service = get_summary_service()
+    pending = {}
+    for doc in documents[:PANEL_DOCUMENT_LIMIT]:
+        placeholder = st.empty()
+        insight = insights.get(doc['content_hash'])
+        if insight:
+            render_document_insight(placeholder, doc['document_name'], insight)
+        else:
+            placeholder.info(f"⏳ Summarizing {doc['document_name']}...")
+            pending[service.submit(doc)] = (doc, placeholder)
+
+    if not pending:
+        return
+    # Fill each placeholder as its summary arrives instead of waiting for the slowest one
+    try:
+        for future in as_completed(pending, timeout=SUMMARY_TIMEOUT_SECONDS):
+            doc, placeholder = pending[future]
+            insight = future.result() if future.exception() is None else None
+            if insight:
+                render_document_insight(placeholder, doc['document_name'], insight)
+            else:
+                placeholder.warning(f"Could not summarize {doc['document_name']}")
+    except FuturesTimeout:
+        for future, (doc, placeholder) in pending.items():
+            if not future.done():
+                placeholder.warning(f"⌛ {doc['document_name']} is still being summarized - it will appear on refresh")
+    load_document_insights.clear()
+
+@section("Alerts")
+def render_alerts():
+    st.subheader("⚡ Real-time Alerts")
+
+    # Newest firings and resolutions from the alert log (see alerts.py)
+    alerts = load_recent_alerts()
+    if alerts.empty:
+        st.success("✅ No alerts - every portfolio is within the Guide's thresholds")
+
+    for alert in alerts.itertuples(index=False):
+        age = time_ago(alert.FIRED_AT)
+        if alert.SEVERITY == "warning":
+            st.warning(f"⚠️ {alert.MESSAGE} ({age})")
+        elif alert.SEVERITY == "success":
+            st.success(f"✅ {alert.MESSAGE} ({age})")
+        else:
+            st.info(f"ℹ️ {alert.MESSAGE} ({age})")
+
+@section("Recommendations")
+def render_recommendations():
+    st.subheader("🎯 AI Recommendations")
+
+    # AI-generated recommendations
+    recommendations = [
+        "Increase Technology sector allocation by 3-5% based on positive AI sentiment",
+        "Consider hedging Real Estate exposure due to bearish outlook", 
+        "Rebalance ESG portfolio to capture 18% return opportunity",
+        "Monitor Emerging Markets volatility - consider reducing position size"
+    ]
+
+    for i, rec in enumerate(recommendations, 1):
+        st.write(f"**{i}.** {rec}")
+
+@section("Performance Summary")
+def render_performance_summary():
+    st.subheader("📈 Performance Summary")
+
+    # Performance metrics
+    st.metric("Average YTD Return", f"{kpis['avg_ytd_return']:.1f}%")
+    st.write(f"**Best:** {kpis['best_portfolio']} ({kpis['best_return']:.1f}%)")
+    st.write(f"**Worst:** {kpis['worst_portfolio']} ({kpis['worst_return']:.1f}%)")
+
+    # Risk-adjusted returns
+    st.metric("Average Sharpe Ratio", f"{kpis['avg_sharpe_ratio']:.2f}")
+
+    # Value change over the selected time range, from the precomputed window rollup
+    if time_window is not None and time_window['change_pct'] is not None:
+        by_portfolio = time_window['by_portfolio'].dropna(subset=['CHANGE_PCT'])
+        st.metric(f"AUM Change ({selected_time_range})", f"{time_window['change_pct']:+.1f}%")
+        if len(by_portfolio):
+            best, worst = by_portfolio.iloc[0], by_portfolio.iloc[-1]
+            st.write(f"**Top mover:** {best['PORTFOLIO_NAME']} ({best['CHANGE_PCT']:+.1f}%)")
+            st.write(f"**Bottom mover:** {worst['PORTFOLIO_NAME']} ({worst['CHANGE_PCT']:+.1f}%)")
+        st.caption(f"Since {time_window['start_date']:%Y-%m-%d}")
+
+# Main Dashboard Layout
+render_kpis()
+st.markdown("---")
+
+# Row 1: Portfolio Analysis
+render_portfolio_analysis()
+
+# Natural-language questions over the holdings
+st.markdown("---")
+render_ask_portfolio()
+
+# What-if scenarios over an in-memory copy of the holdings
+st.markdown("---")
+render_scenarios()
+
+# Row 2: Sector Analysis and Document Insights
+st.markdown("---")
+col1, col2 = st.columns([1, 1])
+with col1:
+    render_sector_allocation()
+with col2:
+    # Filled at the end of the run so slow summaries never hold up the sections below
+    document_analysis_slot = st.container()
+
+# Row 3: Performance Tracking and Alerts
+st.markdown("---")
+col1, col2, col3 = st.columns(3)
+with col1:
+    render_alerts()
+with col2:
+    render_recommendations()
+with col3:
+    render_performance_summary()
+
+# Footer
+st.markdown("---")
+st.markdown("#### 🚀 About This Dashboard")
+st.markdown("""
+This interactive dashboard demonstrates how **Snowflake Cortex AI** can power real-time asset management analytics:
+
+- **AI_COMPLETE**: Document summarization and insight extraction
+- **AI_CLASSIFY**: Intelligent sentiment analysis and risk categorization  
+- **AI_AGG**: Natural language portfolio analytics
+- **Interactive Controls**: Dynamic filtering and real-time updates
+
+**💡 Pro Tip:** In production, connect this to live Snowflake data for real-time portfolio monitoring!
+""")
+
+with document_analysis_slot:
+    render_document_analysis()
+end_full_run()
+
+
+# Technical Information in Sidebar
+render_technical_details(
+    f"Connected to: {get_data_source().name}",
+    f"Refresh rate: cached for {CACHE_TTL_SECONDS // 60} min",
+)
+
+
+# How many sections the last run re-executed, shown whether or not instrumentation is on
+def render_section_reruns():
+    reran = last_rerun()
+    st.markdown(f"Sections rerun: {len(reran)} of {len(SECTION_NAMES)}")
+    st.caption(", ".join(reran))
+
+
+# Live timings and cache counters from instrumentation.py; also rewrites the export file when one is set
+def render_live_metrics():
+    render_instrumentation()
+    path = export_path()
+    if path:
+        try:
+            REGISTRY.export(path)
+            st.caption(f"Exported to {path}")
+        except OSError as exc:
+            st.caption(f"Could not write {EXPORT_ENV_VAR}: {exc}")
+
+
+with st.sidebar:
+    render_section_reruns()
+    if instrumentation.ENABLED:
+        st.fragment(run_every="5s")(render_live_metrics)()
+    else:
+        # Nothing is recorded, so there is nothing to poll: a static "Off" caption
+        render_instrumentation()
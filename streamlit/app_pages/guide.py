@@ -0,0 +1,310 @@
+"""📖 Dashboard Guide page: static markdown only, no data or charting imports."""
+import streamlit as st
+
+from sidebar import render_technical_details
+
+st.title("📖 Dashboard Guide")
+st.markdown("### Understanding Your Asset Management Intelligence Dashboard")
+st.markdown("---")
+
+# Dashboard Guide Page Content
+st.markdown("""
+Welcome to your comprehensive guide for understanding the **Asset Management Intelligence Dashboard**. 
+This AI-powered platform transforms complex financial data into actionable insights.
+""")
+
+# Overview Section
+with st.expander("🔍 **What Does This Dashboard Show You?**", expanded=True):
+    st.markdown("""
+    This dashboard is your **AI-powered command center** for investment management, answering critical questions:
+
+    - **"Which portfolios are performing well?"** → Performance metrics at the top
+    - **"What does AI think about our investments?"** → Color-coded sentiment analysis (🟢🟡🔴)
+    - **"Where are our biggest risks?"** → Risk scores and real-time alerts
+    - **"What do the latest research reports recommend?"** → AI document analysis
+    - **"How should we adjust our strategy?"** → Dynamic AI recommendations
+
+    **Key Benefits:**
+    - 🚀 **90% reduction** in document processing time
+    - 📊 **Real-time insights** from AI analysis of market data
+    - �� **Actionable recommendations** tailored to your portfolio
+    - 📈 **Professional visualizations** for client presentations
+    """)
+
+# Dashboard Sections Explanation
+st.subheader("📊 Dashboard Sections Explained")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    with st.expander("📈 **Top Metrics Bar (KPIs)**"):
+        st.markdown("""
+        **Total AUM (Assets Under Management)**
+        - Shows combined value of all portfolios ($220M+ in demo)
+        - Tracks business growth and portfolio scale
+
+        **Average Risk Score**
+        - Portfolio risk on 1-10 scale (higher = more volatile)
+        - Helps assess overall risk exposure
+
+        **High Performers**
+        - Portfolios exceeding 10% annual returns
+        - Percentage shows team effectiveness
+
+        **AI Bullish Signals**
+        - Portfolios AI recommends as "buy/hold"
+        - Green percentage indicates AI confidence
+        """)
+
+    with st.expander("📈 **Risk vs Performance Chart**"):
+        st.markdown("""
+        **How to Read:**
+        - **X-axis:** Risk Score (1-10) - portfolio volatility
+        - **Y-axis:** Portfolio Value ($M) - investment size
+        - **Dot Size:** Technology allocation (bigger = more tech)
+        - **Colors:** AI sentiment about each portfolio
+
+        **Color Meanings:**
+        - 🟢 **Green (Bullish):** AI recommends keeping/buying more
+        - 🟡 **Yellow (Neutral):** AI sees mixed signals
+        - 🔴 **Red (Bearish):** AI suggests reducing exposure
+
+        **Key Insights:**
+        - **Top-right:** High value, high risk (growth-focused)
+        - **Bottom-left:** Lower value, lower risk (conservative)
+        - **Hover:** See detailed performance metrics
+        """)
+
+with col2:
+    with st.expander("🏭 **Sector Allocation Pie Chart**"):
+        st.markdown("""
+        **Visual Elements:**
+        - **Slice Size:** Investment amount by industry
+        - **Colors:** AI sentiment by sector (same as above)
+        - **Labels:** Show percentage and dollar amounts
+
+        **Interactive Features:**
+        - **Hover:** Detailed allocation information
+        - **Click:** Focus on specific sectors
+        - **Color patterns:** Quick visual of AI outlook
+
+        **Strategic Insights:**
+        - Identify over/under-exposed sectors
+        - See where AI spots opportunities vs. risks
+        - Guide rebalancing decisions
+        """)
+
+    with st.expander("📄 **AI Document Analysis**"):
+        st.markdown("""
+        **How It Works:**
+        1. AI reads research PDFs using Snowflake Cortex
+        2. Extracts key insights via natural language processing
+        3. Provides summaries and recommendations
+        4. Identifies risks and strategic considerations
+        5. Stores each summary, so a document is only re-analyzed when its content changes
+
+        **Each Document Shows:**
+        - **AI Summary:** Key findings in plain English
+        - **Key Risk:** Main concerns identified
+        - **Recommendation:** Specific allocation advice
+        - **Sentiment:** Overall AI outlook
+
+        **Business Value:**
+        - Saves hours of manual document review
+        - Catches insights humans might miss
+        - Standardizes analysis across reports
+        """)
+
+# Score Calculations
+st.subheader("🧮 How Are Scores Calculated?")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    with st.expander("⚠️ **Risk Scores (1-10)**"):
+        st.markdown("""
+        **AI analyzes multiple factors:**
+        - **Historical volatility** (price fluctuations)
+        - **Asset types** (stocks vs. bonds)
+        - **Geographic exposure** (emerging markets risk)
+        - **Sector concentration** (diversification level)
+
+        **Scale interpretation:**
+        - **1-3:** Conservative (government bonds, utilities)
+        - **4-6:** Balanced (mixed stock/bond portfolios)
+        - **7-10:** Aggressive (growth stocks, crypto, emerging markets)
+
+        **Updates:** Recalculated daily with new market data; until the AI has
+        assessed a portfolio, its score blends volatility (70%) with sector concentration (30%)
+        """)
+
+with col2:
+    with st.expander("🤖 **AI Sentiment Analysis**"):
+        st.markdown("""
+        **Snowflake Cortex AI processes:**
+        - **Research documents** (earnings reports, analyst notes)
+        - **News sentiment** (positive/negative media coverage)
+        - **Technical indicators** (price trends, volume)
+        - **Economic factors** (rates, inflation, GDP)
+
+        **AI Processing Steps:**
+        1. **AI_COMPLETE:** Summarizes research documents
+        2. **AI_CLASSIFY:** Categorizes market outlook
+        3. **AI_AGG:** Aggregates portfolio-level insights
+        4. **Real-time updates** as new data arrives
+
+        **Confidence levels** indicated by color intensity
+        """)
+
+with col3:
+    with st.expander("📊 **Performance Metrics**"):
+        st.markdown("""
+        **YTD Returns:**
+        - Actual portfolio performance year-to-date
+        - Calculated from real trading data
+        - Compared to relevant benchmarks
+
+        **Sharpe Ratio:**
+        - Risk-adjusted returns (higher = better)
+        - Formula: (Return - Risk-free rate) / Volatility
+        - Annualized from a year of daily portfolio values, 4.5% risk-free rate
+        - Industry standard for performance evaluation
+
+        **AI Scores:**
+        - Machine learning models trained on historical data
+        - Continuously updated with market patterns
+        - Validated against professional analyst opinions
+        """)
+
+# Action Guide
+st.subheader("🎯 What Should You Do With This Information?")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    with st.expander("👨‍💼 **For Portfolio Managers**"):
+        st.markdown("""
+        **Daily Actions:**
+        1. **Check red alerts first** - Address high-risk situations
+        2. **Review bearish (red) sectors** - Consider rebalancing
+        3. **Monitor high-risk portfolios** - Ensure client alignment
+        4. **Act on AI recommendations** - Use as investment input
+
+        **Weekly Reviews:**
+        - Compare AI sentiment vs. your analysis
+        - Identify sectors with changing outlooks
+        - Adjust position sizes based on risk scores
+        - Document rationale for decisions
+        """)
+
+with col2:
+    with st.expander("👔 **For Executives**"):
+        st.markdown("""
+        **Strategic Oversight:**
+        1. **Track Total AUM growth** - Monitor business performance
+        2. **Review high performer %** - Assess team effectiveness
+        3. **Watch AI sentiment trends** - Understand market positioning
+        4. **Use for client reporting** - Professional presentations
+
+        **Key Metrics to Watch:**
+        - Consistent positive AI sentiment across portfolios
+        - Balanced risk distribution
+        - Strong Sharpe ratios relative to benchmarks
+        """)
+
+with col3:
+    with st.expander("🛡️ **For Risk Management**"):
+        st.markdown("""
+        **Risk Controls:**
+        1. **Set risk threshold alerts** - Use the portfolio filters
+        2. **Monitor sector concentration** - Avoid over-exposure
+        3. **Track correlation patterns** - Identify clustering
+        4. **Validate AI assessments** - Against internal models
+
+        **Alert Thresholds:**
+        - Risk scores > 8: Require senior approval
+        - Sector allocation > 30%: Flag for review
+        - Negative AI sentiment: Investigate immediately
+        """)
+
+# Interactive Features Guide
+st.subheader("🔧 Interactive Features Guide")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    with st.expander("🎛️ **Sidebar Controls**"):
+        st.markdown("""
+        **Dashboard Controls:**
+        - **🔄 Refresh Data:** Updates with latest information
+        - **📅 Time Range:** Filter by different periods
+
+        **Portfolio Filters (above the risk chart):**
+        - **⚠️ Risk Threshold:** Show portfolios below risk level
+        - **💰 Min Portfolio Value:** Filter out smaller portfolios
+        - Moving a filter refreshes only the chart and insights panel
+
+        **🧪 What-If Scenarios (below Ask Your Portfolio):**
+        - Add positions, scale weights or shock a sector in memory
+        - Compare several scenarios side by side with the live book
+        - Nothing is written back; Refresh Data replays edits on new data
+
+        **Navigation:**
+        - **🏦 Dashboard:** Main analytics view
+        - **📖 Dashboard Guide:** This help section
+
+        **Pro Tips:**
+        - Use risk threshold for client-specific views
+        - Adjust time range for trend analysis
+        - Combine filters for targeted insights
+        """)
+
+with col2:
+    with st.expander("📱 **Chart Interactions**"):
+        st.markdown("""
+        **Available Actions:**
+        - **Hover:** See detailed information
+        - **Click legend:** Hide/show data series
+        - **Zoom:** Mouse wheel or drag selection
+        - **Pan:** Click and drag to move view
+        - **Reset:** Double-click to return to original view
+
+        **Keyboard Shortcuts:**
+        - **Space + drag:** Pan chart
+        - **Shift + drag:** Box zoom
+        - **Double-click:** Reset zoom
+
+        **Export Options:**
+        - Download charts as PNG
+        - Save data tables as CSV
+        """)
+
+# Pro Tips Section
+st.subheader("💡 Pro Tips for Maximum Effectiveness")
+
+tips = [
+    "**Start with the metrics bar** - Get the overall picture before diving into details",
+    "**Use the risk slider strategically** - Filter to match specific client risk profiles",
+    "**Pay attention to color patterns** - Quick visual assessment of AI sentiment trends",
+    "**Read AI document summaries** - Often contain the most actionable insights",
+    "**Check alerts regularly** - Important changes are highlighted in real-time",
+    "**Compare similar portfolios** - Look for patterns in the risk vs. performance chart",
+    "**Hover over everything** - Most elements provide additional context on mouseover",
+    "**Use time range filters** - Compare performance across different market periods"
+]
+
+for tip in tips:
+    st.write(f"• {tip}")
+
+# Footer
+st.markdown("---")
+st.success("""
+🎉 **Congratulations!** You're now ready to use the Asset Management Intelligence Dashboard effectively. 
+
+This AI-powered platform transforms hours of manual analysis into seconds of insight, helping you make better investment decisions faster.
+
+**Need more help?** Switch back to the 🏦 Dashboard and start exploring with your new knowledge!
+""")
+
+# Technical Information in Sidebar
+render_technical_details()
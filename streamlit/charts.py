@@ -0,0 +1,116 @@
+"""Figure builders for the dashboard charts that scale past demo cardinality.
+
+- The risk/performance scatter is drawn with WebGL (``Scattergl``). Above
+  ``SCATTER_MAX_POINTS`` the points are binned server-side into a density
+  heatmap, overlaid with a fixed-size random sample, so the browser never
+  receives more than a bounded number of markers.
+- The sector pie keeps the ``PIE_TOP_N`` largest sectors and folds the rest
+  into an "Other" slice.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+SENTIMENT_COLORS = {'Bullish': '#2E8B57', 'Neutral': '#FFD700', 'Bearish': '#DC143C'}
+OTHER_COLOR = '#A9A9A9'
+
+SCATTER_MAX_POINTS = 5000
+SCATTER_DENSITY_BINS = 60
+PIE_TOP_N = 8
+
+_MAX_MARKER_SIZE = 20
+
+
+def build_risk_scatter(df, max_points=SCATTER_MAX_POINTS, seed=0):
+    """Risk Score vs Portfolio Value, colored by AI sentiment."""
+    fig = go.Figure()
+    large = len(df) > max_points
+    if large:
+        counts, x_edges, y_edges = np.histogram2d(
+            df['Risk_Score'].to_numpy(dtype=np.float64),
+            df['Total_Value'].to_numpy(dtype=np.float64),
+            bins=SCATTER_DENSITY_BINS,
+        )
+        fig.add_trace(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan),
+            colorscale='Blues',
+            colorbar=dict(title='Portfolios'),
+            hovertemplate='Risk %{x:.1f}, $%{y:.1f}M: %{z:.0f} portfolios<extra></extra>',
+        ))
+        rng = np.random.default_rng(seed)
+        df = df.iloc[np.sort(rng.choice(len(df), size=max_points, replace=False))]
+
+    sizes = df['Tech_Allocation'].to_numpy(dtype=np.float64)
+    max_size = np.nanmax(sizes) if len(sizes) and np.nanmax(sizes) > 0 else 1.0
+    sentiments = df['AI_Sentiment'].astype(str).to_numpy()
+    for sentiment, color in SENTIMENT_COLORS.items():
+        part = df[sentiments == sentiment]
+        if part.empty:
+            continue
+        fig.add_trace(go.Scattergl(
+            x=part['Risk_Score'],
+            y=part['Total_Value'],
+            mode='markers',
+            name=sentiment,
+            marker=dict(
+                color=color,
+                size=part['Tech_Allocation'].fillna(0),
+                sizemode='area',
+                sizeref=2.0 * max_size / _MAX_MARKER_SIZE ** 2,
+                opacity=0.5 if large else 1.0,
+            ),
+            customdata=np.column_stack([part['Portfolio'], part['YTD_Return'], part['Sharpe_Ratio']]),
+            hovertemplate='<b>%{customdata[0]}</b><br>'
+                          'Risk Score: %{x}<br>'
+                          'Value: $%{y:.1f}M<br>'
+                          'YTD Return: %{customdata[1]:.1f}%<br>'
+                          'Sharpe Ratio: %{customdata[2]:.2f}<extra></extra>',
+        ))
+
+    title = 'Risk-Adjusted Portfolio Performance'
+    if large:
+        title += f'<br><sub>Density of all portfolios with a {max_points:,}-point sample</sub>'
+    fig.update_layout(
+        title=title,
+        xaxis_title='Risk Score (1-10)',
+        yaxis_title='Portfolio Value ($M)',
+        legend_title='AI Sentiment',
+        height=500,
+    )
+    return fig
+
+
+def top_n_sectors(sector_df, top_n=PIE_TOP_N):
+    """Return (labels, values, colors) for the ``top_n`` sectors plus an "Other" bucket."""
+    ordered = sector_df.sort_values('Total_Allocation', ascending=False)
+    head, tail = ordered.iloc[:top_n], ordered.iloc[top_n:]
+    labels = head['Sector'].astype(str).tolist()
+    values = head['Total_Allocation'].astype(float).tolist()
+    colors = [SENTIMENT_COLORS.get(s, OTHER_COLOR) for s in head['Research_Sentiment'].astype(str)]
+    if len(tail):
+        labels.append(f'Other ({len(tail)} sectors)')
+        values.append(float(tail['Total_Allocation'].sum()))
+        colors.append(OTHER_COLOR)
+    return labels, values, colors
+
+
+def build_sector_pie(sector_df, top_n=PIE_TOP_N):
+    labels, values, colors = top_n_sectors(sector_df, top_n)
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        marker_colors=colors,
+        textinfo='label+percent+value',
+        texttemplate='%{label}<br>%{percent}<br>$%{value:.1f}M',
+        hovertemplate='<b>%{label}</b><br>' +
+                      'Allocation: $%{value:.1f}M<br>' +
+                      'Percentage: %{percent}<br>' +
+                      '<extra></extra>'
+    )])
+    fig.update_layout(
+        title='Sector Allocation with AI Sentiment<br><sub>🟢Bullish 🟡Neutral 🔴Bearish</sub>',
+        height=500,
+        showlegend=False
+    )
+    return fig
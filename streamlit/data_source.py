@@ -0,0 +1,268 @@
+"""Data access layer for the Asset Management Intelligence Dashboard.
+
+Every viewer of the app shares one long-lived DataSource, created once per
+server process through ``st.cache_resource``:
+
+- ``SnowflakeDataSource`` wraps the active Snowpark session (Streamlit in
+  Snowflake) so queries reuse a single pooled connection.
+- ``LocalDataSource`` is an in-memory SQLite database loaded from the sample
+  rows in ``scripts/setup.sql`` and a simulated year of daily holdings
+  history, used for offline development, testing and benchmarking. When the
+  local research pipeline database exists (see
+  ``scripts/research_pipeline``), it is attached read-only so
+  ``RESEARCH_KNOWLEDGE_BASE`` can be queried as well. ``ASSET_MGMT_LOCAL_DB``
+  points it at a prepared SQLite file instead of ``setup.sql`` (e.g. a
+  synthetic book from ``benchmarks/synthetic_book.py``), copied into memory.
+
+Set ``ASSET_MGMT_BACKEND`` to ``snowflake`` or ``local`` to pick a backend
+explicitly; otherwise Snowflake is used when a session is available.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from history import seed_sample_history
+from instrumentation import timed
+
+BACKEND_ENV_VAR = "ASSET_MGMT_BACKEND"
+SETUP_SQL_PATH = Path(__file__).resolve().parent.parent / "scripts" / "setup.sql"
+RESEARCH_DB_ENV_VAR = "ASSET_MGMT_RESEARCH_DB"
+RESEARCH_DB_PATH = SETUP_SQL_PATH.parent / "research_pipeline.db"
+LOCAL_DB_ENV_VAR = "ASSET_MGMT_LOCAL_DB"
+
+# Snowflake hash-joins these lookups; SQLite needs indexes to avoid nested-loop scans
+LOCAL_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS RISK_ASSESSMENT_PORTFOLIO ON PORTFOLIO_RISK_ASSESSMENT (PORTFOLIO_NAME)",
+    "CREATE INDEX IF NOT EXISTS HOLDINGS_HISTORY_DATE ON PORTFOLIO_HOLDINGS_HISTORY (AS_OF_DATE, HOLDING_ID)",
+    "CREATE INDEX IF NOT EXISTS ALERT_STATE_PORTFOLIO ON PORTFOLIO_ALERT_STATE (PORTFOLIO_NAME)",
+)
+
+# Cached query results expire after this many seconds; "🔄 Refresh Data" clears them early
+CACHE_TTL_SECONDS = 300
+
+# Bind variables per multi-row INSERT sent by SnowflakeDataSource.executemany
+SNOWFLAKE_MAX_BINDS = 16384
+
+_INSERT_VALUES = re.compile(r"(\s*INSERT\s+INTO\s.*?\bVALUES\s*)(\([\s?,]*\))\s*$", re.I | re.S)
+_INSERT_OVERWRITE = re.compile(r"\s*INSERT\s+OVERWRITE\s+INTO\s+(\w+)\s*(\([^)]*\))?\s*(.*)", re.I | re.S)
+
+
+class DataSource:
+    """Runs SQL against the portfolio tables; ``query`` returns DataFrames."""
+
+    name = "Unknown"
+
+    def query(self, sql, params=None):
+        raise NotImplementedError
+
+    def execute(self, sql, params=None):
+        """Run a write statement, e.g. to store generated AI insights."""
+        raise NotImplementedError
+
+    def executemany(self, sql, rows):
+        for row in rows:
+            self.execute(sql, row)
+
+    def replace_rows(self, table, columns, rows, key=None):
+        """Replace the rows of ``table`` with ``rows`` (tuples in ``columns`` order) in one atomic step.
+
+        Without ``key`` the whole table is replaced; with it, only the rows whose
+        ``key`` column matches one of ``rows``. Readers see the old rows or the new
+        ones, never the table in between.
+        """
+        raise NotImplementedError
+
+
+class SnowflakeDataSource(DataSource):
+    name = "Snowflake"
+
+    def __init__(self, session=None):
+        if session is None:
+            from snowflake.snowpark.context import get_active_session
+            session = get_active_session()
+        self.session = session
+
+    def query(self, sql, params=None):
+        with timed("dashboard_query_seconds", backend=self.name, statement="query"):
+            df = self.session.sql(sql, params=list(params) if params else None).to_pandas()
+        # Snowflake returns DECIMAL columns as object dtype; match the local backend
+        for column in df.columns:
+            if df[column].dtype == object:
+                converted = pd.to_numeric(df[column], errors="coerce")
+                if converted.notna().sum() == df[column].notna().sum():
+                    df[column] = converted
+        return df
+
+    def execute(self, sql, params=None):
+        with timed("dashboard_query_seconds", backend=self.name, statement="execute"):
+            self.session.sql(sql, params=list(params) if params else None).collect()
+
+    def executemany(self, sql, rows):
+        """Send ``INSERT ... VALUES (?, ...)`` as multi-row inserts, one round trip per batch."""
+        rows = [list(row) for row in rows]
+        insert = _INSERT_VALUES.match(sql)
+        if not insert or not rows:
+            return super().executemany(sql, rows)
+        head, group = insert.groups()
+        per_batch = max(SNOWFLAKE_MAX_BINDS // max(len(rows[0]), 1), 1)
+        with timed("dashboard_query_seconds", backend=self.name, statement="executemany"):
+            for start in range(0, len(rows), per_batch):
+                batch = rows[start:start + per_batch]
+                params = [value for row in batch for value in row]
+                self.session.sql(head + ", ".join([group] * len(batch)), params=params).collect()
+
+    def replace_rows(self, table, columns, rows, key=None):
+        """Stage ``rows`` in a temporary table, then swap them in with one INSERT OVERWRITE, or with a keyed
+        DELETE and INSERT in one transaction (the app role has no UPDATE privilege, so no MERGE)."""
+        rows = list(rows)
+        if not rows:
+            if key is None:
+                self.execute(f"DELETE FROM {table}")
+            return
+        frame = pd.DataFrame(rows, columns=columns).astype(object)
+        frame = frame.where(frame.notna(), None)
+        stage = f"{table}_STAGE_{uuid.uuid4().hex[:12]}".upper()
+        names = ", ".join(columns)
+        if key is None:
+            swap = [f"INSERT OVERWRITE INTO {table} ({names}) SELECT {names} FROM {stage}"]
+        else:
+            swap = ["BEGIN",
+                    f"DELETE FROM {table} USING {stage} s WHERE {table}.{key} = s.{key}",
+                    f"INSERT INTO {table} ({names}) SELECT {names} FROM {stage}",
+                    "COMMIT"]
+        with timed("dashboard_query_seconds", backend=self.name, statement="replace_rows"):
+            # write_pandas creates the stage table, and DDL would commit an open transaction, so stage first
+            self.session.write_pandas(frame, stage, auto_create_table=True, table_type="temporary")
+            try:
+                for statement in swap:
+                    self.session.sql(statement).collect()
+            except Exception:
+                if key is not None:
+                    self.session.sql("ROLLBACK").collect()
+                raise
+            finally:
+                self.session.sql(f"DROP TABLE IF EXISTS {stage}").collect()
+
+
+class LocalDataSource(DataSource):
+    name = "Local SQLite"
+
+    def __init__(self, setup_sql_path=SETUP_SQL_PATH, research_db_path=None, seed_history=True, database_path=None):
+        # A single connection is shared across Streamlit's script threads
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False, uri=True)
+        self._lock = threading.Lock()
+        self._conn.create_aggregate("HASH_AGG", -1, HashAgg)
+        database_path = database_path or os.environ.get(LOCAL_DB_ENV_VAR)
+        if database_path:
+            # A prepared database already holds its tables and history
+            source = sqlite3.connect(f"{Path(database_path).resolve().as_uri()}?mode=ro", uri=True)
+            source.backup(self._conn)
+            source.close()
+            seed_history = False
+        else:
+            load_setup_sql(self._conn, Path(setup_sql_path).read_text())
+        for statement in LOCAL_INDEXES:
+            self._conn.execute(statement)
+        if seed_history:
+            # setup.sql has only today's holdings; simulate a year of history for the Time Range selector
+            seed_sample_history(self)
+        research_db_path = Path(research_db_path or os.environ.get(RESEARCH_DB_ENV_VAR) or RESEARCH_DB_PATH)
+        if research_db_path.exists():
+            # Unqualified table names fall through to attached databases
+            self._conn.execute("ATTACH DATABASE ? AS research", (f"{research_db_path.resolve().as_uri()}?mode=ro",))
+
+    def query(self, sql, params=None):
+        with timed("dashboard_query_seconds", backend=self.name, statement="query"), self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params) if params else None)
+
+    def execute(self, sql, params=None):
+        with timed("dashboard_query_seconds", backend=self.name, statement="execute"), self._lock:
+            overwrite = _INSERT_OVERWRITE.match(sql)
+            if overwrite:
+                with self._conn:
+                    self._overwrite(*overwrite.groups(), list(params) if params else [])
+                return
+            self._conn.execute(sql, list(params) if params else [])
+            self._conn.commit()
+
+    def executemany(self, sql, rows):
+        with timed("dashboard_query_seconds", backend=self.name, statement="executemany"), self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def replace_rows(self, table, columns, rows, key=None):
+        rows = list(rows)
+        placeholders = ", ".join("?" * len(columns))
+        with timed("dashboard_query_seconds", backend=self.name, statement="replace_rows"), self._lock, self._conn:
+            # Readers share the lock, so they never see the delete without the insert
+            if key is None:
+                self._conn.execute(f"DELETE FROM {table}")
+            else:
+                position = columns.index(key)
+                self._conn.executemany(f"DELETE FROM {table} WHERE {key} = ?", [(row[position],) for row in rows])
+            self._conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    def _overwrite(self, table, columns, select, params):
+        """SQLite has no ``INSERT OVERWRITE``; run the query first, as it may read ``table``, then swap the rows."""
+        rows = self._conn.execute(select, params).fetchall()
+        self._conn.execute(f"DELETE FROM {table}")
+        if rows:
+            placeholders = ", ".join("?" * len(rows[0]))
+            self._conn.executemany(f"INSERT INTO {table} {columns or ''} VALUES ({placeholders})", rows)
+
+
+class HashAgg:
+    """SQLite stand-in for Snowflake's order-independent ``HASH_AGG(expr, ...)``.
+
+    Values differ from Snowflake's; they are only compared with other local values.
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def step(self, *values):
+        digest = hashlib.blake2b(repr(values).encode("utf-8"), digest_size=8).digest()
+        self.total = (self.total + int.from_bytes(digest, "little")) % (1 << 64)
+
+    def finalize(self):
+        return self.total - (1 << 64) if self.total >= 1 << 63 else self.total
+
+
+def load_setup_sql(conn, script):
+    """Create the tables and sample rows from setup.sql in a SQLite connection.
+
+    Only ``CREATE OR REPLACE TABLE`` and ``INSERT INTO`` statements are applied;
+    roles, warehouses, stages and grants have no local equivalent.
+    """
+    script = re.sub(r"/\*.*?\*/", "", script, flags=re.S)
+    script = re.sub(r"--[^\n]*", "", script)
+    for statement in script.split(";"):
+        statement = statement.strip()
+        if re.match(r"CREATE\s+OR\s+REPLACE\s+TABLE\b", statement, re.I):
+            table = re.match(r"CREATE\s+OR\s+REPLACE\s+TABLE\s+(\w+)", statement, re.I).group(1)
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(re.sub(r"^CREATE\s+OR\s+REPLACE", "CREATE", statement, flags=re.I))
+        elif re.match(r"INSERT\s+INTO\b", statement, re.I):
+            conn.execute(statement)
+    conn.commit()
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_source():
+    """Return the process-wide DataSource shared by all sessions."""
+    backend = os.environ.get(BACKEND_ENV_VAR, "").lower()
+    if backend == "local":
+        return LocalDataSource()
+    try:
+        return SnowflakeDataSource()
+    except Exception:
+        if backend == "snowflake":
+            raise
+        return LocalDataSource()
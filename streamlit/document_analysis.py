@@ -0,0 +1,221 @@
+"""Per-document AI summaries for the "📄 AI Document Analysis" panel.
+
+Documents come from ``RESEARCH_KNOWLEDGE_BASE``. Each one is identified by the
+content hash the ingest step recorded for its file in
+``RESEARCH_DOCUMENT_MANIFEST``. Summaries live in ``RESEARCH_DOCUMENT_INSIGHTS``
+keyed by that hash, so a document is summarized once for every user and again
+only when its file changes.
+
+Missing summaries are generated by ``SummaryService``, a process-wide thread
+pool shared by all sessions:
+
+- at most ``MAX_CONCURRENT_SUMMARIES`` model calls run at once;
+- a document that is already being summarized (for any session) is joined
+  rather than submitted twice;
+- the panel waits at most ``SUMMARY_TIMEOUT_SECONDS`` and renders each result
+  as it arrives. Calls still running when the panel stops waiting keep going
+  in the background and are stored for the next render.
+
+``CortexSummarizer`` calls ``SNOWFLAKE.CORTEX.COMPLETE``; ``FakeSummarizer``
+derives a deterministic insight from the text, for the local backend and tests.
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from instrumentation import timed
+
+SUMMARY_MODEL = "claude-3-5-sonnet"
+MAX_CONCURRENT_SUMMARIES = 4
+SUMMARY_TIMEOUT_SECONDS = 45
+PANEL_DOCUMENT_LIMIT = 8
+EXCERPT_CHUNKS = 3
+SENTIMENTS = ("Bullish", "Neutral", "Bearish")
+
+# Seconds FakeSummarizer sleeps per call, to exercise progressive rendering locally
+FAKE_DELAY_ENV_VAR = "ASSET_MGMT_FAKE_LLM_DELAY"
+
+# Opening chunks of each live document with its manifest content hash, in one portable query
+DOCUMENTS_SQL = """
+SELECT ranked.RELATIVE_PATH, ranked.DOCUMENT_NAME, ranked.CHUNK, m.CONTENT_HASH AS CONTENT_HASH
+FROM (
+    SELECT
+        RELATIVE_PATH,
+        DOCUMENT_NAME,
+        CHUNK,
+        ROW_NUMBER() OVER (PARTITION BY RELATIVE_PATH ORDER BY CHUNK_INDEX, CHUNK) AS CHUNK_RANK
+    FROM RESEARCH_KNOWLEDGE_BASE
+) ranked
+JOIN RESEARCH_DOCUMENT_MANIFEST m ON m.RELATIVE_PATH = ranked.RELATIVE_PATH AND m.DELETED_AT IS NULL
+WHERE ranked.CHUNK_RANK <= ?
+ORDER BY ranked.DOCUMENT_NAME, ranked.RELATIVE_PATH, ranked.CHUNK_RANK
+"""
+
+INSIGHTS_SQL = """
+SELECT
+    CONTENT_HASH,
+    MAX(AI_SUMMARY) AS AI_SUMMARY,
+    MAX(KEY_RISK) AS KEY_RISK,
+    MAX(RECOMMENDATION) AS RECOMMENDATION,
+    MAX(SENTIMENT) AS SENTIMENT
+FROM RESEARCH_DOCUMENT_INSIGHTS
+GROUP BY CONTENT_HASH
+"""
+
+# Guarded insert: a hash already stored by another session is left alone
+INSERT_INSIGHT_SQL = """
+INSERT INTO RESEARCH_DOCUMENT_INSIGHTS
+    (CONTENT_HASH, DOCUMENT_NAME, AI_SUMMARY, KEY_RISK, RECOMMENDATION, SENTIMENT, MODEL, GENERATED_AT)
+SELECT ?, ?, ?, ?, ?, ?, ?, ?
+WHERE NOT EXISTS (SELECT 1 FROM RESEARCH_DOCUMENT_INSIGHTS WHERE CONTENT_HASH = ?)
+"""
+
+SUMMARY_PROMPT = (
+    "You are an investment research analyst. Read the opening of this research document and reply with "
+    "ONLY a JSON object with the keys: \"summary\" (two sentences on the investment-relevant findings), "
+    "\"key_risk\" (one sentence), \"recommendation\" (one sentence of portfolio guidance) and "
+    "\"sentiment\" (one of Bullish, Neutral, Bearish).\n\n"
+    "Document: {document_name}\n\n{excerpt}"
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def research_documents(source, excerpt_chunks=EXCERPT_CHUNKS):
+    """Return one dict per document: relative_path, document_name, content_hash, excerpt."""
+    df = source.query(DOCUMENTS_SQL, [excerpt_chunks])
+    documents = {}
+    for row in df.itertuples(index=False):
+        doc = documents.setdefault(row.RELATIVE_PATH, {
+            "relative_path": row.RELATIVE_PATH,
+            "document_name": row.DOCUMENT_NAME,
+            "content_hash": row.CONTENT_HASH,
+            "chunks": [],
+        })
+        doc["chunks"].append(row.CHUNK or "")
+    for doc in documents.values():
+        doc["excerpt"] = "\n\n".join(doc.pop("chunks"))
+    return list(documents.values())
+
+
+def stored_insights(source):
+    """Return ``{content_hash: insight}`` for every stored summary."""
+    df = source.query(INSIGHTS_SQL)
+    return {
+        row.CONTENT_HASH: {
+            "ai_summary": row.AI_SUMMARY,
+            "key_risk": row.KEY_RISK,
+            "recommendation": row.RECOMMENDATION,
+            "sentiment": row.SENTIMENT,
+        }
+        for row in df.itertuples(index=False)
+    }
+
+
+def parse_insight(text):
+    """Parse a model reply into an insight dict, or ``None`` if it is unusable."""
+    match = _JSON_OBJECT.search(text or "")
+    try:
+        payload = json.loads(match.group(0)) if match else None
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not payload.get("summary"):
+        return None
+    sentiment = str(payload.get("sentiment", "")).strip().title()
+    return {
+        "ai_summary": str(payload["summary"]).strip(),
+        "key_risk": str(payload.get("key_risk") or "Not identified").strip(),
+        "recommendation": str(payload.get("recommendation") or "No change").strip(),
+        "sentiment": sentiment if sentiment in SENTIMENTS else "Neutral",
+    }
+
+
+class CortexSummarizer:
+    """Calls ``SNOWFLAKE.CORTEX.COMPLETE`` through the shared data source."""
+
+    def __init__(self, source, model=SUMMARY_MODEL):
+        self.source = source
+        self.model = model
+
+    def __call__(self, prompt):
+        df = self.source.query("SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS RESPONSE", [self.model, prompt])
+        return df.iloc[0, 0]
+
+
+class FakeSummarizer:
+    """Deterministic local stand-in for the model."""
+
+    model = "fake-summarizer"
+
+    _POSITIVE = ("growth", "opportunit", "strong", "increase", "innovation", "expand", "momentum")
+    _NEGATIVE = ("risk", "decline", "loss", "uncertain", "volatil", "headwind", "challenge")
+
+    def __init__(self, delay_seconds=None):
+        if delay_seconds is None:
+            delay_seconds = float(os.environ.get(FAKE_DELAY_ENV_VAR, 0))
+        self.delay_seconds = delay_seconds
+
+    def __call__(self, prompt):
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        text = prompt.split("\n\n", 2)[-1]
+        sentences = [s.strip().replace("\n", " ") for s in _SENTENCE.split(text) if len(s.split()) > 5]
+        lowered = text.lower()
+        score = sum(lowered.count(w) for w in self._POSITIVE) - sum(lowered.count(w) for w in self._NEGATIVE)
+        sentiment = "Bullish" if score > 2 else "Bearish" if score < -2 else "Neutral"
+        risk = next((s for s in sentences if "risk" in s.lower()), "No specific risk called out in the opening")
+        return json.dumps({
+            "summary": " ".join(sentences[:2])[:400] or "No narrative text in the opening pages.",
+            "key_risk": risk[:200],
+            "recommendation": {
+                "Bullish": "Consider adding exposure in growth portfolios",
+                "Bearish": "Review and consider reducing exposure",
+                "Neutral": "Maintain current allocation",
+            }[sentiment],
+            "sentiment": sentiment,
+        })
+
+
+class SummaryService:
+    """Process-wide, concurrency-capped summary generation with per-document de-duplication."""
+
+    def __init__(self, source, summarizer, max_workers=MAX_CONCURRENT_SUMMARIES):
+        self.source = source
+        self.summarizer = summarizer
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="doc-summary")
+        # RLock: a done-callback may run inline in the thread that registered it
+        self._lock = threading.RLock()
+        self._in_flight = {}
+
+    def submit(self, document):
+        """Return a future resolving to the document's insight (``None`` if the reply was unusable)."""
+        key = document["content_hash"]
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._pool.submit(self._generate, document)
+                self._in_flight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _generate(self, document):
+        prompt = SUMMARY_PROMPT.format(document_name=document["document_name"], excerpt=document["excerpt"])
+        with timed("dashboard_llm_seconds", task="document_summary"):
+            reply = self.summarizer(prompt)
+        insight = parse_insight(reply)
+        if insight is not None:
+            self.source.execute(INSERT_INSIGHT_SQL, [
+                document["content_hash"], document["document_name"], insight["ai_summary"], insight["key_risk"],
+                insight["recommendation"], insight["sentiment"], getattr(self.summarizer, "model", SUMMARY_MODEL),
+                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"), document["content_hash"],
+            ])
+        return insight
@@ -0,0 +1,213 @@
+"""Daily holdings history with precomputed rolling-window rollups.
+
+``PORTFOLIO_HOLDINGS`` keeps only the current snapshot. ``record_day`` copies
+it into ``PORTFOLIO_HOLDINGS_HISTORY`` once per day. Then, for every window in
+``TIME_RANGES``, it updates ``PORTFOLIO_VALUE_ROLLUPS``, which holds one row per
+portfolio and sector with the window's start value, end value, value sum and
+day count.
+
+Rollups are maintained incrementally. Each new day adds the days that entered
+the window and subtracts the days that left it. Both are date-range lookups,
+so the cost depends on the number of holdings, not on the length of the history.
+A window is only rebuilt from its full range when it has no previous rollup,
+or when the previous one is a whole window old. The arithmetic runs in the
+database: one ``INSERT OVERWRITE`` computes every window and swaps the table's
+rows at once, so no rollup rows travel through Python and readers never see a
+window missing.
+
+``load_rollups`` turns each window into per-portfolio, per-sector and total
+changes up front, so switching the dashboard's Time Range is a dict lookup.
+"""
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Sidebar label -> window length in days
+TIME_RANGES = {
+    "Last 30 Days": 30,
+    "Last 90 Days": 90,
+    "Last 6 Months": 182,
+    "Last Year": 365,
+}
+SAMPLE_HISTORY_DAYS = 400
+
+ROLLUP_KEYS = ["PORTFOLIO_NAME", "SECTOR"]
+
+LAST_SNAPSHOT_SQL = "SELECT MAX(AS_OF_DATE) AS AS_OF_DATE FROM PORTFOLIO_HOLDINGS_HISTORY"
+
+SNAPSHOT_SQL = """
+INSERT INTO PORTFOLIO_HOLDINGS_HISTORY
+    (AS_OF_DATE, HOLDING_ID, PORTFOLIO_NAME, SECURITY_NAME, SECTOR, MARKET_VALUE, WEIGHT_PERCENT, RISK_LEVEL)
+SELECT ?, HOLDING_ID, PORTFOLIO_NAME, SECURITY_NAME, SECTOR, MARKET_VALUE, WEIGHT_PERCENT, RISK_LEVEL
+FROM PORTFOLIO_HOLDINGS
+"""
+
+INSERT_HISTORY_SQL = """
+INSERT INTO PORTFOLIO_HOLDINGS_HISTORY
+    (AS_OF_DATE, HOLDING_ID, PORTFOLIO_NAME, SECURITY_NAME, SECTOR, MARKET_VALUE, WEIGHT_PERCENT, RISK_LEVEL)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Value sum and number of snapshot days per portfolio and sector for AS_OF_DATE in (start, end]
+RANGE_VALUES_SQL = """
+SELECT PORTFOLIO_NAME, SECTOR, SUM(MARKET_VALUE) AS VALUE_SUM, COUNT(DISTINCT AS_OF_DATE) AS DAYS
+FROM PORTFOLIO_HOLDINGS_HISTORY
+WHERE AS_OF_DATE > ? AND AS_OF_DATE <= ?
+GROUP BY PORTFOLIO_NAME, SECTOR
+"""
+
+# The previous rollup of window ?, plus the days in (?, ?] that entered it, minus the days in (?, ?] that left it
+SHIFTED_VALUES_SQL = f"""
+SELECT PORTFOLIO_NAME, SECTOR, SUM(VALUE_SUM) AS VALUE_SUM, SUM(DAYS) AS DAYS
+FROM (
+    SELECT PORTFOLIO_NAME, SECTOR, VALUE_SUM, DAYS FROM PORTFOLIO_VALUE_ROLLUPS WHERE WINDOW_DAYS = ?
+    UNION ALL
+    SELECT * FROM ({RANGE_VALUES_SQL}) entered
+    UNION ALL
+    SELECT PORTFOLIO_NAME, SECTOR, -VALUE_SUM, -DAYS FROM ({RANGE_VALUES_SQL}) left_window
+) changes
+GROUP BY PORTFOLIO_NAME, SECTOR
+HAVING SUM(DAYS) > 0
+"""
+
+# One window's rollup rows from its value sums (``{values}``): window and date, then start and end values,
+# taken on the first snapshot date in (?, ?] and on the date ?
+WINDOW_ROLLUP_SQL = """
+SELECT ? AS WINDOW_DAYS, v.PORTFOLIO_NAME, v.SECTOR, ? AS AS_OF_DATE, f.START_DATE,
+       COALESCE(s.DAY_VALUE, 0) AS START_VALUE, COALESCE(e.DAY_VALUE, 0) AS END_VALUE, v.VALUE_SUM, v.DAYS
+FROM ({values}) v
+CROSS JOIN (
+    SELECT MIN(AS_OF_DATE) AS START_DATE FROM PORTFOLIO_HOLDINGS_HISTORY WHERE AS_OF_DATE > ? AND AS_OF_DATE <= ?
+) f
+LEFT JOIN (
+    SELECT PORTFOLIO_NAME, SECTOR, SUM(MARKET_VALUE) AS DAY_VALUE
+    FROM PORTFOLIO_HOLDINGS_HISTORY
+    WHERE AS_OF_DATE = (SELECT MIN(AS_OF_DATE) FROM PORTFOLIO_HOLDINGS_HISTORY WHERE AS_OF_DATE > ? AND AS_OF_DATE <= ?)
+    GROUP BY PORTFOLIO_NAME, SECTOR
+) s ON s.PORTFOLIO_NAME = v.PORTFOLIO_NAME AND s.SECTOR = v.SECTOR
+LEFT JOIN (
+    SELECT PORTFOLIO_NAME, SECTOR, SUM(MARKET_VALUE) AS DAY_VALUE
+    FROM PORTFOLIO_HOLDINGS_HISTORY WHERE AS_OF_DATE = ?
+    GROUP BY PORTFOLIO_NAME, SECTOR
+) e ON e.PORTFOLIO_NAME = v.PORTFOLIO_NAME AND e.SECTOR = v.SECTOR
+"""
+
+OVERWRITE_ROLLUPS_SQL = """
+INSERT OVERWRITE INTO PORTFOLIO_VALUE_ROLLUPS
+    (WINDOW_DAYS, PORTFOLIO_NAME, SECTOR, AS_OF_DATE, START_DATE, START_VALUE, END_VALUE, VALUE_SUM, DAYS)
+{windows}
+"""
+
+ROLLUP_DATES_SQL = "SELECT WINDOW_DAYS, MAX(AS_OF_DATE) AS AS_OF_DATE FROM PORTFOLIO_VALUE_ROLLUPS GROUP BY WINDOW_DAYS"
+
+ROLLUP_SQL = """
+SELECT WINDOW_DAYS, PORTFOLIO_NAME, SECTOR, AS_OF_DATE, START_DATE, START_VALUE, END_VALUE, VALUE_SUM, DAYS
+FROM PORTFOLIO_VALUE_ROLLUPS
+"""
+
+# One recorder per process, so concurrent sessions never snapshot the same day twice
+_record_lock = threading.Lock()
+
+# Daily drift of the simulated sample history
+_SECTOR_DRIFT = {"Technology": 0.0006, "Healthcare": 0.0003, "Real Estate": -0.0002, "ESG/Renewable": 0.0004}
+# Daily volatility per holding RISK_LEVEL; simulates the sample history and prices what-if scenarios (see scenarios.py)
+RISK_LEVEL_VOLATILITY = {"Low": 0.006, "Medium": 0.011, "High": 0.018}
+
+
+def _to_date(value):
+    return None if value is None or pd.isna(value) else pd.Timestamp(value).date()
+
+
+def _window_select(window_days, as_of, previous_as_of):
+    """``WINDOW_ROLLUP_SQL`` and its parameters for one window, shifted from its rollup at ``previous_as_of`` when possible."""
+    window_start = as_of - timedelta(days=window_days)
+    if previous_as_of is None or previous_as_of >= as_of or (as_of - previous_as_of).days >= window_days:
+        values, values_params = RANGE_VALUES_SQL, [window_start, as_of]
+    else:
+        # Days (previous_as_of, as_of] entered the window; days (previous_as_of - W, as_of - W] left it
+        values = SHIFTED_VALUES_SQL
+        values_params = [window_days, previous_as_of, as_of, previous_as_of - timedelta(days=window_days), window_start]
+    params = [window_days, as_of, *values_params, window_start, as_of, window_start, as_of, as_of]
+    return WINDOW_ROLLUP_SQL.format(values=values), [p.isoformat() if isinstance(p, date) else p for p in params]
+
+
+def update_rollups(source, as_of, rebuild=False):
+    """Bring every window's rollup up to ``as_of``, from the full date ranges if ``rebuild``."""
+    dates = {} if rebuild else {
+        int(row.WINDOW_DAYS): _to_date(row.AS_OF_DATE) for row in source.query(ROLLUP_DATES_SQL).itertuples(index=False)
+    }
+    selects, params = [], []
+    for window_days in TIME_RANGES.values():
+        sql, window_params = _window_select(window_days, as_of, dates.get(window_days))
+        selects.append(sql)
+        params += window_params
+    source.execute(OVERWRITE_ROLLUPS_SQL.format(windows="UNION ALL".join(selects)), params)
+
+
+def rebuild_rollups(source, as_of):
+    """Recompute every window from its full date range."""
+    update_rollups(source, as_of, rebuild=True)
+
+
+def record_day(source, as_of=None):
+    """Snapshot today's holdings into the history and roll the windows forward; no-op if already recorded.
+
+    Returns True if a new day was recorded.
+    """
+    as_of = as_of or date.today()
+    with _record_lock:
+        last = _to_date(source.query(LAST_SNAPSHOT_SQL).iloc[0, 0])
+        if last is not None and last >= as_of:
+            return False
+        source.execute(SNAPSHOT_SQL, [as_of.isoformat()])
+        update_rollups(source, as_of)
+        return True
+
+
+def _changes(frame, by):
+    grouped = frame.groupby(by, as_index=False)[["START_VALUE", "END_VALUE"]].sum()
+    grouped["CHANGE_PCT"] = 100.0 * (grouped["END_VALUE"] / grouped["START_VALUE"].where(grouped["START_VALUE"] > 0) - 1)
+    return grouped
+
+
+def load_rollups(source):
+    """Return ``{window_days: summary}`` with per-portfolio, per-sector and total changes for each window."""
+    rollups = source.query(ROLLUP_SQL)
+    summaries = {}
+    for window_days, frame in rollups.groupby("WINDOW_DAYS"):
+        start, end = frame["START_VALUE"].sum(), frame["END_VALUE"].sum()
+        summaries[int(window_days)] = {
+            "start_date": _to_date(frame["START_DATE"].iloc[0]),
+            "as_of": _to_date(frame["AS_OF_DATE"].iloc[0]),
+            "by_portfolio": _changes(frame, "PORTFOLIO_NAME").sort_values("CHANGE_PCT", ascending=False),
+            "by_sector": _changes(frame, "SECTOR").set_index("SECTOR"),
+            "change_pct": 100.0 * (end / start - 1) if start else None,
+        }
+    return summaries
+
+
+def seed_sample_history(source, end=None, days=SAMPLE_HISTORY_DAYS, seed=7):
+    """Fill the history with a simulated random walk ending at the current holdings, then build the rollups."""
+    end = end or date.today()
+    holdings = source.query(
+        "SELECT HOLDING_ID, PORTFOLIO_NAME, SECURITY_NAME, SECTOR, MARKET_VALUE, WEIGHT_PERCENT, RISK_LEVEL "
+        "FROM PORTFOLIO_HOLDINGS"
+    )
+    rng = np.random.default_rng(seed)
+    drift = holdings["SECTOR"].map(_SECTOR_DRIFT).fillna(0.0001).to_numpy()
+    volatility = holdings["RISK_LEVEL"].map(RISK_LEVEL_VOLATILITY).fillna(0.011).to_numpy()
+    # Walk backwards from today's values: column d holds the value d days ago
+    steps = rng.normal(drift, volatility, size=(days, len(holdings))).T
+    growth = np.exp(np.concatenate([np.zeros((len(holdings), 1)), np.cumsum(steps, axis=1)[:, :-1]], axis=1))
+    values = holdings["MARKET_VALUE"].to_numpy(dtype=float)[:, None] / growth
+    rows = []
+    for back in range(days):
+        as_of = (end - timedelta(days=back)).isoformat()
+        for i, holding in enumerate(holdings.itertuples(index=False)):
+            rows.append((as_of, holding.HOLDING_ID, holding.PORTFOLIO_NAME, holding.SECURITY_NAME, holding.SECTOR,
+                         round(float(values[i, back]), 2), holding.WEIGHT_PERCENT, holding.RISK_LEVEL))
+    source.executemany(INSERT_HISTORY_SQL, rows)
+    rebuild_rollups(source, end)
+
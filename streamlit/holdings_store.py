@@ -0,0 +1,88 @@
+"""Compact, indexed in-memory portfolio store for the sidebar filters.
+
+``HoldingsStore`` keeps a read-only columnar copy of the portfolio frame:
+
+- Low-cardinality strings (sentiment and risk labels) are stored as pandas
+  categoricals, and score columns are downcast to float32.
+- ``Total_Value`` and ``Risk_Score`` each carry a presorted index, so the
+  ``min_portfolio_value`` / ``risk_threshold`` filters are binary-search range
+  lookups instead of a boolean scan over every portfolio.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ("AI_Sentiment", "Research_Sentiment", "Risk_Level")
+FLOAT32_COLUMNS = ("Risk_Score", "Tech_Allocation", "YTD_Return", "Sharpe_Ratio", "AI_Score")
+
+
+def compact_frame(df):
+    """Return a copy of ``df`` with categorical labels and float32 score columns."""
+    df = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in FLOAT32_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(np.float32)
+    return df.reset_index(drop=True)
+
+
+class _SortedIndex:
+    """Row positions ordered by one numeric column, NaNs excluded."""
+
+    def __init__(self, values):
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind="stable")]
+        self.rows = order
+        self.keys = values[order]
+
+    def at_least(self, low):
+        return self.rows[np.searchsorted(self.keys, low, side="left"):]
+
+    def at_most(self, high):
+        return self.rows[:np.searchsorted(self.keys, high, side="right")]
+
+
+class HoldingsStore:
+    """Read-only portfolio frame with range lookups on value and risk."""
+
+    def __init__(self, df, value_column="Total_Value", risk_column="Risk_Score"):
+        self.frame = compact_frame(df)
+        self.value_column = value_column
+        self.risk_column = risk_column
+        self._values = self.frame[value_column].to_numpy(dtype=np.float64)
+        self._risks = self.frame[risk_column].to_numpy(dtype=np.float64)
+        self._value_index = _SortedIndex(self._values)
+        self._risk_index = _SortedIndex(self._risks)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the frame and both indexes."""
+        indexes = (self._value_index, self._risk_index)
+        return int(self.frame.memory_usage(deep=True).sum()
+                   + sum(index.rows.nbytes + index.keys.nbytes for index in indexes))
+
+    def filter_rows(self, min_value=None, max_risk=None):
+        """Return positions (in frame order) with value >= min_value and risk <= max_risk."""
+        if min_value is None and max_risk is None:
+            return np.arange(len(self.frame))
+        if max_risk is None:
+            rows = self._value_index.at_least(min_value)
+        elif min_value is None:
+            rows = self._risk_index.at_most(max_risk)
+        else:
+            # Walk the narrower of the two ranges and check the other bound on it only
+            by_value = self._value_index.at_least(min_value)
+            by_risk = self._risk_index.at_most(max_risk)
+            if len(by_value) <= len(by_risk):
+                rows = by_value[self._risks[by_value] <= max_risk]
+            else:
+                rows = by_risk[self._values[by_risk] >= min_value]
+        return np.sort(rows)
+
+    def filter(self, min_value=None, max_risk=None):
+        """Return the matching portfolios as a DataFrame, in frame order."""
+        return self.frame.iloc[self.filter_rows(min_value, max_risk)]
@@ -0,0 +1,69 @@
+"""Vectorized formatting and windowing for the "AI Investment Insights" panel.
+
+Rows are formatted for every portfolio in a single pass over NumPy arrays, and
+the panel renders only one page of the sorted (and optionally searched) rows,
+so the number of widgets stays constant however many portfolios exist.
+"""
+import numpy as np
+import pandas as pd
+
+SENTIMENT_EMOJI = {"Bullish": "🟢", "Neutral": "🟡", "Bearish": "🔴"}
+SENTIMENT_ADVICE = {
+    "Bullish": "AI recommends maintaining or increasing allocation",
+    "Bearish": "AI suggests reducing exposure or hedging",
+    "Neutral": "AI indicates neutral positioning appropriate",
+}
+
+# Sort options shown in the panel -> (column, descending)
+INSIGHT_SORT_KEYS = {
+    "Risk Score (high → low)": ("Risk_Score", True),
+    "Risk Score (low → high)": ("Risk_Score", False),
+    "YTD Return (high → low)": ("YTD_Return", True),
+    "YTD Return (low → high)": ("YTD_Return", False),
+    "Portfolio Value": ("Total_Value", True),
+    "Sharpe Ratio": ("Sharpe_Ratio", True),
+}
+
+DEFAULT_PAGE_SIZE = 10
+
+
+def _fmt(template, values):
+    return np.char.mod(template, np.asarray(values, dtype=np.float64))
+
+
+def format_insights(df):
+    """Return ``df`` plus ``Label``, ``Details`` and ``Sentiment`` display columns."""
+    sentiment = df["AI_Sentiment"].astype(str).to_numpy()
+    emoji = pd.Series(sentiment).map(SENTIMENT_EMOJI).fillna("🟡").to_numpy(dtype=str)
+    names = df["Portfolio"].to_numpy(dtype=str)
+    label = np.char.add(np.char.add(emoji, " "), names)
+    details = _fmt("**Value:** $%.1fM  \n", df["Total_Value"])
+    details = np.char.add(details, _fmt("**Risk Score:** %g/10  \n", df["Risk_Score"]))
+    details = np.char.add(details, _fmt("**YTD Return:** %.1f%%  \n", df["YTD_Return"]))
+    details = np.char.add(details, _fmt("**Sharpe Ratio:** %.2f", df["Sharpe_Ratio"]))
+    formatted = df.copy()
+    formatted["Label"] = label
+    formatted["Details"] = details
+    formatted["Sentiment"] = sentiment
+    return formatted
+
+
+def select_window(formatted, sort_key, search="", page=1, page_size=DEFAULT_PAGE_SIZE):
+    """Sort, search and paginate formatted rows.
+
+    Returns ``(window_df, match_count, page_count)``; ``page`` is 1-based and
+    clamped to the available pages.
+    """
+    column, descending = INSIGHT_SORT_KEYS[sort_key]
+    rows = formatted
+    if search:
+        mask = rows["Portfolio"].str.contains(search, case=False, regex=False, na=False)
+        rows = rows[mask.to_numpy()]
+    keys = rows[column].to_numpy(dtype=np.float64)
+    # NaN keys always sort last, whichever direction is chosen
+    order = np.argsort(-keys if descending else keys, kind="stable")
+    match_count = len(rows)
+    page_count = max(1, -(-match_count // page_size))
+    page = min(max(1, int(page)), page_count)
+    start = (page - 1) * page_size
+    return rows.iloc[order[start:start + page_size]], match_count, page_count
@@ -0,0 +1,249 @@
+"""Process-wide hot-path metrics for the dashboard.
+
+Set ``ASSET_MGMT_METRICS=1`` to record:
+
+- ``dashboard_section_seconds{section}``: wall time of each dashboard section
+  and of the blocks inside it (scatter, insights, pie, table);
+- ``dashboard_cache_requests_total{loader,result}``: hits and misses of the
+  ``st.cache_data`` / ``st.cache_resource`` loaders, plus
+  ``dashboard_loader_seconds{loader}`` for the time a miss takes;
+- ``dashboard_query_seconds{backend,statement}``: every data source call;
+- ``dashboard_llm_seconds{task}``: AI_AGG, COMPLETE and Cortex Analyst calls.
+
+Latencies are Prometheus-style cumulative histograms over ``BUCKETS``. The
+sidebar shows them live; ``to_prometheus`` and ``to_json_lines`` export them,
+and ``ASSET_MGMT_METRICS_EXPORT`` names a ``.prom`` or ``.jsonl`` file the
+sidebar rewrites every few seconds (e.g. for node_exporter's textfile
+collector).
+
+Switched off (the default), ``timed`` returns a shared no-op context manager
+and ``cached_loader`` returns the plain Streamlit cache decorator, so the only
+cost left on the hot path is one function call per timed block.
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+METRICS_ENV_VAR = "ASSET_MGMT_METRICS"
+EXPORT_ENV_VAR = "ASSET_MGMT_METRICS_EXPORT"
+
+# Upper bounds in seconds, from a cached lookup to a slow LLM call
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    "dashboard_section_seconds": "Wall time of a dashboard section run",
+    "dashboard_cache_requests_total": "Cached loader calls by result",
+    "dashboard_loader_seconds": "Time spent computing a cached loader on a miss",
+    "dashboard_query_seconds": "Data source call latency",
+    "dashboard_llm_seconds": "LLM call latency",
+}
+
+_NOOP = nullcontext()
+# Whether the innermost cached_loader call on this thread ran its body
+_local = threading.local()
+
+
+def _env_enabled():
+    return os.environ.get(METRICS_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` past the last bucket)."""
+        if not self.count:
+            return float("nan")
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """Thread-safe counters and histograms keyed by metric name and label values."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self):
+        """Prometheus text exposition format."""
+        lines, described = [], set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, "counter")
+                lines.append(f"{name}{_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                header(name, "histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json_lines(self, timestamp=None):
+        """One JSON object per series, stamped with ``timestamp`` (epoch seconds)."""
+        timestamp = time.time() if timestamp is None else timestamp
+        records = []
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                records.append({"ts": timestamp, "metric": name, "labels": dict(labels), "value": value})
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                records.append({
+                    "ts": timestamp, "metric": name, "labels": dict(labels), "count": histogram.count,
+                    "sum": round(histogram.sum, 6), "p50": histogram.quantile(0.5), "p95": histogram.quantile(0.95),
+                    "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], histogram.counts)),
+                })
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+    def export(self, path):
+        """Write a ``.prom`` snapshot (replaced atomically) or append ``.jsonl`` records to ``path``."""
+        path = Path(path)
+        if path.suffix == ".jsonl":
+            with path.open("a", encoding="utf-8") as f:
+                f.write(self.to_json_lines())
+            return
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp.replace(path)
+
+    def histogram_rows(self, name):
+        """``(labels, histogram)`` pairs of one metric, for display."""
+        with self._lock:
+            return [(dict(labels), h) for (metric, labels), h in sorted(self.histograms.items()) if metric == name]
+
+    def counter_rows(self, name):
+        with self._lock:
+            return [(dict(labels), v) for (metric, labels), v in sorted(self.counters.items()) if metric == name]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+REGISTRY = Registry()
+ENABLED = _env_enabled()
+
+
+def set_enabled(enabled):
+    """Turn recording on or off for this process (benchmarks; the app reads the environment)."""
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def timed(name, **labels):
+    """Context manager recording the block's wall time into histogram ``name``."""
+    if not ENABLED:
+        return _NOOP
+    return _Timer(name, labels)
+
+
+def cached_loader(cache, **cache_kwargs):
+    """``cache(**cache_kwargs)`` (``st.cache_data`` or ``st.cache_resource``) that also counts hits and misses.
+
+    The loader body only runs on a miss, so calls minus body runs are hits.
+    When instrumentation is off this is exactly the plain cache decorator.
+    """
+    def decorator(func):
+        if not ENABLED:
+            return cache(**cache_kwargs)(func)
+        loader = func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _local.missed = True
+            with _Timer("dashboard_loader_seconds", {"loader": loader}):
+                return func(*args, **kwargs)
+
+        cached = cache(**cache_kwargs)(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            # Saved and restored so loaders that call other loaders count separately
+            outer, _local.missed = getattr(_local, "missed", False), False
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                result = "miss" if _local.missed else "hit"
+                _local.missed = outer
+                REGISTRY.inc("dashboard_cache_requests_total", loader=loader, result=result)
+
+        call.clear = cached.clear
+        return call
+    return decorator
+
+
+def export_path():
+    """File named by ``ASSET_MGMT_METRICS_EXPORT``, or ``None``."""
+    return os.environ.get(EXPORT_ENV_VAR) or None
@@ -0,0 +1,199 @@
+"""Vectorized portfolio risk analytics.
+
+Every metric is computed for all portfolios at once on a portfolios x days
+matrix of daily returns, with no per-portfolio Python loop:
+
+- volatility: annualized standard deviation of daily returns;
+- Sharpe ratio: (annualized return - risk-free rate) / volatility, as in the
+  Dashboard Guide;
+- historical VaR: the loss not exceeded on ``VAR_CONFIDENCE`` of days;
+- max drawdown: the largest peak-to-trough fall of cumulative wealth;
+- YTD return: compounded return since the first trading day of the year;
+- sector HHI: sum of squared sector weights (1 = a single sector).
+
+Daily returns come from ``PORTFOLIO_HOLDINGS_HISTORY`` (see history.py),
+holdings-weighted: only holdings present on both consecutive days count,
+weighted by the earlier day's value, so subscriptions, redemptions and
+positions opened or closed do not show up as performance.
+``refresh_risk_metrics`` stores the results in ``PORTFOLIO_RISK_METRICS`` once
+per recorded day, where the dashboard SQL reads them (see aggregates.py).
+"""
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.045
+VAR_CONFIDENCE = 0.95
+METRICS_LOOKBACK_DAYS = 365
+# Annualized volatility treated as the top of the 1-10 risk scale
+MAX_SCORED_VOLATILITY = 0.40
+
+# Value of the holdings held on both a recorded day and the one before it, on each of the two days
+HISTORY_RETURNS_SQL = """
+WITH days AS (
+    SELECT DISTINCT AS_OF_DATE FROM PORTFOLIO_HOLDINGS_HISTORY WHERE AS_OF_DATE > ? AND AS_OF_DATE <= ?
+),
+pairs AS (
+    SELECT AS_OF_DATE, LAG(AS_OF_DATE) OVER (ORDER BY AS_OF_DATE) AS PREVIOUS_DATE FROM days
+)
+SELECT cur.PORTFOLIO_NAME, cur.AS_OF_DATE,
+       SUM(cur.MARKET_VALUE) AS MARKET_VALUE, SUM(prev.MARKET_VALUE) AS PREVIOUS_VALUE
+FROM pairs p
+JOIN PORTFOLIO_HOLDINGS_HISTORY cur ON cur.AS_OF_DATE = p.AS_OF_DATE
+JOIN PORTFOLIO_HOLDINGS_HISTORY prev
+  ON prev.AS_OF_DATE = p.PREVIOUS_DATE AND prev.HOLDING_ID = cur.HOLDING_ID
+ AND prev.PORTFOLIO_NAME = cur.PORTFOLIO_NAME
+GROUP BY cur.PORTFOLIO_NAME, cur.AS_OF_DATE
+"""
+
+SECTOR_VALUES_SQL = """
+SELECT PORTFOLIO_NAME, SECTOR, SUM(MARKET_VALUE) AS MARKET_VALUE
+FROM PORTFOLIO_HOLDINGS
+GROUP BY PORTFOLIO_NAME, SECTOR
+"""
+
+METRICS_COLUMNS = [
+    "PORTFOLIO_NAME", "AS_OF_DATE", "YTD_RETURN", "ANNUAL_RETURN", "VOLATILITY", "SHARPE_RATIO", "VAR_95",
+    "MAX_DRAWDOWN", "SECTOR_HHI", "RISK_SCORE", "OBSERVATIONS",
+]
+
+METRICS_AS_OF_SQL = "SELECT MAX(AS_OF_DATE) AS AS_OF_DATE FROM PORTFOLIO_RISK_METRICS"
+
+# One refresh per process at a time, so concurrent sessions never compute the same day twice
+_refresh_lock = threading.Lock()
+
+
+def returns_from_values(values, previous_values):
+    """Daily simple returns from matched holdings' values on each day and the day before; NaN if undefined."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values / previous_values - 1.0
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def risk_metrics(returns, risk_free_rate=RISK_FREE_RATE, confidence=VAR_CONFIDENCE, ytd_mask=None):
+    """Per-portfolio metrics from a portfolios x days return matrix, as a dict of arrays.
+
+    ``ytd_mask`` selects the return columns of the current year; without it
+    ``ytd_return`` is the compounded return over the whole matrix.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if not returns.shape[1]:
+        # A single day of history has no returns yet; one missing day keeps the reductions defined
+        returns = np.full((len(returns), 1), np.nan)
+        ytd_mask = None if ytd_mask is None else np.zeros(1, dtype=bool)
+    observed = ~np.isnan(returns)
+    observations = observed.sum(axis=1)
+    filled = np.where(observed, returns, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=1) / observations
+        variance = (np.where(observed, returns - mean[:, None], 0.0) ** 2).sum(axis=1) / (observations - 1)
+        volatility = np.sqrt(variance * TRADING_DAYS)
+        annual_return = mean * TRADING_DAYS
+        sharpe = (annual_return - risk_free_rate) / volatility
+    # Linear-interpolated quantile over the observed days; sorting moves NaNs to the end of each row,
+    # which avoids np.nanquantile's per-row fallback
+    ordered = np.sort(returns, axis=1)
+    position = np.maximum(observations - 1, 0) * (1.0 - confidence)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, np.maximum(observations - 1, 0))
+    low = np.take_along_axis(ordered, lower[:, None], axis=1)[:, 0]
+    high = np.take_along_axis(ordered, upper[:, None], axis=1)[:, 0]
+    var = -(low + (high - low) * (position - lower))
+    # Missing days count as flat, so they neither start nor end a drawdown
+    wealth = np.cumprod(1.0 + filled, axis=1)
+    peaks = np.maximum.accumulate(np.maximum(wealth, 1.0), axis=1)
+    max_drawdown = -(wealth / peaks - 1.0).min(axis=1)
+    ytd = filled if ytd_mask is None else filled[:, ytd_mask]
+    ytd_return = np.prod(1.0 + ytd, axis=1) - 1.0
+    too_short = observations < 2
+    for metric in (volatility, annual_return, sharpe, var, max_drawdown, ytd_return):
+        metric[too_short] = np.nan
+    return {
+        "volatility": volatility,
+        "annual_return": annual_return,
+        "sharpe_ratio": sharpe,
+        "var": var,
+        "max_drawdown": max_drawdown,
+        "ytd_return": ytd_return,
+        "observations": observations,
+    }
+
+
+def sector_hhi(portfolio_codes, sector_codes, market_values, n_portfolios, n_sectors):
+    """Herfindahl-Hirschman index of sector weights per portfolio, from one row per holding."""
+    exposure = np.bincount(
+        portfolio_codes * n_sectors + sector_codes, weights=market_values, minlength=n_portfolios * n_sectors
+    ).reshape(n_portfolios, n_sectors)
+    totals = exposure.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = exposure / totals
+    return np.where(totals[:, 0] > 0, (weights ** 2).sum(axis=1), np.nan)
+
+
+def risk_scores(volatility, hhi):
+    """1-10 risk score: 70% annualized volatility (capped at ``MAX_SCORED_VOLATILITY``), 30% sector HHI."""
+    blend = 0.7 * np.clip(volatility / MAX_SCORED_VOLATILITY, 0.0, 1.0) + 0.3 * np.nan_to_num(hhi, nan=1.0)
+    return np.round(1.0 + 9.0 * blend, 1)
+
+
+def portfolio_metrics(history, holdings, as_of):
+    """DataFrame of metrics per portfolio from matched daily values (``HISTORY_RETURNS_SQL``)
+    and current holdings (PORTFOLIO_NAME, SECTOR, MARKET_VALUE)."""
+    history = history.assign(
+        AS_OF_DATE=pd.to_datetime(history["AS_OF_DATE"]),
+        RETURN=returns_from_values(history["MARKET_VALUE"].to_numpy(dtype=np.float64),
+                                   history["PREVIOUS_VALUE"].to_numpy(dtype=np.float64)),
+    )
+    daily = history.pivot(index="PORTFOLIO_NAME", columns="AS_OF_DATE", values="RETURN").sort_index(axis=1)
+    year_start = pd.Timestamp(as_of.year, 1, 1)
+    metrics = risk_metrics(daily.to_numpy(dtype=np.float64), ytd_mask=np.asarray(daily.columns >= year_start))
+
+    names = daily.index.union(pd.Index(holdings["PORTFOLIO_NAME"].unique()))
+    portfolio_codes = names.get_indexer(holdings["PORTFOLIO_NAME"])
+    sector_codes, sectors = pd.factorize(holdings["SECTOR"])
+    hhi = sector_hhi(portfolio_codes, sector_codes, holdings["MARKET_VALUE"].to_numpy(dtype=np.float64),
+                     len(names), len(sectors))
+
+    frame = pd.DataFrame({key: metrics[key] for key in metrics}, index=daily.index).reindex(names)
+    frame["sector_hhi"] = hhi
+    frame["risk_score"] = np.where(frame["volatility"].notna(), risk_scores(frame["volatility"].to_numpy(), hhi), np.nan)
+    frame["observations"] = frame["observations"].fillna(0).astype(int)
+    return frame.rename_axis("PORTFOLIO_NAME").reset_index()
+
+
+def refresh_risk_metrics(source, as_of=None, lookback_days=METRICS_LOOKBACK_DAYS):
+    """Recompute ``PORTFOLIO_RISK_METRICS`` for ``as_of`` unless it is already current; return True if it ran."""
+    as_of = as_of or date.today()
+    with _refresh_lock:
+        current = source.query(METRICS_AS_OF_SQL).iloc[0, 0]
+        if current is not None and not pd.isna(current) and pd.Timestamp(current).date() >= as_of:
+            return False
+        # Enough history for both the trailing window and year-to-date
+        start = min(as_of - timedelta(days=lookback_days), date(as_of.year, 1, 1) - timedelta(days=7))
+        history = source.query(HISTORY_RETURNS_SQL, [start.isoformat(), as_of.isoformat()])
+        frame = portfolio_metrics(history, source.query(SECTOR_VALUES_SQL), as_of)
+        _store_metrics(source, frame, as_of)
+        return True
+
+
+def _store_metrics(source, frame, as_of):
+    """Replace the stored metrics with ``frame``; ratios are stored as percentages like PORTFOLIO_METRICS."""
+
+    def pct(value):
+        return None if pd.isna(value) else round(100.0 * float(value), 2)
+
+    def num(value):
+        return None if pd.isna(value) else round(float(value), 4)
+
+    rows = [
+        (row.PORTFOLIO_NAME, as_of.isoformat(), pct(row.ytd_return), pct(row.annual_return), pct(row.volatility),
+         num(row.sharpe_ratio), pct(row.var), pct(row.max_drawdown), num(row.sector_hhi), num(row.risk_score),
+         int(row.observations))
+        for row in frame.itertuples(index=False)
+    ]
+    source.replace_rows("PORTFOLIO_RISK_METRICS", METRICS_COLUMNS, rows)
+
@@ -0,0 +1,178 @@
+"""Incrementally maintained AI risk assessments, one row per portfolio.
+
+``PORTFOLIO_RISK_ASSESSMENT`` holds an AI risk score, sentiment and rationale
+for every portfolio, together with the fingerprint of the holdings it was
+computed from: ``HASH_AGG`` over each holding's security, sector, weight and
+risk level, the same fields the model sees. ``HASH_AGG`` is order independent
+and changes whenever a holding is added, removed or edited, which a
+``LAST_UPDATED`` watermark cannot detect for deletions.
+
+``refresh_risk_assessments`` compares current fingerprints with the stored
+ones and sends only the portfolios that differ (or were assessed with another
+prompt) to the assessor, so re-scoring a large book after a single trade costs
+one ``AI_AGG`` group rather than one per portfolio. The notebook's AI_AGG cell
+maintains the same table with the same fingerprint and prompt.
+
+``CortexAssessor`` runs ``AI_AGG`` in Snowflake; ``FakeAssessor`` scores
+holdings deterministically for the local backend and benchmarks.
+"""
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime, timezone
+
+from instrumentation import timed
+
+ASSESSMENT_BATCH_SIZE = 200
+
+RISK_PROMPT = (
+    "What is the overall risk profile of this portfolio based on individual security risk levels and "
+    "concentrations? Answer in exactly three lines: 'Score: <risk score from 1-10>', "
+    "'Sentiment: <Bullish, Neutral or Bearish>' and 'Rationale: <one or two sentences>'."
+)
+PROMPT_HASH = hashlib.sha256(RISK_PROMPT.encode("utf-8")).hexdigest()
+
+# Current fingerprint of every portfolio whose stored assessment is missing or out of date
+STALE_PORTFOLIOS_SQL = """
+WITH fingerprints AS (
+    SELECT
+        PORTFOLIO_NAME,
+        CAST(HASH_AGG(SECURITY_NAME, SECTOR, WEIGHT_PERCENT, RISK_LEVEL) AS VARCHAR) AS HOLDINGS_FINGERPRINT
+    FROM PORTFOLIO_HOLDINGS
+    GROUP BY PORTFOLIO_NAME
+)
+SELECT f.PORTFOLIO_NAME, f.HOLDINGS_FINGERPRINT
+FROM fingerprints f
+LEFT JOIN PORTFOLIO_RISK_ASSESSMENT a ON a.PORTFOLIO_NAME = f.PORTFOLIO_NAME
+WHERE a.PORTFOLIO_NAME IS NULL
+   OR a.HOLDINGS_FINGERPRINT <> f.HOLDINGS_FINGERPRINT
+   OR a.PROMPT_HASH <> ?
+ORDER BY f.PORTFOLIO_NAME
+"""
+
+ASSESSMENT_COLUMNS = [
+    "PORTFOLIO_NAME", "RISK_SCORE", "AI_SENTIMENT", "RATIONALE", "HOLDINGS_FINGERPRINT", "PROMPT_HASH", "MODEL",
+    "ASSESSED_AT",
+]
+
+# Portfolios that no longer hold anything keep no assessment
+PRUNE_ASSESSMENTS_SQL = """
+DELETE FROM PORTFOLIO_RISK_ASSESSMENT
+WHERE PORTFOLIO_NAME NOT IN (SELECT PORTFOLIO_NAME FROM PORTFOLIO_HOLDINGS)
+"""
+
+HOLDING_DETAILS_SQL = """
+SELECT PORTFOLIO_NAME, SECURITY_NAME, SECTOR, WEIGHT_PERCENT, RISK_LEVEL
+FROM PORTFOLIO_HOLDINGS
+WHERE PORTFOLIO_NAME IN ({placeholders})
+"""
+
+# One AI_AGG group per portfolio; the names arrive as a JSON array
+AI_AGG_SQL = """
+SELECT
+    PORTFOLIO_NAME,
+    AI_AGG(
+        'Security: ' || SECURITY_NAME ||
+        ', Weight: ' || WEIGHT_PERCENT || '%' ||
+        ', Risk: ' || RISK_LEVEL ||
+        ', Sector: ' || SECTOR,
+        '{prompt}'
+    ) AS ASSESSMENT
+FROM PORTFOLIO_HOLDINGS
+WHERE PORTFOLIO_NAME IN (SELECT VALUE::VARCHAR FROM TABLE(FLATTEN(INPUT => PARSE_JSON(?))))
+GROUP BY PORTFOLIO_NAME
+"""
+
+_SCORE = re.compile(r"score\W*(\d+(?:\.\d+)?)", re.I)
+_SENTIMENT = re.compile(r"sentiment\W*(bullish|neutral|bearish)", re.I)
+_RATIONALE = re.compile(r"rationale\W*(.+)", re.I | re.S)
+
+# Only one refresh per process at a time, so concurrent sessions never double-insert
+_refresh_lock = threading.Lock()
+
+
+def parse_assessment(text):
+    """Parse an assessment reply into ``(score, sentiment, rationale)``, or ``None`` without a score."""
+    score = _SCORE.search(text or "")
+    if score is None:
+        return None
+    sentiment = _SENTIMENT.search(text)
+    rationale = _RATIONALE.search(text)
+    return (
+        min(max(float(score.group(1)), 1.0), 10.0),
+        sentiment.group(1).title() if sentiment else "Neutral",
+        (rationale.group(1) if rationale else text).strip()[:2000],
+    )
+
+
+class CortexAssessor:
+    """Runs ``AI_AGG`` over the holdings of the given portfolios in one statement."""
+
+    model = "AI_AGG"
+
+    def __init__(self, source):
+        self.source = source
+
+    def __call__(self, portfolio_names):
+        sql = AI_AGG_SQL.format(prompt=RISK_PROMPT.replace("'", "''"))
+        df = self.source.query(sql, [json.dumps(list(portfolio_names))])
+        return dict(zip(df["PORTFOLIO_NAME"], df["ASSESSMENT"]))
+
+
+class FakeAssessor:
+    """Deterministic local stand-in: weight-averaged risk levels plus a concentration penalty."""
+
+    model = "fake-assessor"
+
+    _LEVEL_SCORES = {"Low": 3.0, "Medium": 5.5, "High": 8.5}
+
+    def __init__(self, source):
+        self.source = source
+        # Portfolios assessed so far; each one is a single AI_AGG group in Snowflake
+        self.calls = 0
+
+    def __call__(self, portfolio_names):
+        placeholders = ", ".join("?" * len(portfolio_names))
+        df = self.source.query(HOLDING_DETAILS_SQL.format(placeholders=placeholders), list(portfolio_names))
+        replies = {}
+        for name, holdings in df.groupby("PORTFOLIO_NAME", sort=False):
+            weights = holdings["WEIGHT_PERCENT"].astype(float).clip(lower=0.01)
+            levels = holdings["RISK_LEVEL"].map(self._LEVEL_SCORES).fillna(5.5)
+            top_sector = holdings.groupby("SECTOR")["WEIGHT_PERCENT"].sum().idxmax()
+            concentration = float(weights.max() / weights.sum())
+            score = round(float((levels * weights).sum() / weights.sum()) + 2 * concentration - 1, 1)
+            sentiment = "Bullish" if score <= 4 else "Bearish" if score >= 7 else "Neutral"
+            replies[name] = (
+                f"Score: {score}\nSentiment: {sentiment}\n"
+                f"Rationale: {len(holdings)} position(s), {concentration:.0%} in the largest one, "
+                f"most exposed to {top_sector}."
+            )
+        self.calls += len(replies)
+        return replies
+
+
+def refresh_risk_assessments(source, assessor, batch_size=ASSESSMENT_BATCH_SIZE):
+    """Re-assess the portfolios whose holdings changed since they were last assessed; return stats."""
+    with _refresh_lock:
+        stale = source.query(STALE_PORTFOLIOS_SQL, [PROMPT_HASH])
+        stats = {"stale": len(stale), "assessed": 0, "failed": 0}
+        fingerprints = dict(zip(stale["PORTFOLIO_NAME"], stale["HOLDINGS_FINGERPRINT"].astype(str)))
+        names = list(fingerprints)
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            with timed("dashboard_llm_seconds", task="risk_assessment"):
+                replies = assessor(batch)
+            assessed_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            rows = []
+            for name in batch:
+                parsed = parse_assessment(replies.get(name))
+                if parsed is None:
+                    # Left stale, so the next refresh retries it
+                    stats["failed"] += 1
+                    continue
+                rows.append((name, *parsed, fingerprints[name], PROMPT_HASH, assessor.model, assessed_at))
+            source.replace_rows("PORTFOLIO_RISK_ASSESSMENT", ASSESSMENT_COLUMNS, rows, key="PORTFOLIO_NAME")
+            stats["assessed"] += len(rows)
+        source.execute(PRUNE_ASSESSMENTS_SQL)
+        return stats
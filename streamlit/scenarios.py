@@ -0,0 +1,301 @@
+"""In-memory what-if scenarios over the cached holdings.
+
+The notebook models scenarios by cloning ``PORTFOLIO_HOLDINGS`` and running
+``INSERT`` / ``UPDATE`` statements against the clone, one warehouse round trip
+per tweak. Here a ``ScenarioBase`` is built once from the holdings and the
+dashboard's portfolio rows, and each ``Scenario`` is an immutable
+copy-on-write overlay on it:
+
+- an edit copies only the holdings of the portfolios it touches, found through
+  the base's security and sector indexes;
+- those portfolios are re-summarized (value, sector mix, risk), everything
+  else is read from the base;
+- KPIs and sector allocation are the base totals plus the deltas of the
+  overlaid portfolios, so they cost O(portfolios touched), not O(book).
+
+Edits are plain dicts (``{"kind": "add" | "scale" | "shock", ...}``), so a
+session can keep them in ``st.session_state`` and replay them onto a new base
+after a refresh.
+
+Scenario risk scores move the dashboard's score by the change in the
+risk_analytics.py formula: a volatility estimate from each holding's
+``RISK_LEVEL`` (see history.py) and the portfolio's sector HHI.
+"""
+import itertools
+import math
+from collections import namedtuple
+
+import pandas as pd
+
+from history import RISK_LEVEL_VOLATILITY
+from risk_analytics import MAX_SCORED_VOLATILITY, TRADING_DAYS
+
+HOLDINGS_SQL = """
+SELECT HOLDING_ID, PORTFOLIO_NAME, SECURITY_NAME, SECTOR, MARKET_VALUE, WEIGHT_PERCENT, RISK_LEVEL
+FROM PORTFOLIO_HOLDINGS
+"""
+
+EDIT_KINDS = {"add": "Add position", "scale": "Scale position", "shock": "Sector shock"}
+# Optional edit keys, as Scenario.edits records them when an edit leaves them out
+_EDIT_DEFAULTS = {"add": {"risk_level": "Medium"}, "scale": {"portfolio": None}, "shock": {"portfolio": None}}
+HIGH_RISK_SCORE = 8.0
+TECH_SECTOR = "Technology"
+
+Holding = namedtuple("Holding", "HOLDING_ID SECURITY_NAME SECTOR MARKET_VALUE WEIGHT_PERCENT RISK_LEVEL")
+
+# What the KPIs need from one portfolio; rebuilt only for portfolios an edit touches
+Summary = namedtuple("Summary", "value sectors hhi volatility risk_score")
+
+
+def summarize(holdings):
+    """Value, per-sector value, sector HHI and volatility estimate of one portfolio's holdings."""
+    value = sum(h.MARKET_VALUE for h in holdings)
+    sectors = {}
+    for h in holdings:
+        sectors[h.SECTOR] = sectors.get(h.SECTOR, 0.0) + h.MARKET_VALUE
+    if value <= 0:
+        return Summary(value, sectors, float("nan"), float("nan"), float("nan"))
+    hhi = sum((v / value) ** 2 for v in sectors.values())
+    # Perfectly correlated holdings: an upper bound, but it moves the right way when risk is added
+    daily = sum(h.MARKET_VALUE * RISK_LEVEL_VOLATILITY.get(h.RISK_LEVEL, 0.011) for h in holdings) / value
+    return Summary(value, sectors, hhi, daily * math.sqrt(TRADING_DAYS), float("nan"))
+
+
+def _score_components(summary):
+    """The risk_analytics.risk_scores blend before rounding, on the 1-10 scale."""
+    return 9.0 * (0.7 * min(max(summary.volatility / MAX_SCORED_VOLATILITY, 0.0), 1.0) + 0.3 * summary.hhi)
+
+
+class ScenarioBase:
+    """The live book, summarized once and indexed by security and sector."""
+
+    def __init__(self, holdings_df, portfolio_df):
+        self.holdings = {}
+        self.by_security = {}
+        self.by_sector = {}
+        for row in holdings_df.itertuples(index=False):
+            holding = Holding(row.HOLDING_ID, row.SECURITY_NAME, row.SECTOR, float(row.MARKET_VALUE),
+                              float(row.WEIGHT_PERCENT), row.RISK_LEVEL)
+            self.holdings.setdefault(row.PORTFOLIO_NAME, []).append(holding)
+            self.by_security.setdefault(row.SECURITY_NAME, set()).add(row.PORTFOLIO_NAME)
+            self.by_sector.setdefault(row.SECTOR, set()).add(row.PORTFOLIO_NAME)
+        self.holdings = {name: tuple(rows) for name, rows in self.holdings.items()}
+        shown = dict(zip(portfolio_df["Portfolio"], pd.to_numeric(portfolio_df["Risk_Score"], errors="coerce")))
+
+        self.summaries = {}
+        for name, rows in self.holdings.items():
+            summary = summarize(rows)
+            risk = shown.get(name)
+            self.summaries[name] = summary._replace(risk_score=float("nan") if risk is None else float(risk))
+        self.total_value = sum(s.value for s in self.summaries.values())
+        self.sector_values = {}
+        for summary in self.summaries.values():
+            for sector, value in summary.sectors.items():
+                self.sector_values[sector] = self.sector_values.get(sector, 0.0) + value
+        scored = [s.risk_score for s in self.summaries.values() if not math.isnan(s.risk_score)]
+        self.risk_sum, self.risk_count = sum(scored), len(scored)
+        self.high_risk_count = sum(1 for score in scored if score > HIGH_RISK_SCORE)
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_source(cls, source, portfolio_df):
+        return cls(source.query(HOLDINGS_SQL), portfolio_df)
+
+    def __len__(self):
+        return len(self.holdings)
+
+    def scenario(self, name="Baseline"):
+        return Scenario(self, name)
+
+    def new_holding_id(self):
+        return f"W{next(self._ids):06d}"
+
+
+class Scenario:
+    """An immutable set of edits over a ``ScenarioBase``; every edit returns a new scenario."""
+
+    def __init__(self, base, name, holdings=None, summaries=None, edits=()):
+        self.base = base
+        self.name = name
+        self._holdings = holdings or {}
+        self._summaries = summaries or {}
+        self.edits = edits
+
+    def holdings_of(self, portfolio):
+        return self._holdings.get(portfolio, self.base.holdings.get(portfolio, ()))
+
+    def summary_of(self, portfolio):
+        return self._summaries.get(portfolio) or self.base.summaries.get(portfolio)
+
+    @property
+    def touched(self):
+        """Portfolios whose holdings differ from the base."""
+        return set(self._holdings)
+
+    def _with(self, changed, edit):
+        summaries = dict(self._summaries)
+        for portfolio, rows in changed.items():
+            summary = summarize(rows)
+            base = self.base.summaries.get(portfolio)
+            if math.isnan(summary.hhi):
+                risk = float("nan")
+            elif base is None or math.isnan(base.risk_score) or math.isnan(base.hhi):
+                # No score to move: use the formula outright
+                risk = 1.0 + _score_components(summary)
+            else:
+                risk = base.risk_score + _score_components(summary) - _score_components(base)
+            summaries[portfolio] = summary._replace(risk_score=round(min(max(risk, 1.0), 10.0), 1))
+        return Scenario(self.base, self.name, {**self._holdings, **changed}, summaries, self.edits + (edit,))
+
+    def _candidates(self, index, key, portfolio):
+        """Portfolios that may hold ``key``: the base index plus overlaid portfolios (added positions)."""
+        if portfolio is not None:
+            return {portfolio}
+        return index.get(key, set()) | set(self._holdings)
+
+    def apply(self, edit):
+        """Apply one edit dict; unknown kinds raise ValueError."""
+        kind = edit.get("kind")
+        if kind == "add":
+            return self.add_position(edit["portfolio"], edit["security"], edit["sector"], edit["market_value"],
+                                     edit.get("risk_level", "Medium"))
+        if kind == "scale":
+            return self.scale_position(edit["security"], edit["factor"], edit.get("portfolio"))
+        if kind == "shock":
+            return self.shock_sector(edit["sector"], edit["change_pct"], edit.get("portfolio"))
+        raise ValueError(f"Unknown scenario edit: {kind!r}")
+
+    def add_position(self, portfolio, security, sector, market_value, risk_level="Medium"):
+        rows = self.holdings_of(portfolio)
+        book_value = self.base.total_value or 1.0
+        holding = Holding(self.base.new_holding_id(), security, sector, float(market_value),
+                          round(100.0 * float(market_value) / book_value, 2), risk_level)
+        edit = {"kind": "add", "portfolio": portfolio, "security": security, "sector": sector,
+                "market_value": float(market_value), "risk_level": risk_level}
+        return self._with({portfolio: rows + (holding,)}, edit)
+
+    def scale_position(self, security, factor, portfolio=None):
+        """Multiply a security's value and weight by ``factor``, in one portfolio or all that hold it."""
+        changed = {}
+        for name in self._candidates(self.base.by_security, security, portfolio):
+            rows = self.holdings_of(name)
+            if any(h.SECURITY_NAME == security for h in rows):
+                changed[name] = tuple(
+                    h._replace(MARKET_VALUE=h.MARKET_VALUE * factor, WEIGHT_PERCENT=h.WEIGHT_PERCENT * factor)
+                    if h.SECURITY_NAME == security else h
+                    for h in rows
+                )
+        return self._with(changed, {"kind": "scale", "security": security, "factor": float(factor),
+                                    "portfolio": portfolio})
+
+    def shock_sector(self, sector, change_pct, portfolio=None):
+        """Move every holding in ``sector`` by ``change_pct`` percent."""
+        factor = 1.0 + float(change_pct) / 100.0
+        changed = {}
+        for name in self._candidates(self.base.by_sector, sector, portfolio):
+            rows = self.holdings_of(name)
+            if any(h.SECTOR == sector for h in rows):
+                changed[name] = tuple(
+                    h._replace(MARKET_VALUE=h.MARKET_VALUE * factor, WEIGHT_PERCENT=h.WEIGHT_PERCENT * factor)
+                    if h.SECTOR == sector else h
+                    for h in rows
+                )
+        return self._with(changed, {"kind": "shock", "sector": sector, "change_pct": float(change_pct),
+                                    "portfolio": portfolio})
+
+    def sector_values(self):
+        """Market value per sector: base totals plus the deltas of touched portfolios."""
+        values = dict(self.base.sector_values)
+        for portfolio, summary in self._summaries.items():
+            base = self.base.summaries.get(portfolio)
+            for sector, value in summary.sectors.items():
+                values[sector] = values.get(sector, 0.0) + value
+            for sector, value in (base.sectors.items() if base else ()):
+                values[sector] -= value
+        return values
+
+    def kpis(self):
+        """Book-level KPIs, updated from the base by the touched portfolios only."""
+        total = self.base.total_value
+        risk_sum, risk_count, high_risk = self.base.risk_sum, self.base.risk_count, self.base.high_risk_count
+        for portfolio, summary in self._summaries.items():
+            base = self.base.summaries.get(portfolio)
+            total += summary.value - (base.value if base else 0.0)
+            for sign, score in ((1, summary.risk_score), (-1, base.risk_score if base else float("nan"))):
+                if not math.isnan(score):
+                    risk_sum += sign * score
+                    risk_count += sign
+                    high_risk += sign * (score > HIGH_RISK_SCORE)
+        sectors = self.sector_values()
+        top_sector = max(sectors, key=sectors.get) if sectors else None
+        return {
+            "total_aum": total / 1e6,
+            "avg_risk_score": risk_sum / risk_count if risk_count else float("nan"),
+            "high_risk_count": high_risk,
+            "tech_allocation": 100.0 * sectors.get(TECH_SECTOR, 0.0) / total if total else float("nan"),
+            "top_sector": top_sector,
+            "top_sector_share": 100.0 * sectors[top_sector] / total if top_sector and total else float("nan"),
+        }
+
+    def changes(self):
+        """One row per touched portfolio: value and risk before and after."""
+        rows = []
+        for portfolio in sorted(self._summaries):
+            after = self._summaries[portfolio]
+            before = self.base.summaries.get(portfolio)
+            rows.append({
+                "Portfolio": portfolio,
+                "Value_Before": (before.value if before else 0.0) / 1e6,
+                "Value_After": after.value / 1e6,
+                "Risk_Before": before.risk_score if before else float("nan"),
+                "Risk_After": after.risk_score,
+                "Sector_HHI": after.hhi,
+            })
+        return pd.DataFrame(rows, columns=["Portfolio", "Value_Before", "Value_After", "Risk_Before", "Risk_After",
+                                           "Sector_HHI"])
+
+    def holdings_frame(self):
+        """The scenario's full holdings table, for export or checking against a from-scratch recompute."""
+        rows = [(portfolio, *holding) for portfolio in set(self.base.holdings) | set(self._holdings)
+                for holding in self.holdings_of(portfolio)]
+        return pd.DataFrame(rows, columns=["PORTFOLIO_NAME", *Holding._fields])
+
+
+def replay(base, name, edits, previous=None):
+    """Scenario ``name`` with ``edits`` applied; only the new edits when ``previous`` is a prefix on this base."""
+    edits = tuple(edits)
+    recorded = tuple({**_EDIT_DEFAULTS.get(edit.get("kind"), {}), **edit} for edit in edits)
+    if previous is not None and previous.base is base and previous.edits == recorded[:len(previous.edits)]:
+        scenario, pending = previous, edits[len(previous.edits):]
+    else:
+        scenario, pending = Scenario(base, name), edits
+    for edit in pending:
+        scenario = scenario.apply(edit)
+    scenario.name = name
+    return scenario
+
+
+def describe(edit):
+    """One-line label for an edit dict."""
+    where = f" in {edit['portfolio']}" if edit.get("portfolio") else ""
+    if edit["kind"] == "add":
+        return f"Add {edit['security']} ({edit['sector']}, ${edit['market_value'] / 1e6:.2f}M) to {edit['portfolio']}"
+    if edit["kind"] == "scale":
+        return f"Scale {edit['security']} x{edit['factor']:.2f}{where}"
+    return f"Shock {edit['sector']} {edit['change_pct']:+.1f}%{where}"
+
+
+def compare(scenarios):
+    """Side-by-side KPI table, one column per scenario, formatted for display."""
+    rows = {
+        "Total AUM": lambda k: f"${k['total_aum']:.1f}M",
+        "Avg Risk Score": lambda k: f"{k['avg_risk_score']:.2f}",
+        f"Portfolios with risk > {HIGH_RISK_SCORE:g}": lambda k: str(k["high_risk_count"]),
+        "Technology allocation": lambda k: f"{k['tech_allocation']:.1f}%",
+        "Largest sector": lambda k: f"{k['top_sector']} ({k['top_sector_share']:.1f}%)",
+    }
+    columns = {}
+    for scenario in scenarios:
+        kpis = scenario.kpis()
+        columns[scenario.name] = [fmt(kpis) for fmt in rows.values()]
+    return pd.DataFrame(columns, index=list(rows))
@@ -0,0 +1,70 @@
+"""Independently rerunnable dashboard sections.
+
+``@section("Name")`` wraps a render function in ``st.fragment`` so that
+interacting with a widget inside it reruns only that function. Each run is
+recorded in session state, which lets the sidebar report how many sections
+the last interaction actually re-executed, and timed as
+``dashboard_section_seconds`` when instrumentation is on (see instrumentation.py).
+"""
+import functools
+
+import streamlit as st
+
+from instrumentation import timed
+
+_TRACKER_KEY = "_section_tracker"
+
+# Names of every section registered with @section, in render order
+SECTION_NAMES = []
+
+
+def _tracker():
+    if _TRACKER_KEY not in st.session_state:
+        st.session_state[_TRACKER_KEY] = {"full_run": False, "last_rerun": [], "run_counts": {}}
+    return st.session_state[_TRACKER_KEY]
+
+
+def begin_full_run():
+    """Mark the start of a top-to-bottom script run."""
+    tracker = _tracker()
+    tracker["full_run"] = True
+    tracker["last_rerun"] = []
+
+
+def end_full_run():
+    """Mark the end of a full run; later section runs are fragment-only reruns."""
+    _tracker()["full_run"] = False
+
+
+def _record_run(name):
+    tracker = _tracker()
+    if tracker["full_run"]:
+        tracker["last_rerun"].append(name)
+    else:
+        tracker["last_rerun"] = [name]
+    tracker["run_counts"][name] = tracker["run_counts"].get(name, 0) + 1
+
+
+def last_rerun():
+    """Return the section names executed by the most recent interaction."""
+    return list(_tracker()["last_rerun"])
+
+
+def run_counts():
+    """Return the number of times each section has run in this session."""
+    return dict(_tracker()["run_counts"])
+
+
+def section(name):
+    """Register ``name`` and turn the decorated render function into a fragment."""
+    if name not in SECTION_NAMES:
+        SECTION_NAMES.append(name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def tracked(*args, **kwargs):
+            _record_run(name)
+            with timed("dashboard_section_seconds", section=name):
+                return func(*args, **kwargs)
+        return st.fragment(tracked)
+    return decorator
@@ -0,0 +1,340 @@
+"""Compiled index over the Cortex Analyst semantic model, with a local fast path.
+
+``PORTFOLIO_ANALYSIS.yaml`` describes the dimensions, facts and synonyms of
+``PORTFOLIO_HOLDINGS``. ``load_semantic_model`` reads and validates it once,
+and ``SemanticIndex`` compiles it into a phrase lookup: normalized token
+sequences from column names, synonyms and known dimension values, mapped to
+columns, filter values, aggregations and grammar words.
+
+``SemanticIndex.plan`` answers simple questions such as "total market value
+by sector" or "high risk holdings in Growth Fund Alpha" with parameterized SQL.
+Every word of the question must be recognized and unambiguous; anything else
+returns ``None`` and ``ask`` falls back to Cortex Analyst, whose answers are
+shared by every session asking the same question (``ANALYST_REPLIES``).
+"""
+import json
+import re
+import time
+from pathlib import Path
+
+import yaml
+
+from instrumentation import timed
+from shared_cache import SharedCache
+
+SEMANTIC_MODEL_PATH = (
+    Path(__file__).resolve().parent.parent / "scripts" / "semantic_models" / "PORTFOLIO_ANALYSIS.yaml"
+)
+# Where README step 5 uploads the same model for Cortex Analyst
+ANALYST_SEMANTIC_MODEL_FILE = "@ASSET_MANAGEMENT_AI.RESEARCH_ANALYTICS.RESEARCH_DOCS/semantic_models/PORTFOLIO_ANALYSIS.yaml"
+ANALYST_TIMEOUT_MS = 60000
+# Distinct questions whose Cortex Analyst answer is kept (for the shared cache's default TTL)
+ANALYST_CACHE_ENTRIES = 128
+
+COLUMN_KINDS = ("dimensions", "time_dimensions", "facts")
+# Dimensions with at most this many distinct values have them indexed as filters
+MAX_INDEXED_VALUES = 1000
+LISTING_LIMIT = 100
+TOP_N = 10
+
+# Trailing words dropped from column names to form a short alias, e.g. RISK_LEVEL -> "risk"
+_ALIAS_SUFFIXES = ("name", "level", "percent")
+
+AGGREGATION_WORDS = {
+    "total": "SUM", "sum": "SUM",
+    "average": "AVG", "avg": "AVG", "mean": "AVG",
+    "count": "COUNT", "number of": "COUNT", "how many": "COUNT",
+    "maximum": "MAX", "max": "MAX", "largest": "MAX", "biggest": "MAX", "highest": "MAX", "top": "MAX",
+    "minimum": "MIN", "min": "MIN", "smallest": "MIN", "lowest": "MIN",
+}
+# Words naming the rows themselves: "list high risk holdings"
+ENTITY_WORDS = ("holding", "position", "investment", "portfolio holding", "portfolio position")
+GROUP_WORDS = ("by", "per", "each", "across", "grouped by", "broken down by", "split by")
+STOP_WORDS = (
+    "a", "an", "the", "of", "in", "for", "on", "at", "with", "and", "to", "from", "is", "are", "what", "which",
+    "show", "me", "list", "give", "get", "find", "display", "our", "my", "we", "have", "do", "all", "current",
+    "currently", "there", "that", "held", "hold", "please",
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Lowercase word tokens with a light plural strip, so "Holdings" and "holding" match."""
+    tokens = []
+    for token in _TOKEN.findall(str(text).lower().replace("_", " ")):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tuple(tokens)
+
+
+def semantic_model_mtime(path=SEMANTIC_MODEL_PATH):
+    """Modification time of the semantic model, or ``None`` if it is not deployed with the app."""
+    try:
+        return Path(path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_semantic_model(path=SEMANTIC_MODEL_PATH):
+    """Read and validate a semantic model YAML; raise ``ValueError`` describing the first problem."""
+    model = yaml.safe_load(Path(path).read_text())
+    if not isinstance(model, dict) or not model.get("name"):
+        raise ValueError(f"{path}: semantic model needs a name")
+    tables = model.get("tables")
+    if not isinstance(tables, list) or not tables:
+        raise ValueError(f"{path}: semantic model needs at least one table")
+    for table in tables:
+        where = f"{path}: table {table.get('name')!r}"
+        if not table.get("name") or not (table.get("base_table") or {}).get("table"):
+            raise ValueError(f"{where} needs a name and base_table.table")
+        seen = set()
+        for kind in COLUMN_KINDS:
+            for column in table.get(kind) or []:
+                name = column.get("name")
+                if not name or not column.get("expr"):
+                    raise ValueError(f"{where}: every {kind} entry needs a name and expr")
+                if name in seen:
+                    raise ValueError(f"{where}: column {name!r} is defined twice")
+                seen.add(name)
+                for field in ("synonyms", "sample_values"):
+                    if not isinstance(column.get(field) or [], list):
+                        raise ValueError(f"{where}: {name}.{field} must be a list")
+        if not seen:
+            raise ValueError(f"{where} defines no columns")
+    return model
+
+
+def dimension_values(source, model, limit=MAX_INDEXED_VALUES):
+    """Distinct values of every dimension with at most ``limit`` of them, as ``{(table, column): [values]}``."""
+    values = {}
+    for table in model["tables"]:
+        for column in table.get("dimensions") or []:
+            df = source.query(
+                f"SELECT DISTINCT {column['expr']} AS VALUE FROM {table['base_table']['table']} "
+                f"WHERE {column['expr']} IS NOT NULL LIMIT {limit + 1}"
+            )
+            if len(df) <= limit:
+                values[(table["name"], column["name"])] = df["VALUE"].astype(str).tolist()
+    return values
+
+
+class SemanticIndex:
+    """Phrase lookup compiled from a semantic model, turning simple questions into SQL."""
+
+    def __init__(self, model, values=None):
+        self.model = model
+        self._tables = {}
+        self._columns = {}
+        self._phrases = {}
+        for table in model["tables"]:
+            self._tables[table["name"]] = table
+            for kind in COLUMN_KINDS:
+                for column in table.get(kind) or []:
+                    key = (table["name"], column["name"])
+                    self._columns[key] = dict(column, kind=kind)
+                    self._add_column_phrases(key, column)
+                    if kind == "dimensions":
+                        for value in column.get("sample_values") or []:
+                            self._add(normalize(value), ("value", key, str(value)))
+        for key, column_values in (values or {}).items():
+            for value in column_values:
+                self._add(normalize(value), ("value", key, value))
+        for phrase, function in AGGREGATION_WORDS.items():
+            self._add(normalize(phrase), ("agg", function))
+        for phrase in ENTITY_WORDS:
+            self._add(normalize(phrase), ("entity",))
+        for phrase in GROUP_WORDS:
+            self._add(normalize(phrase), ("group",))
+        for phrase in STOP_WORDS:
+            self._add(normalize(phrase), ("stop",))
+        self._max_phrase = max(map(len, self._phrases))
+
+    def _add_column_phrases(self, key, column):
+        words = normalize(column["name"])
+        phrases = {words, *(normalize(s) for s in column.get("synonyms") or [])}
+        if len(words) > 1 and words[-1] in _ALIAS_SUFFIXES:
+            phrases.add(words[:-1])
+        for phrase in phrases:
+            self._add(phrase, ("column", key))
+
+    def _add(self, phrase, target):
+        if phrase:
+            targets = self._phrases.setdefault(phrase, [])
+            if target not in targets:
+                targets.append(target)
+
+    def match(self, question):
+        """Greedy longest-phrase match; ``None`` if a word is unknown or a phrase is ambiguous."""
+        tokens = normalize(question)
+        matches, i = [], 0
+        while i < len(tokens):
+            for size in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                targets = self._phrases.get(tokens[i:i + size])
+                if targets:
+                    break
+            else:
+                return None
+            # Grammar words shadow values that happen to be spelled the same
+            if len(targets) > 1:
+                grammar = [t for t in targets if t[0] in ("agg", "entity", "group", "stop")]
+                targets = grammar[:1] or targets
+            if len(targets) > 1:
+                return None
+            matches.append(targets[0])
+            i += size
+        return matches
+
+    def plan(self, question):
+        """Return ``{"sql", "params", "summary"}`` for ``question``, or ``None`` to defer to the Analyst."""
+        matches = self.match(question)
+        if not matches:
+            return None
+        aggregations, filters, columns, entity = set(), {}, [], False
+        grouping, ungrouped = False, set()
+        for target in matches:
+            if target[0] == "agg":
+                aggregations.add(target[1])
+            elif target[0] == "value":
+                filters.setdefault(target[1], []).append(target[2])
+            elif target[0] == "column":
+                columns.append(target[1])
+                if not grouping:
+                    ungrouped.add(target[1])
+            elif target[0] == "entity":
+                entity = True
+            elif target[0] == "group":
+                grouping = True
+        # "high risk", "Technology sector": a column named next to one of its values only qualifies it
+        columns = [key for key in columns if key not in filters]
+        tables = {key[0] for key in [*filters, *columns]}
+        if len(aggregations) > 1 or len(tables) > 1:
+            return None
+        if not (aggregations or filters or columns):
+            return None
+        table = self._tables[tables.pop()] if tables else self.model["tables"][0]
+        facts = [key for key in columns if self._columns[key]["kind"] == "facts"]
+        groups = [key for key in columns if self._columns[key]["kind"] != "facts"]
+        aggregation = aggregations.pop() if aggregations else None
+        # "average risk": a sum or average needs a fact to apply to, not a guessed default
+        if aggregation in ("SUM", "AVG") and not facts:
+            return None
+        # "holdings by sector": grouping with nothing to measure could mean a count, values or a listing
+        if groups and not facts and aggregation is None:
+            return None
+        # "how many sectors (per portfolio)": a dimension named before any group word is what gets counted
+        distinct = [key for key in groups if key in ungrouped] if aggregation == "COUNT" and not facts else []
+        groups = [key for key in groups if key not in distinct]
+        return self._build_sql(table, facts, groups, filters, aggregation, entity, distinct)
+
+    def _build_sql(self, table, facts, groups, filters, aggregation, entity, distinct=()):
+        expr = lambda key: self._columns[key]["expr"]  # noqa: E731
+        where, params = [], []
+        for key, values in filters.items():
+            where.append(f"{expr(key)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        where_sql = f"\nWHERE {' AND '.join(where)}" if where else ""
+        source = table["base_table"]["table"]
+        default_fact = next(((table["name"], c["name"]) for c in table.get("facts") or []), None)
+        summary_filters = "; ".join(f"{key[1]} in {values}" for key, values in filters.items())
+
+        if not facts and not groups and aggregation in (None, "MAX", "MIN") and (entity or filters):
+            # Row listing, or the top holdings for "largest"/"smallest"
+            columns = [c["name"] for kind in COLUMN_KINDS for c in table.get(kind) or []]
+            select = ", ".join(f'{expr((table["name"], c))} AS "{c}"' for c in columns)
+            order, limit = "", LISTING_LIMIT
+            if default_fact:
+                order = f'\nORDER BY "{default_fact[1]}" {"ASC" if aggregation == "MIN" else "DESC"}'
+                limit = TOP_N if aggregation else LISTING_LIMIT
+            sql = f"SELECT {select}\nFROM {source}{where_sql}{order}\nLIMIT {limit}"
+            return {"sql": sql, "params": params, "summary": f"{source} rows" + (f" where {summary_filters}" if where else "")}
+
+        if aggregation in ("MAX", "MIN") and not facts:
+            # "highest risk levels" ranks a dimension, which needs the Analyst's judgement
+            return None
+        aggregation = aggregation or ("COUNT" if not facts else "SUM")
+        if facts:
+            measures = [(f"{aggregation}({expr(key)})", f"{aggregation}_{key[1]}") for key in facts]
+        elif distinct:
+            measures = [(f"COUNT(DISTINCT {expr(key)})", f"{key[1]}_COUNT") for key in distinct]
+        elif aggregation == "COUNT":
+            measures = [("COUNT(*)", "HOLDING_COUNT")]
+        else:
+            return None
+        select = [f'{expr(key)} AS "{key[1]}"' for key in groups]
+        select += [f'{measure} AS "{alias}"' for measure, alias in measures]
+        sql = f"SELECT {', '.join(select)}\nFROM {source}{where_sql}"
+        if groups:
+            sql += f"\nGROUP BY {', '.join(expr(key) for key in groups)}\nORDER BY \"{measures[0][1]}\" DESC"
+        summary = ", ".join(alias for _, alias in measures)
+        if groups:
+            summary += " by " + ", ".join(key[1] for key in groups)
+        if where:
+            summary += f" where {summary_filters}"
+        return {"sql": sql, "params": params, "summary": summary}
+
+
+class CortexAnalyst:
+    """Cortex Analyst REST client for Streamlit in Snowflake; returns its explanation and SQL."""
+
+    def __init__(self, semantic_model_file=ANALYST_SEMANTIC_MODEL_FILE, timeout_ms=ANALYST_TIMEOUT_MS):
+        self.semantic_model_file = semantic_model_file
+        self.timeout_ms = timeout_ms
+
+    def __call__(self, question):
+        import _snowflake
+
+        body = {
+            "messages": [{"role": "user", "content": [{"type": "text", "text": question}]}],
+            "semantic_model_file": self.semantic_model_file,
+        }
+        response = _snowflake.send_snow_api_request(
+            "POST", "/api/v2/cortex/analyst/message", {}, {}, body, None, self.timeout_ms
+        )
+        content = json.loads(response["content"])
+        if response["status"] >= 400:
+            raise RuntimeError(content.get("message", f"Cortex Analyst returned {response['status']}"))
+        text, sql = [], None
+        for item in content["message"]["content"]:
+            if item["type"] == "text":
+                text.append(item["text"])
+            elif item["type"] == "sql":
+                sql = item["statement"]
+        return {"text": "\n\n".join(text), "sql": sql}
+
+
+ANALYST_REPLIES = SharedCache("cortex_analyst", max_entries=ANALYST_CACHE_ENTRIES)
+
+
+def ask(question, index, source, analyst=None, replies=None):
+    """Answer locally when the index resolves the question, otherwise through ``analyst``.
+
+    With a ``replies`` SharedCache, the analyst call and the query of its SQL
+    run once per question (case and spacing ignored) for all callers.
+
+    Returns a dict with ``route`` ("local", "analyst" or "unanswered"), ``data``
+    (a DataFrame or ``None``), ``sql``, ``text`` and ``elapsed_ms``.
+    """
+    start = time.perf_counter()
+    plan = index.plan(question) if index is not None else None
+    if plan is not None:
+        data = source.query(plan["sql"], plan["params"])
+        result = {"route": "local", "data": data, "sql": plan["sql"], "text": plan["summary"]}
+    elif analyst is not None:
+        def answer():
+            with timed("dashboard_llm_seconds", task="cortex_analyst"):
+                reply = analyst(question)
+            return reply, source.query(reply["sql"]) if reply["sql"] else None
+
+        if replies is None:
+            reply, data = answer()
+        else:
+            key = ("cortex_analyst", getattr(analyst, "semantic_model_file", None), " ".join(question.lower().split()))
+            reply, data = replies.get_or_compute(key, answer)
+        result = {"route": "analyst", "data": data, "sql": reply["sql"], "text": reply["text"]}
+    else:
+        result = {"route": "unanswered", "data": None, "sql": None, "text": None}
+    result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
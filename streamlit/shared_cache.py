@@ -0,0 +1,122 @@
+"""Process-wide request coalescing and result cache shared by every session.
+
+At market open many sessions ask the same AI question at the same moment.
+``SharedCache.get_or_compute`` runs ``compute`` once per key: callers arriving
+while it runs wait on the same future and get its result (or its exception),
+and the result is kept for ``ttl`` seconds in an LRU bounded to
+``max_entries``. With ``ttl=0`` nothing is stored and only the in-flight call
+is shared.
+
+Dashboard loaders do not need it: ``st.cache_data`` and ``st.cache_resource``
+already hold a per-key lock while a value is computed, so concurrent misses of
+one loader share a single run.
+
+Cached values are handed to every caller as-is, so callers must not mutate
+them.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 300
+
+# Every SharedCache in the process, for the instrumentation sidebar
+_CACHES = []
+
+
+class SharedCache:
+    """Thread-safe LRU of results with a per-entry TTL; concurrent misses on one key share one call."""
+
+    def __init__(self, name, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._in_flight = {}  # key -> Future of the running call
+        self._stats = dict.fromkeys(("hits", "misses", "coalesced", "evictions"), 0)
+        _CACHES.append(self)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Cached value of ``key``, or ``compute()`` run once however many threads ask at the same time."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                # clear() may have dropped this call; a newer one may own the key by now
+                current = self._in_flight.get(key) is future
+                if current:
+                    del self._in_flight[key]
+        with self._lock:
+            if current and ttl > 0 and self.max_entries > 0:
+                self._entries[key] = (self._clock() + ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        future.set_result(value)
+        return value
+
+    def clear(self, name=None):
+        """Drop stored results and forget in-flight calls, or only those of keys starting with ``name``."""
+        with self._lock:
+            for store in (self._entries, self._in_flight):
+                for key in [k for k in store if name is None or (isinstance(k, tuple) and k[:1] == (name,))]:
+                    del store[key]
+
+    def stats(self):
+        with self._lock:
+            return {"cache": self.name, "entries": len(self._entries), "in_flight": len(self._in_flight), **self._stats}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def shared(cache, ttl=None):
+    """Decorator routing calls through ``cache``, keyed by the function and its (hashable) arguments.
+
+    ``func.clear()`` forgets this function's stored and in-flight results.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs), ttl)
+
+        call.clear = functools.partial(cache.clear, name)
+        return call
+    return decorator
+
+
+def all_stats():
+    """``stats()`` of every SharedCache in the process."""
+    return [cache.stats() for cache in _CACHES]
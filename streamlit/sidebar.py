@@ -0,0 +1,71 @@
+"""Sidebar blocks shared by every page of the app."""
+import math
+from datetime import datetime
+
+import streamlit as st
+
+import instrumentation
+from instrumentation import METRICS_ENV_VAR, REGISTRY
+from shared_cache import all_stats
+
+
+def render_technical_details(*lines):
+    """Render the "🔧 Technical Details" block, with page-specific ``lines``."""
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**🔧 Technical Details**")
+    st.sidebar.markdown(f"Data last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    for line in lines:
+        st.sidebar.markdown(line)
+    st.sidebar.markdown("**AI Models:** Snowflake Cortex")
+
+
+def _latency_rows(metric, label):
+    rows = []
+    for labels, histogram in REGISTRY.histogram_rows(metric):
+        p95 = histogram.quantile(0.95)
+        rows.append({
+            label: " / ".join(str(value) for value in labels.values()),
+            "Count": histogram.count,
+            "Mean (ms)": round(1000 * histogram.sum / histogram.count, 1),
+            "p95 (ms)": "> 60000" if math.isinf(p95) else f"<= {1000 * p95:g}",
+        })
+    return rows
+
+
+def render_instrumentation():
+    """Render section timings, loader cache hits, shared cache use and query / LLM latency histograms.
+
+    See instrumentation.py and shared_cache.py.
+    """
+    st.markdown("**⏱️ Instrumentation**")
+    if not instrumentation.ENABLED:
+        st.caption(f"Off - set {METRICS_ENV_VAR}=1 to time sections, cache loaders, queries and LLM calls")
+        return
+
+    sections = _latency_rows("dashboard_section_seconds", "Section")
+    if sections:
+        st.dataframe(sections, hide_index=True)
+    caches = {}
+    for labels, value in REGISTRY.counter_rows("dashboard_cache_requests_total"):
+        caches.setdefault(labels["loader"], {"hit": 0, "miss": 0})[labels["result"]] = value
+    if caches:
+        st.dataframe([
+            {"Loader": loader, "Hits": c["hit"], "Misses": c["miss"], "Hit rate": f"{c['hit'] / (c['hit'] + c['miss']):.0%}"}
+            for loader, c in sorted(caches.items())
+        ], hide_index=True)
+    # Joined = requests that waited on another session's in-flight call instead of running their own
+    shared = [stats for stats in all_stats() if stats["misses"] or stats["hits"]]
+    if shared:
+        st.dataframe([
+            {"Shared cache": s["cache"], "Runs": s["misses"], "Joined": s["coalesced"], "Hits": s["hits"],
+             "Entries": s["entries"], "Evicted": s["evictions"]}
+            for s in shared
+        ], hide_index=True)
+    for metric, label in (("dashboard_query_seconds", "Query"), ("dashboard_llm_seconds", "LLM call")):
+        rows = _latency_rows(metric, label)
+        if rows:
+            st.dataframe(rows, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button("Prometheus", REGISTRY.to_prometheus(), "dashboard_metrics.prom", "text/plain")
+    col2.download_button("JSON lines", REGISTRY.to_json_lines(), "dashboard_metrics.jsonl", "application/x-ndjson")
@@ -0,0 +1,19 @@
+"""Run the dashboard modules from ``streamlit/`` against the local backend, next to the research pipeline
+(``scripts/``) and the benchmark helpers (``benchmarks/``)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "streamlit"))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def no_research_db(tmp_path_factory):
+    """Point the local backend at a research database that does not exist, so none is attached."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("ASSET_MGMT_RESEARCH_DB", str(tmp_path_factory.getbasetemp() / "no-research.db"))
+        yield
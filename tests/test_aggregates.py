@@ -0,0 +1,57 @@
+"""KPI_SQL against the pandas reductions the dashboard used to run."""
+import math
+
+import pytest
+
+from aggregates import KPI_FIELDS, PORTFOLIO_SQL, query_kpis
+from data_source import LocalDataSource
+from risk_analytics import refresh_risk_metrics
+
+
+def compute_kpis_pandas(portfolio_df):
+    """Reference implementation: the pandas reductions the dashboard used to run."""
+    best = portfolio_df.loc[portfolio_df['YTD_Return'].idxmax()]
+    worst = portfolio_df.loc[portfolio_df['YTD_Return'].idxmin()]
+    return {
+        "portfolio_count": len(portfolio_df),
+        "total_aum": portfolio_df['Total_Value'].sum(),
+        "avg_risk_score": portfolio_df['Risk_Score'].mean(),
+        "avg_ytd_return": portfolio_df['YTD_Return'].mean(),
+        "avg_sharpe_ratio": portfolio_df['Sharpe_Ratio'].mean(),
+        "high_performers": len(portfolio_df[portfolio_df['YTD_Return'] > 10]),
+        "bullish_count": len(portfolio_df[portfolio_df['AI_Sentiment'] == 'Bullish']),
+        "best_portfolio": best['Portfolio'],
+        "best_return": best['YTD_Return'],
+        "worst_portfolio": worst['Portfolio'],
+        "worst_return": worst['YTD_Return'],
+    }
+
+
+def kpi_mismatches(expected, actual, rel_tol=1e-9):
+    """KPI fields whose values differ between two KPI dicts."""
+    mismatches = []
+    for field in KPI_FIELDS:
+        a, b = expected[field], actual[field]
+        if isinstance(a, str) or isinstance(b, str):
+            same = a == b
+        else:
+            same = math.isclose(float(a), float(b), rel_tol=rel_tol, abs_tol=1e-9)
+        if not same:
+            mismatches.append((field, a, b))
+    return mismatches
+
+
+# Before the first refresh the KPIs fall back to PORTFOLIO_METRICS; after it they use the computed metrics
+@pytest.mark.parametrize("refreshed", [False, True])
+def test_kpi_sql_matches_pandas(refreshed):
+    source = LocalDataSource()
+    if refreshed:
+        assert refresh_risk_metrics(source)
+    assert kpi_mismatches(compute_kpis_pandas(source.query(PORTFOLIO_SQL)), query_kpis(source)) == []
+
+
+def test_kpi_sql_matches_pandas_after_trades():
+    source = LocalDataSource()
+    source.execute("UPDATE PORTFOLIO_HOLDINGS SET MARKET_VALUE = MARKET_VALUE * 3 WHERE SECTOR = 'Technology'")
+    source.execute("DELETE FROM PORTFOLIO_HOLDINGS WHERE HOLDING_ID = 'H003'")
+    assert kpi_mismatches(compute_kpis_pandas(source.query(PORTFOLIO_SQL)), query_kpis(source)) == []
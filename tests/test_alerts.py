@@ -0,0 +1,34 @@
+"""Alert cooldown: a condition re-raised inside it is logged once the cooldown ends."""
+from datetime import datetime, timedelta, timezone
+
+from alerts import ALERT_COOLDOWN, evaluate_alerts
+from data_source import LocalDataSource
+
+START = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+UPDATE_VALUE_SQL = "UPDATE PORTFOLIO_HOLDINGS SET MARKET_VALUE = ? WHERE HOLDING_ID = ?"
+HEALTHCARE = {"H003": 1800000.0, "H004": 1500000.0}  # 41% of Growth Fund Alpha
+
+
+def healthcare_firings(source):
+    return source.query(
+        "SELECT FIRED_AT FROM PORTFOLIO_ALERTS WHERE PORTFOLIO_NAME = 'Growth Fund Alpha' "
+        "AND SUBJECT = 'Healthcare' AND SEVERITY <> 'success' ORDER BY FIRED_AT"
+    )["FIRED_AT"].tolist()
+
+
+def test_condition_returning_inside_cooldown_fires_when_it_ends():
+    source = LocalDataSource(seed_history=False)
+    evaluate_alerts(source, START)
+    for holding in HEALTHCARE:
+        source.execute(UPDATE_VALUE_SQL, [100000.0, holding])
+    assert evaluate_alerts(source, START + timedelta(minutes=10))["resolved"] == 1
+    for holding, value in HEALTHCARE.items():
+        source.execute(UPDATE_VALUE_SQL, [value, holding])
+    assert evaluate_alerts(source, START + timedelta(minutes=20))["suppressed"] == 1
+
+    # Inputs unchanged since, but the silent firing is due once the cooldown from the first one ends
+    assert evaluate_alerts(source, START + ALERT_COOLDOWN - timedelta(minutes=1))["changed"] == 0
+    due = evaluate_alerts(source, START + ALERT_COOLDOWN + timedelta(minutes=20))
+    assert due["changed"] == 1 and due["fired"] == 1
+    assert healthcare_firings(source) == ["2026-03-02 09:00:00", "2026-03-02 10:20:00"]
+    assert evaluate_alerts(source, START + 2 * ALERT_COOLDOWN)["changed"] == 0
@@ -0,0 +1,26 @@
+"""Chunks and their overlap flow across page-range task boundaries."""
+from research_pipeline.chunking import iter_chunks, stream_chunks
+
+PAGES = {
+    # Paragraphs shorter than the overlap, so chunks overlap and span pages
+    "10k.pdf": ["\n\n".join(f"Page {page} paragraph {i} on margins and guidance." for i in range(20)) for page in range(40)],
+    "note.pdf": ["A short research note on rates."],
+}
+
+
+# Module-level stand-ins for pypdf, so the process pool can pickle them
+def count_pages(path):
+    return len(PAGES[path])
+
+
+def read_pages(path, start, stop):
+    return PAGES[path][start:stop]
+
+
+def test_task_boundaries_do_not_change_chunks():
+    rows = list(iter_chunks(list(PAGES), workers=2, page_reader=read_pages, page_counter=count_pages,
+                            pages_per_task=4, max_in_flight=3))
+    for path, pages in PAGES.items():
+        chunks = [row for row in rows if row["relative_path"] == path]
+        assert [row["chunk"] for row in chunks] == list(stream_chunks(pages))
+        assert [row["chunk_index"] for row in chunks] == list(range(len(chunks)))
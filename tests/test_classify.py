@@ -0,0 +1,88 @@
+"""Classification is memoized per (model, prompt, document, content) and sent in batches."""
+import json
+import sqlite3
+
+import pytest
+
+from research_pipeline import classify
+from research_pipeline.classify import (
+    BATCH_SIZE, ClassificationCache, DocumentClassifier, keyword_mock_response, parse_classification,
+)
+from research_pipeline.models import MockModel
+
+DOCUMENTS = [(f"Tech Earnings Call {i}.pdf", f"hash-{i}") for i in range(BATCH_SIZE + 7)]
+
+
+class BatchRecordingModel(MockModel):
+    """MockModel that also keeps the size of every batch it is sent."""
+
+    def __init__(self):
+        super().__init__(keyword_mock_response)
+        self.batch_sizes = []
+
+    def complete_batch(self, model, prompts, response_format=None):
+        self.batch_sizes.append(len(prompts))
+        return super().complete_batch(model, prompts, response_format)
+
+
+def classifier(conn, model_name=classify.CLASSIFICATION_MODEL):
+    return DocumentClassifier(BatchRecordingModel(), ClassificationCache(conn), model=model_name)
+
+
+def test_second_run_makes_no_model_calls():
+    conn = sqlite3.connect(":memory:")
+    first = classifier(conn)
+    results = first.classify(DOCUMENTS)
+    assert first.client.calls == len(DOCUMENTS) and all(results.values())
+    second = classifier(conn)
+    assert second.classify(DOCUMENTS) == results
+    assert second.client.calls == 0 and second.stats["cache_hits"] == len(DOCUMENTS)
+
+
+def test_prompt_model_or_content_change_misses_the_cache(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    classifier(conn).classify(DOCUMENTS[:3])
+    changed_content = classifier(conn)
+    changed_content.classify([DOCUMENTS[0], (DOCUMENTS[1][0], "edited"), DOCUMENTS[2]])
+    assert changed_content.client.calls == 1
+    other_model = classifier(conn, model_name="mistral-large2")
+    other_model.classify(DOCUMENTS[:3])
+    assert other_model.client.calls == 3
+    monkeypatch.setattr(classify, "PROMPT_HASH", "new-template")
+    new_prompt = classifier(conn)
+    new_prompt.classify(DOCUMENTS[:3])
+    assert new_prompt.client.calls == 3
+
+
+def test_prompts_are_sent_in_batches():
+    run = classifier(sqlite3.connect(":memory:"))
+    run.classify(DOCUMENTS)
+    assert run.client.batch_sizes == [BATCH_SIZE, 7]
+    assert run.stats["batches"] == 2
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "not json at all",
+    "[\"Technology\"]",
+    "{\"industry_sector\": \"Technology\"",
+    json.dumps({"industry_sector": "Crypto", "document_type": "Tweet", "investment_theme": "Moonshot"}),
+])
+def test_parse_rejects_malformed_or_unknown_categories(text):
+    assert parse_classification(text) is None
+
+
+def test_parse_drops_only_out_of_category_fields():
+    text = "Sure: " + json.dumps({"industry_sector": "Real Estate", "document_type": "Tweet", "investment_theme": "ESG"})
+    assert parse_classification(text) == {
+        "industry_sector": "Real_Estate", "document_type": None, "investment_theme": "ESG",
+    }
+
+
+def test_unparseable_responses_are_not_cached():
+    conn = sqlite3.connect(":memory:")
+    broken = DocumentClassifier(MockModel(lambda model, prompt: "I cannot help"), ClassificationCache(conn))
+    assert broken.classify(DOCUMENTS[:2]) == {key: None for key in DOCUMENTS[:2]}
+    retry = classifier(conn)
+    retry.classify(DOCUMENTS[:2])
+    assert retry.client.calls == 2
@@ -0,0 +1,16 @@
+"""Each page's first paint in a fresh interpreter imports only the heavy modules it is allowed."""
+import pytest
+
+from cold_start import ALLOWED_HEAVY, PAGES, measure_page
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_first_paint_imports(page):
+    run = measure_page(PAGES[page])
+    assert run["exceptions"] == []
+    assert set(run["imported"]) <= ALLOWED_HEAVY[page]
+
+
+def test_heavy_imports_are_detected():
+    # The dashboard needs the data and charting stack, so the check above is not vacuous
+    assert set(measure_page(PAGES["dashboard"])["imported"]) >= {"pandas", "numpy", "plotly.graph_objs._figure"}
@@ -0,0 +1,32 @@
+"""Documents are keyed by the content hash ingest recorded in the manifest."""
+import sqlite3
+
+from data_source import LocalDataSource
+from document_analysis import research_documents
+from research_pipeline.ingest import _SCHEMA
+
+
+def research_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    conn.executemany("INSERT INTO research_document_manifest VALUES (?, ?, 0, 0, NULL, ?)", [
+        ("a.pdf", "hash-a", None),
+        ("gone.pdf", "hash-gone", "2026-01-01T00:00:00"),
+    ])
+    conn.executemany("INSERT INTO research_knowledge_base VALUES (?, ?, ?, ?)", [
+        ("a.pdf", "a.pdf", f"chunk {index}", index) for index in range(5)
+    ] + [("gone.pdf", "gone.pdf", "stale", 0)])
+    conn.commit()
+    conn.close()
+
+
+def test_documents_use_manifest_hash(tmp_path):
+    research_db(tmp_path / "research.db")
+    source = LocalDataSource(research_db_path=tmp_path / "research.db", seed_history=False)
+    documents = research_documents(source, excerpt_chunks=2)
+    assert documents == [{
+        "relative_path": "a.pdf",
+        "document_name": "a.pdf",
+        "content_hash": "hash-a",
+        "excerpt": "chunk 0\n\nchunk 1",
+    }]
@@ -0,0 +1,64 @@
+"""Re-syncing the embedding store re-embeds only the chunks whose text changed."""
+import numpy as np
+import pytest
+
+from research_pipeline.embeddings import EmbeddingStore, HashingEmbedder
+
+TOPICS = ("rates and credit spreads", "semiconductor earnings", "utility dividends", "emerging market debt",
+          "ESG screening", "bank capital ratios")
+
+
+class RecordingEmbedder(HashingEmbedder):
+    """HashingEmbedder that remembers every text it was asked to embed."""
+
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+def corpus():
+    return [
+        {"relative_path": f"doc_{doc}.pdf", "chunk_index": index,
+         "chunk": f"Note {doc}.{index} on {TOPICS[(doc + index) % len(TOPICS)]} for quarter {index}."}
+        for doc in range(3) for index in range(10)
+    ]
+
+
+def ranking(store, query, embedder, skip):
+    """Every live chunk ranked against ``query``, without the ``skip`` key."""
+    return [hit for hit in store.search(embedder.embed_one(query), k=len(store)) if hit[:2] != skip]
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_one_changed_chunk_is_the_only_one_reembedded(tmp_path, dtype):
+    rows = corpus()
+    embedder = RecordingEmbedder()
+    store = EmbeddingStore(tmp_path / "store", dtype=dtype)
+    assert store.sync(rows, embedder) == {"embedded": 30, "unchanged": 0, "deleted": 0}
+    changed = ("doc_1.pdf", 4)
+    (changed_row,) = store.conn.execute(
+        "SELECT row_id FROM chunk_embeddings WHERE relative_path = ? AND chunk_index = ?", changed).fetchone()
+    vectors_before = store.vectors()
+    queries = [row["chunk"] for row in rows if (row["relative_path"], row["chunk_index"]) != changed]
+    rankings_before = [ranking(store, query, embedder, changed) for query in queries]
+
+    edited = [dict(row) for row in rows]
+    edited[14]["chunk"] = "Rewritten note on commodity futures and shipping rates."
+    embedder.embedded.clear()
+    assert store.sync(edited, embedder) == {"embedded": 1, "unchanged": 29, "deleted": 0}
+    assert embedder.embedded == [edited[14]["chunk"]]
+
+    vectors_after = store.vectors()
+    others = np.arange(store.size) != changed_row
+    assert np.array_equal(vectors_before[others], vectors_after[others])
+    assert not np.array_equal(vectors_before[changed_row], vectors_after[changed_row])
+    assert [ranking(store, query, embedder, changed) for query in queries] == rankings_before
+    assert store.search(embedder.embed_one(edited[14]["chunk"]), k=1)[0][:2] == changed
+
+    # Readers in other processes see the same rows
+    reader = EmbeddingStore(tmp_path / "store", readonly=True)
+    assert np.array_equal(reader.vectors(), vectors_after)
@@ -0,0 +1,24 @@
+"""Incremental rollups against full rebuilds."""
+from datetime import date, timedelta
+
+import numpy as np
+
+from data_source import LocalDataSource
+from history import ROLLUP_KEYS, ROLLUP_SQL, rebuild_rollups, record_day, seed_sample_history
+
+
+def test_incremental_rollups_match_rebuild():
+    source = LocalDataSource(seed_history=False)
+    today = date(2026, 3, 2)
+    seed_sample_history(source, end=today - timedelta(days=45))
+    # Move a position so the landed days differ from the seeded ones
+    source.execute("UPDATE PORTFOLIO_HOLDINGS SET MARKET_VALUE = MARKET_VALUE * 1.5 WHERE HOLDING_ID = 'H001'")
+    for back in range(44, -1, -1):
+        record_day(source, today - timedelta(days=back))
+    order = ["WINDOW_DAYS", *ROLLUP_KEYS]
+    incremental = source.query(ROLLUP_SQL).sort_values(order).reset_index(drop=True)
+    rebuild_rollups(source, today)
+    rebuilt = source.query(ROLLUP_SQL).sort_values(order).reset_index(drop=True)
+    assert incremental[[*order, "AS_OF_DATE", "START_DATE"]].equals(rebuilt[[*order, "AS_OF_DATE", "START_DATE"]])
+    numeric = ["START_VALUE", "END_VALUE", "VALUE_SUM", "DAYS"]
+    assert np.allclose(incremental[numeric], rebuilt[numeric])
@@ -0,0 +1,70 @@
+"""Incremental ingestion detects new, changed, unchanged and deleted files."""
+import os
+
+from research_pipeline.ingest import KNOWLEDGE_BASE_TABLE, MANIFEST_TABLE, RAW_DOCUMENTS_TABLE, LocalIngestRunner
+
+
+class CountingParser:
+    """Records which files were parsed, and with what content hash."""
+
+    def __init__(self):
+        self.parsed = []
+
+    def __call__(self, path, state):
+        self.parsed.append((path.name, state.content_hash))
+        return f"parsed {path.name}"
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(text.encode("utf-8"))
+
+
+def rows(runner, sql):
+    return sorted(runner.conn.execute(sql).fetchall())
+
+
+def test_incremental_runs(tmp_path):
+    corpus = tmp_path / "pdfs"
+    write(corpus / "a.pdf", "alpha")
+    write(corpus / "b.pdf", "bravo")
+    write(corpus / "notes" / "c.pdf", "charlie")
+    parser = CountingParser()
+    runner = LocalIngestRunner(str(tmp_path / "ingest.db"), parser=parser)
+
+    assert runner.run(corpus).summary() == {"new": 3, "changed": 0, "unchanged": 0, "deleted": 0}
+    assert sorted(name for name, _ in parser.parsed) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert runner.run(corpus).summary() == {"new": 0, "changed": 0, "unchanged": 3, "deleted": 0}
+    assert len(parser.parsed) == 3
+
+    # A touched but identical file is unchanged; an edited one is re-parsed with its new hash
+    os.utime(corpus / "a.pdf", (1, 1))
+    write(corpus / "b.pdf", "bravo, revised")
+    runner.conn.execute(f"INSERT INTO {KNOWLEDGE_BASE_TABLE} VALUES ('b.pdf', 'b.pdf', 'old chunk', 0)")
+    (corpus / "notes" / "c.pdf").unlink()
+    write(corpus / "d.pdf", "delta")
+    changes = runner.run(corpus)
+    assert (changes.new, changes.changed, changes.unchanged, changes.deleted) == (
+        ["d.pdf"], ["b.pdf"], ["a.pdf"], ["notes/c.pdf"])
+    assert [name for name, _ in parser.parsed[3:]] == ["d.pdf", "b.pdf"]
+    assert parser.parsed[-1][1] == runner.manifest()["b.pdf"].content_hash
+
+    assert rows(runner, f"SELECT relative_path FROM {RAW_DOCUMENTS_TABLE}") == [("a.pdf",), ("b.pdf",), ("d.pdf",)]
+    assert rows(runner, f"SELECT * FROM {KNOWLEDGE_BASE_TABLE}") == []
+    assert rows(runner, f"SELECT relative_path FROM {MANIFEST_TABLE} WHERE deleted_at IS NOT NULL") == [
+        ("notes/c.pdf",)]
+
+    # A tombstoned file that comes back is new again
+    write(corpus / "notes" / "c.pdf", "charlie")
+    assert runner.run(corpus).summary() == {"new": 1, "changed": 0, "unchanged": 3, "deleted": 0}
+    assert rows(runner, f"SELECT COUNT(*) FROM {MANIFEST_TABLE} WHERE deleted_at IS NOT NULL") == [(0,)]
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path, monkeypatch):
+    write(tmp_path / "a.pdf", "alpha")
+    runner = LocalIngestRunner(parser=CountingParser())
+    runner.run(tmp_path)
+    hashed = []
+    monkeypatch.setattr("research_pipeline.ingest.file_md5", lambda path: hashed.append(path) or "x")
+    assert runner.run(tmp_path).summary()["unchanged"] == 1
+    assert hashed == []
@@ -0,0 +1,41 @@
+"""Subscriptions and new positions do not show up in the risk metrics as performance."""
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from data_source import LocalDataSource
+from history import record_day
+from risk_analytics import refresh_risk_metrics
+
+METRICS_SQL = "SELECT * FROM PORTFOLIO_RISK_METRICS ORDER BY PORTFOLIO_NAME"
+NEW_POSITION_SQL = "INSERT INTO PORTFOLIO_HOLDINGS VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def metrics_after_next_day(inflow=None):
+    """Metrics after recording tomorrow at unchanged prices, optionally with a new position added first."""
+    source = LocalDataSource()
+    tomorrow = date.today() + timedelta(days=1)
+    for row in inflow or []:
+        source.execute(NEW_POSITION_SQL, row)
+    record_day(source, tomorrow)
+    refresh_risk_metrics(source, tomorrow)
+    return source.query(METRICS_SQL).set_index("PORTFOLIO_NAME")
+
+
+@pytest.fixture(scope="module")
+def unchanged():
+    return metrics_after_next_day()
+
+
+def test_inflow_into_existing_sector_leaves_every_metric_unchanged(unchanged):
+    # Conservative Income holds only Real Estate, so its sector HHI (and risk score) stays the same too
+    inflow = [("H900", "Conservative Income", "New REIT Fund", "Real Estate", 10_000_000.0, 50.0, "Low", "2024-02-15")]
+    pd.testing.assert_frame_equal(metrics_after_next_day(inflow), unchanged)
+
+
+def test_new_position_does_not_count_as_performance(unchanged):
+    inflow = [("H901", "Growth Fund Alpha", "OpenAI Corp", "Technology", 10_000_000.0, 40.0, "High", "2024-02-15")]
+    after = metrics_after_next_day(inflow)
+    returns = ["YTD_RETURN", "ANNUAL_RETURN", "VOLATILITY", "SHARPE_RATIO", "VAR_95", "MAX_DRAWDOWN", "OBSERVATIONS"]
+    pd.testing.assert_frame_equal(after[returns], unchanged[returns])
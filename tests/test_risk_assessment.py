@@ -0,0 +1,66 @@
+"""Only portfolios whose holdings or prompt changed are sent to the assessor."""
+import pytest
+
+import risk_assessment
+from data_source import LocalDataSource
+from risk_assessment import FakeAssessor, refresh_risk_assessments
+from risk_refresh import load_book
+
+PORTFOLIOS, HOLDINGS = 40, 5
+
+
+@pytest.fixture
+def source():
+    source = LocalDataSource(seed_history=False)
+    load_book(source, PORTFOLIOS, HOLDINGS)
+    return source
+
+
+def assessments(source):
+    return source.query(
+        "SELECT PORTFOLIO_NAME, HOLDINGS_FINGERPRINT FROM PORTFOLIO_RISK_ASSESSMENT ORDER BY PORTFOLIO_NAME"
+    ).set_index("PORTFOLIO_NAME")["HOLDINGS_FINGERPRINT"]
+
+
+def refresh(source, assessor):
+    calls = assessor.calls
+    stats = refresh_risk_assessments(source, assessor)
+    return stats, assessor.calls - calls
+
+
+def test_only_changed_portfolios_are_reassessed(source):
+    assessor = FakeAssessor(source)
+    assert refresh(source, assessor) == ({"stale": PORTFOLIOS, "assessed": PORTFOLIOS, "failed": 0}, PORTFOLIOS)
+    before = assessments(source)
+
+    source.execute("UPDATE PORTFOLIO_HOLDINGS SET WEIGHT_PERCENT = WEIGHT_PERCENT * 1.1 WHERE HOLDING_ID = ?",
+                   ["H00007002"])
+    assert refresh(source, assessor) == ({"stale": 1, "assessed": 1, "failed": 0}, 1)
+    after = assessments(source)
+    assert after[after != before].index.tolist() == ["Portfolio 00007"]
+
+    assert refresh(source, assessor) == ({"stale": 0, "assessed": 0, "failed": 0}, 0)
+
+    source.execute("DELETE FROM PORTFOLIO_HOLDINGS WHERE HOLDING_ID = ?", ["H00012004"])
+    assert refresh(source, assessor)[1] == 1
+
+    # A portfolio with no holdings left loses its assessment without a model call
+    source.execute("DELETE FROM PORTFOLIO_HOLDINGS WHERE PORTFOLIO_NAME = ?", ["Portfolio 00020"])
+    assert refresh(source, assessor)[1] == 0
+    assert "Portfolio 00020" not in assessments(source).index
+    assert len(assessments(source)) == PORTFOLIOS - 1
+
+
+def test_prompt_change_reassesses_everything(source, monkeypatch):
+    assessor = FakeAssessor(source)
+    refresh(source, assessor)
+    monkeypatch.setattr(risk_assessment, "PROMPT_HASH", "new-prompt")
+    assert refresh(source, assessor)[1] == PORTFOLIOS
+    assert refresh(source, assessor)[1] == 0
+
+
+def test_unparseable_replies_are_retried(source):
+    stats = refresh_risk_assessments(source, lambda names: {name: "no score here" for name in names})
+    assert stats["failed"] == PORTFOLIOS and assessments(source).empty
+    assessor = FakeAssessor(source)
+    assert refresh(source, assessor)[1] == PORTFOLIOS
@@ -0,0 +1,84 @@
+"""Incremental scenario KPIs and sector values agree with a from-scratch recompute."""
+import math
+
+import pytest
+
+import scenarios
+from aggregates import PORTFOLIO_SQL
+from data_source import LocalDataSource
+from risk_refresh import load_book
+from scenarios import TECH_SECTOR, ScenarioBase, replay
+
+ADD = {"kind": "add", "portfolio": "Portfolio 00000", "security": "OpenAI Corp", "sector": "Technology",
+       "market_value": 500000.0, "risk_level": "High"}
+SHOCK_TECH = {"kind": "shock", "sector": "Technology", "change_pct": -20.0}
+
+
+@pytest.fixture(scope="module")
+def base():
+    source = LocalDataSource(seed_history=False)
+    load_book(source, 30, 6)
+    return ScenarioBase.from_source(source, source.query(PORTFOLIO_SQL))
+
+
+def assert_matches_recompute(scenario):
+    holdings = scenario.holdings_frame()
+    total = holdings["MARKET_VALUE"].sum()
+    sectors = holdings.groupby("SECTOR")["MARKET_VALUE"].sum()
+    kpis = scenario.kpis()
+    assert math.isclose(kpis["total_aum"], total / 1e6, rel_tol=1e-9)
+    assert math.isclose(kpis["tech_allocation"], 100.0 * sectors.get(TECH_SECTOR, 0.0) / total, rel_tol=1e-9)
+    assert kpis["top_sector"] == sectors.idxmax()
+    values = scenario.sector_values()
+    for sector, value in sectors.items():
+        assert math.isclose(values[sector], value, rel_tol=1e-9, abs_tol=1e-3)
+    assert all(abs(value) < 1e-3 for sector, value in values.items() if sector not in sectors)
+    by_portfolio = holdings.groupby("PORTFOLIO_NAME")["MARKET_VALUE"].sum()
+    for portfolio in scenario.touched:
+        assert math.isclose(scenario.summary_of(portfolio).value, by_portfolio[portfolio], rel_tol=1e-9)
+
+
+def some_security(base):
+    return min(base.by_security, key=lambda name: (len(base.by_security[name]), name))
+
+
+@pytest.mark.parametrize("edits", [
+    [ADD],
+    [{"kind": "scale", "security": None, "factor": 1.1}],
+    [{"kind": "shock", "sector": "Technology", "change_pct": -20.0, "portfolio": "Portfolio 00001"}],
+    [SHOCK_TECH],
+    [ADD, {"kind": "scale", "security": None, "factor": 0.5}, SHOCK_TECH, {"kind": "shock", "sector": "Utilities",
+                                                                          "change_pct": 15.0}],
+])
+def test_edits_match_full_recompute(base, edits):
+    scenario = base.scenario("Test")
+    for edit in edits:
+        if edit["kind"] == "scale":
+            edit = dict(edit, security=some_security(base))
+        scenario = scenario.apply(edit)
+        assert_matches_recompute(scenario)
+
+
+def test_shock_reaches_an_added_position(base):
+    scenario = base.scenario().apply(ADD).apply(SHOCK_TECH)
+    added = [h for h in scenario.holdings_of("Portfolio 00000") if h.SECURITY_NAME == "OpenAI Corp"]
+    assert [h.MARKET_VALUE for h in added] == [pytest.approx(400000.0)]
+    assert_matches_recompute(scenario)
+
+
+def test_replay_reuses_a_prefix_of_edits(base, monkeypatch):
+    first = replay(base, "Mine", [ADD, SHOCK_TECH])
+    applied = []
+    apply = scenarios.Scenario.apply
+    monkeypatch.setattr(scenarios.Scenario, "apply", lambda self, edit: applied.append(edit) or apply(self, edit))
+
+    scale = {"kind": "scale", "security": some_security(base), "factor": 2.0}
+    extended = replay(base, "Mine", [ADD, SHOCK_TECH, scale], previous=first)
+    assert applied == [scale]
+    assert_matches_recompute(extended)
+    assert extended.kpis() == pytest.approx(replay(base, "Fresh", [ADD, SHOCK_TECH, scale]).kpis())
+
+    # Edits that do not extend the previous scenario are replayed from the base
+    applied.clear()
+    replay(base, "Mine", [SHOCK_TECH], previous=extended)
+    assert applied == [SHOCK_TECH]
@@ -0,0 +1,72 @@
+"""Questions the local semantic index answers, and the ones it leaves to Cortex Analyst."""
+import pytest
+
+from data_source import LocalDataSource
+from semantic_index import SemanticIndex, dimension_values, load_semantic_model
+
+
+@pytest.fixture(scope="module")
+def source():
+    return LocalDataSource(seed_history=False)
+
+
+@pytest.fixture(scope="module")
+def index(source):
+    model = load_semantic_model()
+    return SemanticIndex(model, dimension_values(source, model))
+
+
+def answer(index, source, question):
+    plan = index.plan(question)
+    return source.query(plan["sql"], plan["params"])
+
+
+def distinct(source, column):
+    return source.query(f"SELECT COUNT(DISTINCT {column}) FROM PORTFOLIO_HOLDINGS").iloc[0, 0]
+
+
+@pytest.mark.parametrize("question, column", [("how many portfolios", "PORTFOLIO_NAME"),
+                                              ("how many sectors", "SECTOR")])
+def test_count_of_a_dimension_counts_its_values(index, source, question, column):
+    assert answer(index, source, question).values.tolist() == [[distinct(source, column)]]
+
+
+def test_count_of_a_dimension_per_group(index, source):
+    result = answer(index, source, "how many sectors per portfolio").set_index("PORTFOLIO_NAME")["SECTOR_COUNT"]
+    expected = source.query(
+        "SELECT PORTFOLIO_NAME, COUNT(DISTINCT SECTOR) AS N FROM PORTFOLIO_HOLDINGS GROUP BY PORTFOLIO_NAME"
+    ).set_index("PORTFOLIO_NAME")["N"]
+    assert result.sort_index().tolist() == expected.sort_index().tolist()
+
+
+def test_count_of_holdings_by_a_dimension_is_unchanged(index, source):
+    result = answer(index, source, "how many holdings by sector")
+    assert list(result.columns) == ["SECTOR", "HOLDING_COUNT"]
+    assert result["HOLDING_COUNT"].sum() == source.query("SELECT COUNT(*) FROM PORTFOLIO_HOLDINGS").iloc[0, 0]
+
+
+@pytest.mark.parametrize("question, summary", [
+    ("total market value by sector", "SUM_MARKET_VALUE by SECTOR"),
+    ("average portfolio weight by risk level", "AVG_WEIGHT_PERCENT by RISK_LEVEL"),
+    ("total value by fund name and risk level", "SUM_MARKET_VALUE by PORTFOLIO_NAME, RISK_LEVEL"),
+    ("how many holdings in Technology", "HOLDING_COUNT where SECTOR in ['Technology']"),
+    ("high risk holdings in Growth Fund Alpha",
+     "PORTFOLIO_HOLDINGS rows where RISK_LEVEL in ['High']; PORTFOLIO_NAME in ['Growth Fund Alpha']"),
+    ("largest holdings in the ESG Impact Fund", "PORTFOLIO_HOLDINGS rows where PORTFOLIO_NAME in ['ESG Impact Fund']"),
+])
+def test_resolved_questions_are_answered_locally(index, question, summary):
+    assert index.plan(question)["summary"] == summary
+
+
+@pytest.mark.parametrize("question", [
+    # An aggregation with no fact to apply it to
+    "average risk by sector",
+    "total by sector",
+    # Grouping with nothing to measure
+    "What are our current portfolio holdings by sector?",
+    "risk by sector",
+    "Which holdings have the highest risk levels?",
+    "Summarize our investment portfolio and outline the risk associated with each",
+])
+def test_unresolved_questions_fall_back(index, question):
+    assert index.plan(question) is None
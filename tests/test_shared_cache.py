@@ -0,0 +1,92 @@
+"""Concurrent identical requests share one backend call."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_source import LocalDataSource
+from semantic_index import ask
+from shared_cache import SharedCache
+
+SESSIONS = 16
+
+
+class SlowAnalyst:
+    """Stand-in Cortex Analyst that takes a while to answer and counts its calls."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def __call__(self, question):
+        with self._count_lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"text": "Stand-in answer", "sql": "SELECT SECTOR, SUM(MARKET_VALUE) FROM PORTFOLIO_HOLDINGS GROUP BY 1"}
+
+
+def rush(request, sessions=SESSIONS):
+    """Results of ``request(index)`` run in ``sessions`` threads released at the same instant."""
+    barrier = threading.Barrier(sessions)
+
+    def session(index):
+        barrier.wait()
+        return request(index)
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        return list(pool.map(session, range(sessions)))
+
+
+def test_concurrent_misses_share_one_call():
+    cache, calls = SharedCache("test_rush"), []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results = rush(lambda _: cache.get_or_compute("key", compute))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] + cache.stats()["hits"] == SESSIONS - 1
+
+
+def test_concurrent_questions_share_one_analyst_call():
+    source, analyst, replies = LocalDataSource(seed_history=False), SlowAnalyst(), SharedCache("test_analyst")
+    questions = ["Summarize our portfolio risk", "summarize  our Portfolio risk"]
+    # Even and odd sessions send the two spellings at the same instant
+    results = rush(lambda index: ask(questions[index % 2], None, source, analyst, replies))
+    assert analyst.calls == 1
+    assert all(result["route"] == "analyst" and result["data"] is results[0]["data"] for result in results)
+    ask(questions[0], None, source, analyst, replies)
+    assert analyst.calls == 1
+
+
+def test_failures_are_shared_and_not_stored():
+    cache, calls = SharedCache("test_failure"), []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("backend down")
+
+    def request(_):
+        try:
+            return cache.get_or_compute("key", compute)
+        except ValueError as exc:
+            return exc
+
+    assert all(isinstance(result, ValueError) for result in rush(request))
+    assert len(calls) == 1 and len(cache) == 0
+
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    cache = SharedCache("test_lru", max_entries=2, ttl=10, clock=lambda: now[0])
+    runs = []
+    for key in ("a", "b", "a", "c", "b"):  # "a" is touched, so "b" is evicted by "c" and recomputed
+        cache.get_or_compute(key, lambda key=key: runs.append(key) or key)
+    now[0] = 11.0
+    cache.get_or_compute("c", lambda: runs.append("c") or "c")  # expired
+    assert runs == ["a", "b", "c", "b", "c"]
+    assert cache.stats()["evictions"] == 2 and cache.stats()["hits"] == 1 and len(cache) == 2
@@ -0,0 +1,17 @@
+"""Overlap between token chunks, inside and across layout blocks."""
+from research_pipeline.token_chunking import _tail_tokens, chunk_document, count_tokens
+
+# One page of prose with no blank lines, as pypdf returns it: a single block far over the budget
+PAGE = " ".join(f"Sentence {i} of the sector outlook mentions rates and earnings." for i in range(200))
+
+
+def test_long_block_chunks_carry_overlap():
+    chunks = chunk_document(PAGE, max_tokens=100, overlap_tokens=20)
+    assert len(chunks) > 2
+    assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.startswith(_tail_tokens(previous, 20))
+
+
+def test_overlap_changes_long_block_chunks():
+    assert chunk_document(PAGE, max_tokens=100, overlap_tokens=0) != chunk_document(PAGE, max_tokens=100, overlap_tokens=20)